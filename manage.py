@@ -6,6 +6,11 @@ import sys
 
 def main():
     """Run administrative tasks."""
+    # Tests get their own cache tier rather than the file cache in ./cache.
+    if sys.argv[1:2] == ['test']:
+        os.environ.setdefault(
+            'DJANGO_SETTINGS_MODULE', 'news_agency.test_settings'
+        )
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_agency.settings')
     try:
         from django.core.management import execute_from_command_line
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_agency.settings')
 
 application = get_asgi_application()
+
+from pulse import logs  # noqa: E402
+
+logs.enable()
@@ -58,7 +58,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "pulse.middleware.AccessLogMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "pulse.middleware.CompressionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -105,6 +107,50 @@ db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES["default"].update(db_from_env)
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+#
+# "default" keeps a short-lived per-process copy of everything in front of
+# the "shared" backend (Redis or memcached in production, e.g.
+# PULSE_SHARED_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# with a redis:// location). Counters and locks bypass the local tier.
+#
+# Version bumps, rate-limit buckets and the page-view queue rely on the
+# shared backend's incr/add being atomic across workers. Redis and
+# memcached are; the file-based default takes a file lock for them, which
+# only covers the processes of one host. `manage.py check --deploy`
+# reports any other backend as an error. `manage.py test` runs with
+# news_agency.test_settings, which swaps in an in-memory cache.
+
+CACHES = {
+    "default": {
+        "BACKEND": "pulse.tieredcache.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {
+            "LOCAL_TIMEOUT": int(os.getenv("PULSE_LOCAL_CACHE_TIMEOUT", 5)),
+            "LOCAL_MAX_ENTRIES": int(
+                os.getenv("PULSE_LOCAL_CACHE_MAX_ENTRIES", 1000)
+            ),
+            "SHARED_ONLY_PREFIXES": [
+                "pulse:version:",
+                "pulse:ratelimit:",
+                "pulse:views:",
+                "pulse:events:",
+            ],
+        },
+    },
+    "shared": {
+        "BACKEND": os.getenv(
+            "PULSE_SHARED_CACHE_BACKEND",
+            "pulse.filecache.LockingFileBasedCache",
+        ),
+        "LOCATION": os.getenv(
+            "PULSE_SHARED_CACHE_LOCATION", str(BASE_DIR / "cache")
+        ),
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -163,3 +209,145 @@ INTERNAL_IPS = [
 ]
 
 CRISPY_TEMPLATE_PACK = "bootstrap4"
+
+# Newspapers older than this many days are rolled into the archive by
+# `manage.py archive_newspapers`; Postgres archive partitions are created
+# per "year" or "month".
+PULSE_ARCHIVE_AFTER_DAYS = int(os.getenv("PULSE_ARCHIVE_AFTER_DAYS", 90))
+PULSE_ARCHIVE_PARTITION = os.getenv("PULSE_ARCHIVE_PARTITION", "month")
+
+# `manage.py export_cold_archive` moves newspapers older than this many
+# days out of the database into segment files under PULSE_COLD_ARCHIVE_DIR,
+# which the detail page reads through mmap.
+PULSE_COLD_ARCHIVE_AFTER_DAYS = int(
+    os.getenv("PULSE_COLD_ARCHIVE_AFTER_DAYS", 3 * 365)
+)
+PULSE_COLD_ARCHIVE_DIR = os.getenv(
+    "PULSE_COLD_ARCHIVE_DIR", str(BASE_DIR / "cold-archive")
+)
+
+# Store Newspaper.content compressed ("zlib" or "zstd"); empty keeps raw text.
+PULSE_CONTENT_COMPRESSION = os.getenv("PULSE_CONTENT_COMPRESSION", "")
+
+# Absolute base URL used in sitemaps; set PULSE_SITEMAP_ROOT to also write
+# the shards to that directory so the proxy or WhiteNoise can serve them.
+PULSE_SITE_URL = os.getenv(
+    "PULSE_SITE_URL", "https://news-agency-7vww.onrender.com"
+)
+PULSE_SITEMAP_ROOT = os.getenv("PULSE_SITEMAP_ROOT", "")
+
+# With PULSE_PRERENDER_ROOT set, saves queue the newspaper and topic pages
+# they affect and `manage.py prerender_pages` writes them there as static,
+# read-only HTML (newspapers/<id>/index.html, topics/<id>/index.html) for
+# a public mirror. Serve the directory from the proxy, or from WhiteNoise
+# with WHITENOISE_ROOT and WHITENOISE_INDEX_FILE on the mirror.
+PULSE_PRERENDER_ROOT = os.getenv("PULSE_PRERENDER_ROOT", "")
+PULSE_PRERENDER_PAGE_SIZE = int(os.getenv("PULSE_PRERENDER_PAGE_SIZE", 100))
+
+# Near-duplicate detection: MinHash similarity at which a newspaper counts
+# as a copy, and whether the create form should "flag" or "merge" copies.
+PULSE_DUPLICATE_THRESHOLD = float(os.getenv("PULSE_DUPLICATE_THRESHOLD", 0.8))
+PULSE_DUPLICATE_ACTION = os.getenv("PULSE_DUPLICATE_ACTION", "flag")
+
+# Page views are buffered per process and pushed through the cache at most
+# this often, then written by a job worker (run_workers); the "most read"
+# list covers the last PULSE_MOST_READ_DAYS.
+PULSE_PAGEVIEW_FLUSH_SECONDS = float(
+    os.getenv("PULSE_PAGEVIEW_FLUSH_SECONDS", 5)
+)
+PULSE_MOST_READ_DAYS = int(os.getenv("PULSE_MOST_READ_DAYS", 7))
+PULSE_MOST_READ_LIMIT = int(os.getenv("PULSE_MOST_READ_LIMIT", 5))
+
+# Token buckets for NewspaperListView per user (or IP), as "tokens/seconds"
+# for each query cost class; an empty value disables that limit.
+PULSE_RATE_LIMITS = {
+    "cheap": os.getenv("PULSE_RATE_LIMIT_CHEAP", "120/60"),
+    "filtered": os.getenv("PULSE_RATE_LIMIT_FILTERED", "30/60"),
+    "content": os.getenv("PULSE_RATE_LIMIT_CONTENT", "10/60"),
+}
+
+# Brotli/gzip response compression: smaller bodies are sent as-is, and
+# compressed copies of cacheable responses are kept for this many seconds.
+PULSE_RESPONSE_COMPRESSION_MIN_LENGTH = int(
+    os.getenv("PULSE_RESPONSE_COMPRESSION_MIN_LENGTH", 512)
+)
+PULSE_RESPONSE_COMPRESSION_CACHE_TIMEOUT = int(
+    os.getenv("PULSE_RESPONSE_COMPRESSION_CACHE_TIMEOUT", 60 * 60)
+)
+
+# Matching ids for the first PULSE_SEARCH_CACHE_PAGES pages of each
+# normalised newspaper search are cached in a per-process LRU of
+# PULSE_SEARCH_CACHE_SIZE entries and in the shared cache.
+PULSE_SEARCH_CACHE_PAGES = int(os.getenv("PULSE_SEARCH_CACHE_PAGES", 5))
+PULSE_SEARCH_CACHE_SIZE = int(os.getenv("PULSE_SEARCH_CACHE_SIZE", 256))
+PULSE_SEARCH_CACHE_TIMEOUT = int(os.getenv("PULSE_SEARCH_CACHE_TIMEOUT", 300))
+
+# Topic, publisher and year facets on the newspaper list show this many
+# of the most frequent values each.
+PULSE_FACET_LIMIT = int(os.getenv("PULSE_FACET_LIMIT", 10))
+
+# Newspaper revisions: rebuilt texts are cached this long, and
+# compact_revisions keeps the newest PULSE_REVISION_KEEP per newspaper,
+# drops older ones superseded more than PULSE_REVISION_RETENTION_DAYS ago
+# (0 keeps them forever) and versions replaced within
+# PULSE_REVISION_COLLAPSE_SECONDS of being saved.
+PULSE_REVISION_CACHE_TIMEOUT = int(
+    os.getenv("PULSE_REVISION_CACHE_TIMEOUT", 60 * 60 * 24)
+)
+PULSE_REVISION_KEEP = int(os.getenv("PULSE_REVISION_KEEP", 10))
+PULSE_REVISION_RETENTION_DAYS = int(
+    os.getenv("PULSE_REVISION_RETENTION_DAYS", 365)
+)
+PULSE_REVISION_COLLAPSE_SECONDS = int(
+    os.getenv("PULSE_REVISION_COLLAPSE_SECONDS", 5 * 60)
+)
+
+# Server-sent events for the newspaper list: each worker polls the shared
+# cache for new events this often, and idle streams get a keep-alive.
+PULSE_EVENTS_POLL_SECONDS = float(os.getenv("PULSE_EVENTS_POLL_SECONDS", 1))
+PULSE_EVENTS_HEARTBEAT_SECONDS = float(
+    os.getenv("PULSE_EVENTS_HEARTBEAT_SECONDS", 15)
+)
+
+# Anonymous index and feed responses are public: shared caches keep them
+# for PULSE_EDGE_CACHE_SECONDS and may serve them stale while revalidating.
+# The proxy must bypass its cache for requests carrying the session cookie.
+# Model changes POST the affected cache tags to PULSE_EDGE_PURGE_URL.
+PULSE_EDGE_CACHE_SECONDS = int(os.getenv("PULSE_EDGE_CACHE_SECONDS", 60))
+PULSE_EDGE_STALE_SECONDS = int(os.getenv("PULSE_EDGE_STALE_SECONDS", 600))
+PULSE_EDGE_PURGE_URL = os.getenv("PULSE_EDGE_PURGE_URL", "")
+PULSE_EDGE_PURGE_TOKEN = os.getenv("PULSE_EDGE_PURGE_TOKEN", "")
+
+# Access and audit logs go through a queue: request threads only enqueue,
+# and a listener thread, started in each WSGI/ASGI and job worker process
+# on its first record, writes them in batches, as JSON lines to
+# PULSE_LOG_FILE ("-" for stderr, empty to skip) and as AuditEntry rows.
+# Batches go out when they reach PULSE_LOG_BATCH_SIZE or every
+# PULSE_LOG_FLUSH_SECONDS; records beyond PULSE_LOG_QUEUE_SIZE are dropped
+# rather than blocking a request. Management commands and shells have no
+# listener and write each record as it comes, or in batches inside
+# pulse.logs.batched().
+PULSE_LOG_FILE = os.getenv("PULSE_LOG_FILE", "")
+PULSE_LOG_BATCH_SIZE = int(os.getenv("PULSE_LOG_BATCH_SIZE", 200))
+PULSE_LOG_FLUSH_SECONDS = float(os.getenv("PULSE_LOG_FLUSH_SECONDS", 1))
+PULSE_LOG_QUEUE_SIZE = int(os.getenv("PULSE_LOG_QUEUE_SIZE", 10_000))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "pipeline": {"class": "pulse.logs.PipelineHandler"},
+    },
+    "loggers": {
+        "pulse.access": {
+            "handlers": ["pipeline"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "pulse.audit": {
+            "handlers": ["pipeline"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
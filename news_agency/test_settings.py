@@ -0,0 +1,12 @@
+from news_agency.settings import *  # noqa: F401,F403
+from news_agency.settings import CACHES
+
+# Tests must not share state between runs through the file cache.
+# `manage.py test` selects this module; point DJANGO_SETTINGS_MODULE here
+# for other runners.
+CACHES = {
+    **CACHES,
+    "shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_agency.settings')
 
 application = get_wsgi_application()
+
+from pulse import logs  # noqa: E402
+
+logs.enable()
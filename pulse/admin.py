@@ -1,6 +1,17 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from pulse.models import Topic, Redactor, Newspaper
+from django.db.models import Count
+from django.utils import timezone
+
+from pulse import search
+from pulse.models import (
+    AuditEntry,
+    Job,
+    Newspaper,
+    NewspaperArchive,
+    Redactor,
+    Topic,
+)
 
 
 @admin.register(Topic)
@@ -8,6 +19,15 @@ class TopicAdmin(admin.ModelAdmin):
     list_display = ["name"]
     search_fields = ["name"]
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        for term in search_term.split():
+            queryset = search.filter_substring(
+                queryset, "name", term, "topic"
+            )
+        return queryset, False
+
 
 @admin.register(Redactor)
 class RedactorAdmin(UserAdmin):
@@ -32,11 +52,106 @@ class RedactorAdmin(UserAdmin):
 
 @admin.register(Newspaper)
 class NewspaperAdmin(admin.ModelAdmin):
-    list_display = ["title", "published_date"]
-    list_filter = ["published_date", "topic", "publishers"]
-    search_fields = ["title", "content"]
+    list_display = ["title", "published_date", "duplicate_of"]
+    list_filter = [
+        "published_date",
+        "topic",
+        "publishers",
+        ("duplicate_of", admin.EmptyFieldListFilter),
+    ]
+    search_fields = ["title"]
+    list_select_related = ["duplicate_of"]
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        results = queryset
+        for term in search_term.split():
+            results = search.filter_substring(results, "title", term)
+        content_ids = search.matching_ids(search_term)
+        if content_ids is not None:
+            results |= queryset.filter(pk__in=content_ids)
+        return results, False
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
         queryset = queryset.prefetch_related("topic", "publishers")
         return queryset
+
+
+@admin.register(NewspaperArchive)
+class NewspaperArchiveAdmin(admin.ModelAdmin):
+    list_display = ["title", "published_date", "archived_at"]
+    list_filter = ["published_date"]
+    search_fields = ["title"]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "task",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_at",
+        "locked_by",
+        "finished_at",
+    ]
+    list_filter = ["status", "task"]
+    search_fields = ["task", "last_error"]
+    readonly_fields = [
+        "attempts",
+        "locked_by",
+        "locked_at",
+        "last_error",
+        "created_at",
+        "finished_at",
+    ]
+    actions = ["retry_jobs"]
+
+    def changelist_view(self, request, extra_context=None):
+        counts = dict(
+            Job.objects.order_by()
+            .values_list("status")
+            .annotate(total=Count("id"))
+        )
+        extra_context = extra_context or {}
+        extra_context["status_counts"] = [
+            (label, counts.get(value, 0))
+            for value, label in Job.Status.choices
+        ]
+        return super().changelist_view(request, extra_context=extra_context)
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.QUEUED,
+            attempts=0,
+            run_at=timezone.now(),
+            finished_at=None,
+        )
+        self.message_user(request, f"{updated} job(s) queued for retry.")
+
+
+@admin.register(AuditEntry)
+class AuditEntryAdmin(admin.ModelAdmin):
+    list_display = [
+        "created_at",
+        "action",
+        "model",
+        "object_id",
+        "object_repr",
+        "user_id",
+    ]
+    list_filter = ["action", "model"]
+    search_fields = ["object_repr"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
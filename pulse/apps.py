@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PulseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pulse'
+
+    def ready(self):
+        from pulse import checks, signals  # noqa: F401
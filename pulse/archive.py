@@ -0,0 +1,289 @@
+import base64
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import IntegerField, Max, Value
+
+from pulse import compression, revisions
+from pulse.models import (
+    DailyPageViews,
+    Newspaper,
+    NewspaperArchive,
+    NewspaperRevision,
+    Redactor,
+)
+
+LATEST_ARCHIVED_DATE_KEY = "pulse:archive:latest_date"
+
+# Set while rows leave the live table for an archive tier, so the delete
+# receivers that would record an editor's deletion leave the move alone.
+_moving = ContextVar("pulse_archive_moving", default=False)
+
+
+@contextmanager
+def moving():
+    token = _moving.set(True)
+    try:
+        yield
+    finally:
+        _moving.reset(token)
+
+
+def is_moving():
+    return _moving.get()
+
+
+def archive_cutoff(today=None):
+    today = today or date.today()
+    return today - timedelta(days=settings.PULSE_ARCHIVE_AFTER_DAYS)
+
+
+def latest_archived_date():
+    value = cache.get(LATEST_ARCHIVED_DATE_KEY)
+    if value is None:
+        latest = NewspaperArchive.objects.aggregate(
+            latest=Max("published_date")
+        )["latest"]
+        value = latest.isoformat() if latest else ""
+        cache.set(LATEST_ARCHIVED_DATE_KEY, value, None)
+    return date.fromisoformat(value) if value else None
+
+
+def should_search_archive(cleaned_data):
+    if cleaned_data.get("include_archive"):
+        return True
+    published_date = cleaned_data.get("published_date")
+    if not published_date:
+        return False
+    latest = latest_archived_date()
+    return latest is not None and published_date <= latest
+
+
+def _partition_bounds(day, granularity):
+    if granularity == "year":
+        start = date(day.year, 1, 1)
+        return start, date(day.year + 1, 1, 1), f"y{day.year}"
+    start = date(day.year, day.month, 1)
+    if day.month == 12:
+        end = date(day.year + 1, 1, 1)
+    else:
+        end = date(day.year, day.month + 1, 1)
+    return start, end, f"y{day.year}m{day.month:02d}"
+
+
+def ensure_partitions(dates, granularity=None):
+    if connection.vendor != "postgresql":
+        return []
+    granularity = granularity or settings.PULSE_ARCHIVE_PARTITION
+    table = NewspaperArchive._meta.db_table
+    created = []
+    bounds = {_partition_bounds(day, granularity) for day in dates}
+    with connection.cursor() as cursor:
+        for start, end, suffix in sorted(bounds):
+            name = f"{table}_{suffix}"
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+            created.append(name)
+    return created
+
+
+def _copy_relations(field_name, ids):
+    source = getattr(Newspaper, field_name).through
+    target = getattr(NewspaperArchive, field_name).through
+    related_column = Newspaper._meta.get_field(field_name).m2m_reverse_name()
+    rows = source.objects.filter(newspaper_id__in=ids).values_list(
+        "newspaper_id", related_column
+    )
+    target.objects.bulk_create(
+        target(newspaperarchive_id=newspaper_id, **{related_column: other})
+        for newspaper_id, other in rows
+    )
+
+
+def history(ids):
+    # What deleting a newspaper row would cascade away: its revisions,
+    # page views and duplicate links in both directions.
+    entries = {
+        pk: {
+            "duplicate_of": None,
+            "duplicates": [],
+            "revisions": [],
+            "views": [],
+        }
+        for pk in ids
+    }
+    for pk, title, published_date, delta, edited_by, created_at in (
+        NewspaperRevision.objects.filter(newspaper_id__in=ids)
+        .order_by("pk")
+        .values_list(
+            "newspaper_id",
+            "title",
+            "published_date",
+            "delta",
+            "edited_by_id",
+            "created_at",
+        )
+    ):
+        entries[pk]["revisions"].append(
+            [
+                title,
+                published_date.isoformat(),
+                base64.b64encode(bytes(delta)).decode(),
+                edited_by,
+                created_at.isoformat(),
+            ]
+        )
+    for pk, day, views in (
+        DailyPageViews.objects.filter(newspaper_id__in=ids)
+        .order_by("date")
+        .values_list("newspaper_id", "date", "views")
+    ):
+        entries[pk]["views"].append([day.isoformat(), views])
+    for pk, duplicate_of in Newspaper.objects.filter(
+        pk__in=ids, duplicate_of__isnull=False
+    ).values_list("pk", "duplicate_of_id"):
+        entries[pk]["duplicate_of"] = duplicate_of
+    for pk, duplicate_of in (
+        Newspaper.objects.filter(duplicate_of_id__in=ids)
+        .order_by("pk")
+        .values_list("pk", "duplicate_of_id")
+    ):
+        entries[duplicate_of]["duplicates"].append(pk)
+    return entries
+
+
+def restore_history(entries):
+    # The reverse of history() for rows back in the live table. A
+    # duplicate link survives only if the other side is live too.
+    entries = {pk: entry for pk, entry in entries.items() if entry}
+    linked = {entry.get("duplicate_of") for entry in entries.values()}
+    linked |= {
+        pk for entry in entries.values() for pk in entry.get("duplicates", [])
+    }
+    live = set(
+        Newspaper.objects.filter(pk__in=linked).values_list("pk", flat=True)
+    )
+    editors = set(
+        Redactor.objects.filter(
+            pk__in={
+                revision[3]
+                for entry in entries.values()
+                for revision in entry.get("revisions", [])
+            }
+        ).values_list("pk", flat=True)
+    )
+    for pk, entry in entries.items():
+        if entry.get("duplicate_of") in live:
+            Newspaper.objects.filter(pk=pk).update(
+                duplicate_of_id=entry["duplicate_of"]
+            )
+        duplicates = [
+            other for other in entry.get("duplicates", []) if other in live
+        ]
+        if duplicates:
+            Newspaper.objects.filter(
+                pk__in=duplicates, duplicate_of__isnull=True
+            ).update(duplicate_of_id=pk)
+    restored = NewspaperRevision.objects.bulk_create(
+        NewspaperRevision(
+            newspaper_id=pk,
+            title=title,
+            published_date=published_date,
+            delta=base64.b64decode(delta),
+            edited_by_id=edited_by if edited_by in editors else None,
+            created_at=created_at,
+        )
+        for pk, entry in entries.items()
+        for title, published_date, delta, edited_by, created_at in (
+            entry.get("revisions", [])
+        )
+    )
+    revisions.forget(revision.pk for revision in restored)
+    DailyPageViews.objects.bulk_create(
+        DailyPageViews(newspaper_id=pk, date=day, views=views)
+        for pk, entry in entries.items()
+        for day, views in entry.get("views", [])
+    )
+
+
+def archive_newspapers(before=None, batch_size=500, granularity=None):
+    before = before or archive_cutoff()
+    moved = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Newspaper.objects.filter(published_date__lt=before)
+                .order_by("pk")
+                .values(
+                    "id", "title", "content", "content_blob", "published_date"
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            for row in batch:
+                row["content"] = compression.stored_text(
+                    row["content"], row.pop("content_blob")
+                )
+            ids = [row["id"] for row in batch]
+            ensure_partitions(
+                {row["published_date"] for row in batch}, granularity
+            )
+            entries = history(ids)
+            NewspaperArchive.objects.bulk_create(
+                NewspaperArchive(**row, history=entries[row["id"]])
+                for row in batch
+            )
+            _copy_relations("topic", ids)
+            _copy_relations("publishers", ids)
+            # The rows' search index, related and dedup entries only serve
+            # the live table and go with them.
+            with moving():
+                Newspaper.objects.filter(pk__in=ids).delete()
+        moved += len(batch)
+    if moved:
+        cache.delete(LATEST_ARCHIVED_DATE_KEY)
+    return moved
+
+
+class CombinedNewspapers:
+    fields = ("id", "published_date", "title")
+
+    def __init__(self, live, archived):
+        live = live.order_by().annotate(
+            source=Value(0, output_field=IntegerField())
+        )
+        archived = archived.order_by().annotate(
+            source=Value(1, output_field=IntegerField())
+        )
+        self.union = (
+            live.values_list(*self.fields, "source")
+            .union(archived.values_list(*self.fields, "source"), all=True)
+            .order_by("published_date", "title")
+        )
+
+    def count(self):
+        return self.union.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        rows = list(self.union[index])
+        models = (Newspaper, NewspaperArchive)
+        objects = {}
+        for source, model in enumerate(models):
+            ids = [row[0] for row in rows if row[-1] == source]
+            if ids:
+                queryset = model.objects.filter(pk__in=ids).only(
+                    *self.fields
+                )
+                for obj in queryset.prefetch_related("topic"):
+                    objects[source, obj.pk] = obj
+        return [objects[row[-1], row[0]] for row in rows]
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from pulse import filecache
+
+ATOMIC_CACHE_BACKENDS = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+)
+# Atomic for the processes of a single host, where file locks exist.
+if filecache.fcntl is not None:
+    ATOMIC_CACHE_BACKENDS += ("pulse.filecache.LockingFileBasedCache",)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    # incr() on the file and locmem backends is a get followed by a set,
+    # so version bumps and rate limits race between workers.
+    backend = settings.CACHES.get("shared", {}).get("BACKEND", "")
+    if backend in ATOMIC_CACHE_BACKENDS:
+        return []
+    return [
+        Error(
+            f"The shared cache backend {backend!r} has no atomic incr.",
+            hint="Set PULSE_SHARED_CACHE_BACKEND to a Redis or memcached "
+            "backend, or to pulse.filecache.LockingFileBasedCache on a "
+            "single host.",
+            id="pulse.E001",
+        )
+    ]
@@ -0,0 +1,410 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from pulse import archive, compression, dedup, productivity, search
+from pulse.models import Newspaper, NewspaperArchive, Redactor, Topic
+from pulse.versions import NEWSPAPER_LIST, bump_version
+
+Topics = Newspaper.topic.through
+Publishers = Newspaper.publishers.through
+
+# A segment is a pair of append-only files written once by an export: the
+# data file holds one zlib-compressed JSON record per newspaper, and the
+# index file the (id, offset, length) entries sorted by id. A zero length
+# is a tombstone, written when a newspaper is restored to the database.
+DATA_MAGIC = b"PCD1"
+INDEX_MAGIC = b"PCI1"
+INDEX_HEADER = struct.Struct(">4sI")
+INDEX_ENTRY = struct.Struct(">QQI")
+SOURCES = (Newspaper, NewspaperArchive)
+# Records name the table they came from and are restored into it; those
+# written before that was recorded go back to the live table.
+HISTORY_KEYS = ("duplicate_of", "duplicates", "revisions", "views")
+
+_lock = threading.Lock()
+_segments = {}
+_listing = {}
+
+
+def cold_cutoff(today=None):
+    today = today or date.today()
+    return today - timedelta(days=settings.PULSE_COLD_ARCHIVE_AFTER_DAYS)
+
+
+def archive_dir():
+    return Path(settings.PULSE_COLD_ARCHIVE_DIR)
+
+
+class Segment:
+    def __init__(self, path):
+        self.name = path.stem
+        with open(path.with_suffix(".idx"), "rb") as index_file:
+            self.index = mmap.mmap(
+                index_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        with open(path.with_suffix(".dat"), "rb") as data_file:
+            self.data = mmap.mmap(
+                data_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        magic, self.count = INDEX_HEADER.unpack_from(self.index)
+        if magic != INDEX_MAGIC or self.data[:4] != DATA_MAGIC:
+            raise ValueError(f"{path} is not a cold archive segment")
+
+    def entry(self, position):
+        return INDEX_ENTRY.unpack_from(
+            self.index, INDEX_HEADER.size + position * INDEX_ENTRY.size
+        )
+
+    def find(self, pk):
+        # Binary search straight over the mapped index, so a lookup only
+        # touches a few pages and nothing is loaded up front.
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            entry = self.entry(middle)
+            if entry[0] < pk:
+                low = middle + 1
+            elif entry[0] > pk:
+                high = middle
+            else:
+                return entry
+        return None
+
+    def read(self, offset, length):
+        return json.loads(zlib.decompress(self.data[offset:offset + length]))
+
+    def entries(self):
+        for position in range(self.count):
+            yield self.entry(position)
+
+    def close(self):
+        self.index.close()
+        self.data.close()
+
+
+def segments(directory=None):
+    # Newest first. The directory listing is reread only when its mtime
+    # changes, i.e. when an export or restore added a segment.
+    directory = Path(directory or archive_dir())
+    try:
+        mtime = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    with _lock:
+        listed = _listing.get(directory)
+        if listed is None or listed[0] != mtime:
+            names = sorted(
+                (path.stem for path in directory.glob("*.idx")), reverse=True
+            )
+            listed = _listing[directory] = (mtime, names)
+        result = []
+        for name in listed[1]:
+            key = directory / name
+            if key not in _segments:
+                _segments[key] = Segment(key)
+            result.append(_segments[key])
+        return result
+
+
+def reset():
+    with _lock:
+        for segment in _segments.values():
+            segment.close()
+        _segments.clear()
+        _listing.clear()
+
+
+class ColdNewspaper:
+    is_archived = True
+    duplicate_of_id = None
+
+    def __init__(self, record):
+        self.id = self.pk = record["id"]
+        self.title = record["title"]
+        self.content = record["content"]
+        self.published_date = date.fromisoformat(record["published_date"])
+        self.topic_ids = record["topic"]
+        self.publisher_ids = record["publishers"]
+
+    @property
+    def topic(self):
+        return Topic.objects.filter(pk__in=self.topic_ids)
+
+    @property
+    def publishers(self):
+        return Redactor.objects.filter(pk__in=self.publisher_ids)
+
+    def __str__(self):
+        return self.title
+
+
+def _lookup(pk, directory=None):
+    for segment in segments(directory):
+        entry = segment.find(pk)
+        if entry is not None:
+            _, offset, length = entry
+            return segment.read(offset, length) if length else None
+    return None
+
+
+def get(pk, directory=None):
+    record = _lookup(pk, directory)
+    return ColdNewspaper(record) if record else None
+
+
+def live_ids(directory=None):
+    seen = set()
+    live = []
+    for segment in segments(directory):
+        for pk, _, length in segment.entries():
+            if pk not in seen:
+                seen.add(pk)
+                if length:
+                    live.append(pk)
+    return sorted(live)
+
+
+def write_segment(records, directory=None):
+    # records yields (id, record or None for a tombstone). The data file
+    # is claimed with O_EXCL so concurrent writers never share a name, and
+    # the index only appears, complete, once the data is on disk.
+    directory = Path(directory or archive_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    number = max(
+        (int(path.stem) for path in directory.glob("*.dat")), default=0
+    )
+    while True:
+        number += 1
+        path = directory / f"{number:08d}"
+        try:
+            fd = os.open(
+                path.with_suffix(".dat"),
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                0o644,
+            )
+            break
+        except FileExistsError:
+            continue
+    entries = {}
+    with os.fdopen(fd, "wb") as data_file:
+        data_file.write(DATA_MAGIC)
+        offset = len(DATA_MAGIC)
+        for pk, record in records:
+            if record is None:
+                entries[pk] = (pk, 0, 0)
+                continue
+            payload = zlib.compress(
+                json.dumps(record, separators=(",", ":")).encode(), 9
+            )
+            data_file.write(payload)
+            entries[pk] = (pk, offset, len(payload))
+            offset += len(payload)
+        data_file.flush()
+        os.fsync(data_file.fileno())
+    temporary = path.with_suffix(".idx.tmp")
+    with open(temporary, "wb") as index_file:
+        index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, len(entries)))
+        for pk in sorted(entries):
+            index_file.write(INDEX_ENTRY.pack(*entries[pk]))
+        index_file.flush()
+        os.fsync(index_file.fileno())
+    os.replace(temporary, path.with_suffix(".idx"))
+    with _lock:
+        _listing.pop(directory, None)
+    return path.stem, len(entries)
+
+
+def _relations(model, field_name, ids):
+    field = model._meta.get_field(field_name)
+    related = {}
+    for pk, other in field.remote_field.through.objects.filter(
+        **{f"{field.m2m_field_name()}__in": ids}
+    ).values_list(field.m2m_field_name(), field.m2m_reverse_name()):
+        related.setdefault(pk, []).append(other)
+    return related
+
+
+def _records(model, before, batch_size):
+    fields = ["id", "title", "content", "published_date"]
+    fields.append("content_blob" if model is Newspaper else "history")
+    last = 0
+    while True:
+        batch = list(
+            model.objects.filter(published_date__lt=before, pk__gt=last)
+            .order_by("pk")
+            .values(*fields)[:batch_size]
+        )
+        if not batch:
+            return
+        ids = [row["id"] for row in batch]
+        topics = _relations(model, "topic", ids)
+        publishers = _relations(model, "publishers", ids)
+        history = archive.history(ids) if model is Newspaper else {}
+        for row in batch:
+            row["content"] = compression.stored_text(
+                row["content"], row.pop("content_blob", None)
+            )
+            row["published_date"] = row["published_date"].isoformat()
+            row["topic"] = sorted(topics.get(row["id"], []))
+            row["publishers"] = sorted(publishers.get(row["id"], []))
+            row.update(row.pop("history", None) or history.get(row["id"], {}))
+            row["model"] = model._meta.label_lower
+            yield row["id"], row
+        last = ids[-1]
+
+
+def export_newspapers(before=None, batch_size=500, directory=None):
+    before = before or cold_cutoff()
+    exported = {model: [] for model in SOURCES}
+
+    def records():
+        for model in SOURCES:
+            for pk, record in _records(model, before, batch_size):
+                exported[model].append(pk)
+                yield pk, record
+
+    name, count = write_segment(records(), directory)
+    if not count:
+        for suffix in (".dat", ".idx"):
+            (Path(directory or archive_dir()) / name).with_suffix(
+                suffix
+            ).unlink()
+        return 0
+    # The rows only go once their segment is on disk; until then, and if
+    # this is interrupted, the database copy shadows the archived one.
+    # Only live rows count towards the rollups here, as restore puts them
+    # back only for rows returning to the live table.
+    for model, ids in exported.items():
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            with transaction.atomic(), archive.moving():
+                if model is Newspaper:
+                    productivity.apply(
+                        productivity.publication_deltas(
+                            Publishers.objects.filter(
+                                newspaper_id__in=batch
+                            ).values_list("redactor_id", "newspaper_id"),
+                            -1,
+                        )
+                    )
+                model.objects.filter(pk__in=batch).delete()
+    if exported[NewspaperArchive]:
+        cache.delete(archive.LATEST_ARCHIVED_DATE_KEY)
+    bump_version(NEWSPAPER_LIST)
+    return count
+
+
+def _restore_live(records):
+    topic_ids = set(Topic.objects.values_list("pk", flat=True))
+    redactor_ids = set(
+        Redactor.objects.filter(
+            pk__in={pk for record in records for pk in record["publishers"]}
+        ).values_list("pk", flat=True)
+    )
+    Newspaper.objects.bulk_create(
+        Newspaper(
+            id=record["id"],
+            title=record["title"],
+            content=record["content"],
+            published_date=record["published_date"],
+        )
+        for record in records
+    )
+    archive.restore_history({record["id"]: record for record in records})
+    Topics.objects.bulk_create(
+        Topics(newspaper_id=record["id"], topic_id=topic_id)
+        for record in records
+        for topic_id in record["topic"]
+        if topic_id in topic_ids
+    )
+    pairs = [
+        (redactor_id, record["id"])
+        for record in records
+        for redactor_id in record["publishers"]
+        if redactor_id in redactor_ids
+    ]
+    Publishers.objects.bulk_create(
+        Publishers(newspaper_id=newspaper_id, redactor_id=redactor_id)
+        for redactor_id, newspaper_id in pairs
+    )
+    search.bulk_index_newspapers(
+        (record["id"], record["title"], record["content"])
+        for record in records
+    )
+    productivity.apply(productivity.publication_deltas(pairs))
+    for record in records:
+        dedup.store_signature(record["id"], dedup.minhash(record["content"]))
+
+
+def _restore_archived(records):
+    # Archived rows keep counting towards the rollups while cold, and are
+    # not in the live search index, so neither is touched here.
+    archive.ensure_partitions(
+        {date.fromisoformat(record["published_date"]) for record in records}
+    )
+    NewspaperArchive.objects.bulk_create(
+        NewspaperArchive(
+            id=record["id"],
+            title=record["title"],
+            content=record["content"],
+            published_date=record["published_date"],
+            history={
+                key: record[key] for key in HISTORY_KEYS if key in record
+            },
+        )
+        for record in records
+    )
+    for field_name in ("topic", "publishers"):
+        through = getattr(NewspaperArchive, field_name).through
+        column = NewspaperArchive._meta.get_field(
+            field_name
+        ).m2m_reverse_name()
+        through.objects.bulk_create(
+            through(newspaperarchive_id=record["id"], **{column: other})
+            for record in records
+            for other in record[field_name]
+        )
+
+
+def restore_newspapers(ids=None, directory=None):
+    ids = live_ids(directory) if ids is None else sorted(set(ids))
+    existing = set(
+        Newspaper.objects.filter(pk__in=ids).values_list("pk", flat=True)
+    ) | set(
+        NewspaperArchive.objects.filter(pk__in=ids).values_list(
+            "pk", flat=True
+        )
+    )
+    records = [
+        record
+        for record in (_lookup(pk, directory) for pk in ids)
+        if record is not None and record["id"] not in existing
+    ]
+    if not records:
+        return 0
+    label = NewspaperArchive._meta.label_lower
+    archived = [record for record in records if record.get("model") == label]
+    live = [record for record in records if record.get("model") != label]
+    with transaction.atomic():
+        if live:
+            _restore_live(live)
+        if archived:
+            _restore_archived(archived)
+            transaction.on_commit(
+                lambda: cache.delete(archive.LATEST_ARCHIVED_DATE_KEY)
+            )
+        transaction.on_commit(lambda: bump_version(NEWSPAPER_LIST))
+    # Tombstones go in only after the rows are committed, so a crash in
+    # between leaves both copies rather than neither.
+    write_segment(((record["id"], None) for record in records), directory)
+    return len(records)
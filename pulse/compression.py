@@ -0,0 +1,159 @@
+import re
+import struct
+import zlib
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZLIB = 1
+ZSTD = 2
+CODECS = {"zlib": ZLIB, "zstd": ZSTD}
+HEADER = struct.Struct(">BI")
+ZLIB_MAX_DICTIONARY_SIZE = 32 * 1024
+
+_dictionaries = {}
+_active_dictionary = {}
+
+
+def active_codec():
+    name = settings.PULSE_CONTENT_COMPRESSION
+    if not name:
+        return None
+    if name not in CODECS:
+        raise ImproperlyConfigured(
+            f"PULSE_CONTENT_COMPRESSION must be one of {sorted(CODECS)}"
+        )
+    if name == "zstd" and zstandard is None:
+        raise ImproperlyConfigured(
+            "zstd content compression requires the zstandard package"
+        )
+    return name
+
+
+def _load_dictionary(dictionary_id):
+    if dictionary_id not in _dictionaries:
+        from pulse.models import ContentDictionary
+
+        _dictionaries[dictionary_id] = bytes(
+            ContentDictionary.objects.get(pk=dictionary_id).data
+        )
+    return _dictionaries[dictionary_id]
+
+
+def _current_dictionary(codec):
+    if codec not in _active_dictionary:
+        from pulse.models import ContentDictionary
+
+        latest = (
+            ContentDictionary.objects.filter(codec=codec)
+            .order_by("-pk")
+            .first()
+        )
+        if latest is not None:
+            _dictionaries[latest.pk] = bytes(latest.data)
+        _active_dictionary[codec] = latest.pk if latest else 0
+    return _active_dictionary[codec]
+
+
+def reset_dictionary_cache():
+    _dictionaries.clear()
+    _active_dictionary.clear()
+
+
+def compress(text, codec=None):
+    codec = codec or active_codec()
+    dictionary_id = _current_dictionary(codec)
+    data = text.encode("utf-8")
+    dictionary = _load_dictionary(dictionary_id) if dictionary_id else None
+    if codec == "zstd":
+        compressor = zstandard.ZstdCompressor(
+            level=10,
+            dict_data=(
+                zstandard.ZstdCompressionDict(dictionary)
+                if dictionary
+                else None
+            ),
+        )
+        payload = compressor.compress(data)
+    else:
+        if dictionary:
+            compressor = zlib.compressobj(level=9, zdict=dictionary)
+        else:
+            compressor = zlib.compressobj(level=9)
+        payload = compressor.compress(data) + compressor.flush()
+    return HEADER.pack(CODECS[codec], dictionary_id) + payload
+
+
+def decompress(blob):
+    blob = bytes(blob)
+    codec, dictionary_id = HEADER.unpack_from(blob)
+    payload = blob[HEADER.size:]
+    dictionary = _load_dictionary(dictionary_id) if dictionary_id else None
+    if codec == ZSTD:
+        if zstandard is None:
+            raise ImproperlyConfigured(
+                "Decompressing zstd content requires the zstandard package"
+            )
+        decompressor = zstandard.ZstdDecompressor(
+            dict_data=(
+                zstandard.ZstdCompressionDict(dictionary)
+                if dictionary
+                else None
+            )
+        )
+        data = decompressor.decompress(payload)
+    elif dictionary:
+        decompressor = zlib.decompressobj(zdict=dictionary)
+        data = decompressor.decompress(payload) + decompressor.flush()
+    else:
+        data = zlib.decompress(payload)
+    return data.decode("utf-8")
+
+
+def stored_text(content, blob):
+    if not content and blob:
+        return decompress(blob)
+    return content
+
+
+def train_dictionary(samples, codec, size=ZLIB_MAX_DICTIONARY_SIZE):
+    samples = [sample.encode("utf-8") for sample in samples if sample]
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImproperlyConfigured(
+                "Training a zstd dictionary requires the zstandard package"
+            )
+        return zstandard.train_dictionary(size, samples).as_bytes()
+
+    # zlib has no trainer; build a preset dictionary from the phrases that
+    # save the most bytes. zlib prefers matches near the end of the window,
+    # so the most valuable phrases go last.
+    size = min(size, ZLIB_MAX_DICTIONARY_SIZE)
+    phrases = Counter()
+    for sample in samples:
+        words = re.findall(rb"\S+\s*", sample)
+        for length in (1, 2, 3):
+            for start in range(len(words) - length + 1):
+                phrases[b"".join(words[start:start + length])] += 1
+    ranked = sorted(
+        (
+            (count * len(phrase), phrase)
+            for phrase, count in phrases.items()
+            if count > 1 and len(phrase) > 3
+        ),
+        reverse=True,
+    )
+    chosen = []
+    total = 0
+    for _, phrase in ranked:
+        if total + len(phrase) > size:
+            continue
+        chosen.append(phrase)
+        total += len(phrase)
+    return b"".join(reversed(chosen))
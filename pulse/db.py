@@ -0,0 +1,72 @@
+from django.db import connection, router, transaction
+from django.db.models.signals import m2m_changed
+
+
+def increment_rows(model, key_fields, count_field, rows):
+    # Plain ON CONFLICT works on both SQLite and Postgres and lets the
+    # database add to the stored count instead of a read-modify-write.
+    if not rows:
+        return 0
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    keys = [quote(model._meta.get_field(name).column) for name in key_fields]
+    count = quote(model._meta.get_field(count_field).column)
+    columns = ", ".join(keys + [count])
+    placeholders = ", ".join(["%s"] * (len(keys) + 1))
+    sql = (
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({', '.join(keys)}) "
+        f"DO UPDATE SET {count} = {table}.{count} + excluded.{count}"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+    return len(rows)
+
+
+def _send_m2m_changed(manager, action, pk_set, using):
+    m2m_changed.send(
+        sender=manager.through,
+        action=action,
+        instance=manager.instance,
+        reverse=False,
+        model=manager.model,
+        pk_set=pk_set,
+        using=using,
+    )
+
+
+def sync_m2m(instance, field_name, targets):
+    # Like manager.set(), but the inserted rows are known to be missing, so
+    # the extra lookup add() does before its insert is skipped.
+    manager = getattr(instance, field_name)
+    through = manager.through
+    source = f"{manager.source_field_name}_id"
+    target = f"{manager.target_field_name}_id"
+    wanted = {obj.pk for obj in targets}
+    current = set(
+        through.objects.filter(**{source: instance.pk}).values_list(
+            target, flat=True
+        )
+    )
+    added, removed = wanted - current, current - wanted
+    if not added and not removed:
+        return added, removed
+    getattr(instance, "_prefetched_objects_cache", {}).pop(
+        manager.prefetch_cache_name, None
+    )
+    using = router.db_for_write(through, instance=instance)
+    with transaction.atomic(using=using, savepoint=False):
+        if removed:
+            _send_m2m_changed(manager, "pre_remove", removed, using)
+            through.objects.using(using).filter(
+                **{source: instance.pk, f"{target}__in": removed}
+            ).delete()
+            _send_m2m_changed(manager, "post_remove", removed, using)
+        if added:
+            _send_m2m_changed(manager, "pre_add", added, using)
+            through.objects.using(using).bulk_create(
+                through(**{source: instance.pk, target: pk})
+                for pk in sorted(added)
+            )
+            _send_m2m_changed(manager, "post_add", added, using)
+    return added, removed
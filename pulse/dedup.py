@@ -0,0 +1,121 @@
+import hashlib
+import random
+import re
+import struct
+
+from django.conf import settings
+from django.db.models import Q
+
+from pulse.models import Newspaper, NewspaperSignature, SignatureBand
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+SIGNATURE = struct.Struct(f">{NUM_PERMUTATIONS}I")
+
+# XOR with random masks over a strong 64-bit hash stands in for the usual
+# (a * x + b) mod p permutations at a third of the cost in pure Python.
+_random = random.Random(20240426)
+PERMUTATION_MASKS = [_random.getrandbits(64) for _ in range(NUM_PERMUTATIONS)]
+
+
+def _hash64(data):
+    return int.from_bytes(
+        hashlib.blake2b(data, digest_size=8).digest(), "big"
+    )
+
+
+def shingles(text):
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(text):
+    hashes = [_hash64(shingle.encode("utf-8")) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return [
+        min(map(mask.__xor__, hashes)) & 0xFFFFFFFF
+        for mask in PERMUTATION_MASKS
+    ]
+
+
+def pack(signature):
+    return SIGNATURE.pack(*signature)
+
+
+def unpack(data):
+    return SIGNATURE.unpack(bytes(data))
+
+
+def band_buckets(signature):
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            struct.pack(f">{ROWS_PER_BAND}I", *rows), digest_size=8
+        ).digest()
+        buckets.append((band, int.from_bytes(digest, "big", signed=True)))
+    return buckets
+
+
+def similarity(first, second):
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERMUTATIONS
+
+
+def find_duplicates(signature, exclude_pk=None, threshold=None):
+    if signature is None:
+        return []
+    threshold = threshold or settings.PULSE_DUPLICATE_THRESHOLD
+    condition = Q()
+    for band, bucket in band_buckets(signature):
+        condition |= Q(band=band, bucket=bucket)
+    candidates = SignatureBand.objects.filter(condition).values_list(
+        "newspaper_id", flat=True
+    )
+    if exclude_pk is not None:
+        candidates = candidates.exclude(newspaper_id=exclude_pk)
+    matches = []
+    for newspaper_id, data in NewspaperSignature.objects.filter(
+        newspaper_id__in=set(candidates)
+    ).values_list("newspaper_id", "signature"):
+        score = similarity(signature, unpack(data))
+        if score >= threshold:
+            matches.append((newspaper_id, score))
+    return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+
+def store_signature(newspaper_id, signature):
+    SignatureBand.objects.filter(newspaper_id=newspaper_id).delete()
+    if signature is None:
+        NewspaperSignature.objects.filter(newspaper_id=newspaper_id).delete()
+        return
+    NewspaperSignature.objects.update_or_create(
+        newspaper_id=newspaper_id, defaults={"signature": pack(signature)}
+    )
+    SignatureBand.objects.bulk_create(
+        SignatureBand(newspaper_id=newspaper_id, band=band, bucket=bucket)
+        for band, bucket in band_buckets(signature)
+    )
+
+
+def check_newspaper(newspaper, signature=None):
+    if signature is None:
+        signature = minhash(newspaper.content)
+    matches = find_duplicates(signature, exclude_pk=newspaper.pk)
+    store_signature(newspaper.pk, signature)
+    # Point at the oldest matching article so chains of copies collapse
+    # onto a single original.
+    original = min((pk for pk, _ in matches), default=None)
+    if original is not None and original > newspaper.pk:
+        original = None
+    if original != newspaper.duplicate_of_id:
+        Newspaper.objects.filter(pk=newspaper.pk).update(duplicate_of=original)
+        newspaper.duplicate_of_id = original
+    return matches
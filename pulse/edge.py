@@ -0,0 +1,96 @@
+import json
+import urllib.request
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.dispatch import Signal
+from django.utils.cache import patch_cache_control
+
+from pulse import jobs
+from pulse.models import Job
+
+INDEX_TAG = "index"
+STALE_IF_ERROR_SECONDS = 60 * 60 * 24
+PURGE_TIMEOUT = 10
+
+# Sent with the purged tags, for integrations other than the purge URL.
+purge_requested = Signal()
+
+
+def is_anonymous(request):
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def edge_cache(tags=()):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            anonymous = is_anonymous(request)
+            if anonymous:
+                # Without a session cookie there is nobody to look up, and
+                # leaving the session unread keeps Vary: Cookie off.
+                request.user = AnonymousUser()
+            response = view(request, *args, **kwargs)
+            if not anonymous:
+                patch_cache_control(response, private=True)
+                return response
+            if request.method not in ("GET", "HEAD") or (
+                response.status_code not in (200, 304)
+            ):
+                return response
+            # Browsers revalidate every time; shared caches keep the page
+            # and may serve it stale while they refetch it.
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=0,
+                s_maxage=settings.PULSE_EDGE_CACHE_SECONDS,
+                stale_while_revalidate=settings.PULSE_EDGE_STALE_SECONDS,
+                stale_if_error=STALE_IF_ERROR_SECONDS,
+            )
+            response_tags = (
+                tags(request, *args, **kwargs) if callable(tags) else tags
+            )
+            if response_tags:
+                response["Cache-Tag"] = ",".join(response_tags)
+                response["Surrogate-Key"] = " ".join(response_tags)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def purge(tags):
+    tags = sorted(set(tags))
+    if not tags:
+        return
+    purge_requested.send(sender=None, tags=tags)
+    if not settings.PULSE_EDGE_PURGE_URL:
+        return
+    queued = Job.objects.filter(
+        task=purge_tags.task, args=[tags], status=Job.Status.QUEUED
+    )
+    if not queued.exists():
+        purge_tags.delay(tags)
+
+
+@jobs.job
+def purge_tags(tags):
+    # The JSON body matches Cloudflare's purge API and the Surrogate-Key
+    # header Fastly's, so either can sit behind PULSE_EDGE_PURGE_URL.
+    headers = {
+        "Content-Type": "application/json",
+        "Surrogate-Key": " ".join(tags),
+    }
+    if settings.PULSE_EDGE_PURGE_TOKEN:
+        headers["Authorization"] = f"Bearer {settings.PULSE_EDGE_PURGE_TOKEN}"
+    request = urllib.request.Request(
+        settings.PULSE_EDGE_PURGE_URL,
+        data=json.dumps({"tags": tags}).encode(),
+        headers=headers,
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=PURGE_TIMEOUT):
+        pass
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import logging
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+SEQUENCE_KEY = "pulse:events:sequence"
+EVENT_TIMEOUT = 60 * 5
+# Clients reconnecting after a longer gap only get the newest events.
+BACKLOG = 100
+QUEUE_SIZE = 100
+RETRY_MILLISECONDS = 5000
+
+_broadcasters = weakref.WeakKeyDictionary()
+
+
+def _event_key(sequence):
+    return f"pulse:events:{sequence}"
+
+
+def payload(newspaper, kind):
+    return {
+        "type": kind,
+        "id": newspaper.pk,
+        "title": newspaper.title,
+        "published_date": str(newspaper.published_date),
+        "topics": sorted(topic.name for topic in newspaper.topic.all()),
+        "url": reverse("pulse:newspaper-detail", args=[newspaper.pk]),
+        "update_url": reverse("pulse:newspaper-update", args=[newspaper.pk]),
+        "delete_url": reverse("pulse:newspaper-delete", args=[newspaper.pk]),
+    }
+
+
+def publish(event):
+    # Called once the change is committed; connected clients miss the
+    # event during a cache outage, but the save still succeeds.
+    try:
+        cache.add(SEQUENCE_KEY, 0, None)
+        sequence = cache.incr(SEQUENCE_KEY)
+        cache.set(_event_key(sequence), event, EVENT_TIMEOUT)
+    except Exception:
+        logger.warning("Could not publish a newspaper event", exc_info=True)
+        return None
+    return sequence
+
+
+def current_sequence():
+    return cache.get(SEQUENCE_KEY, 0)
+
+
+def read_since(cursor):
+    sequence = current_sequence()
+    if sequence <= cursor:
+        # A restarted cache starts counting again from zero.
+        return sequence, []
+    numbers = range(max(cursor + 1, sequence - BACKLOG + 1), sequence + 1)
+    found = cache.get_many([_event_key(number) for number in numbers])
+    return sequence, [
+        (number, found[_event_key(number)])
+        for number in numbers
+        if _event_key(number) in found
+    ]
+
+
+class Broadcaster:
+    # One poll of the change channel per worker, however many clients are
+    # connected; each client only waits on its own in-memory queue.
+
+    def __init__(self):
+        self.subscribers = set()
+        self.cursor = None
+        self.task = None
+
+    def subscribe(self):
+        queue = asyncio.Queue(QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    async def poll(self):
+        if self.cursor is None:
+            self.cursor = await sync_to_async(current_sequence)()
+            return
+        self.cursor, events = await sync_to_async(read_since)(self.cursor)
+        for queue in list(self.subscribers):
+            for event in events:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # The client is too slow; ending its stream makes the
+                    # browser reconnect and catch up via Last-Event-ID.
+                    self.subscribers.discard(queue)
+                    queue.get_nowait()
+                    queue.put_nowait(None)
+                    break
+
+    async def run(self):
+        while self.subscribers:
+            await self.poll()
+            await asyncio.sleep(settings.PULSE_EVENTS_POLL_SECONDS)
+        self.cursor = None
+
+
+def get_broadcaster():
+    loop = asyncio.get_running_loop()
+    broadcaster = _broadcasters.get(loop)
+    if broadcaster is None:
+        broadcaster = _broadcasters[loop] = Broadcaster()
+    return broadcaster
+
+
+def format_event(number, event):
+    return (
+        f"id: {number}\nevent: newspaper\n"
+        f"data: {json.dumps(event, separators=(',', ':'))}\n\n"
+    )
+
+
+async def stream(last_event_id=None):
+    broadcaster = get_broadcaster()
+    queue = broadcaster.subscribe()
+    delivered = last_event_id
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        if last_event_id is not None:
+            _, missed = await sync_to_async(read_since)(last_event_id)
+            for number, event in missed:
+                delivered = number
+                yield format_event(number, event)
+        while True:
+            try:
+                item = await asyncio.wait_for(
+                    queue.get(), settings.PULSE_EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            number, event = item
+            if delivered is not None and number <= delivered:
+                continue
+            delivered = number
+            yield format_event(number, event)
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+def _last_event_id(request):
+    value = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def newspaper_events(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would have to buffer the endless stream; 204 tells
+        # EventSource not to reconnect, so pages work without live rows.
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(
+        stream(_last_event_id(request)), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,135 @@
+import hashlib
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Value
+from django.db.models.functions import ExtractYear
+from django.utils.http import urlencode
+
+from pulse.models import Newspaper, Redactor, Topic
+from pulse.versions import NEWSPAPER_LIST, get_version
+
+# Facet name, the search form field it sets, and its heading.
+FACETS = (
+    ("topic", "topic", "Topics"),
+    ("publisher", "publisher", "Publishers"),
+    ("year", "year", "Years"),
+)
+
+
+def grouped_counts(queryset):
+    # Every facet comes back from one UNION ALL of grouped counts, so the
+    # cost does not grow with the number of topics or publishers.
+    ids = queryset.order_by().values("pk")
+    topics = (
+        Newspaper.topic.through.objects.filter(newspaper__in=ids)
+        .values(facet=Value("topic"), value=F("topic_id"))
+        .annotate(count=Count("*"))
+        .order_by()
+    )
+    publishers = (
+        Newspaper.publishers.through.objects.filter(newspaper__in=ids)
+        .values(facet=Value("publisher"), value=F("redactor_id"))
+        .annotate(count=Count("*"))
+        .order_by()
+    )
+    years = (
+        queryset.order_by()
+        .values(facet=Value("year"), value=ExtractYear("published_date"))
+        .annotate(count=Count("*"))
+    )
+    counts = defaultdict(list)
+    for facet, value, count in topics.union(
+        publishers, years, all=True
+    ).values_list("facet", "value", "count"):
+        counts[facet].append((value, count))
+    return counts
+
+
+def top_values(counts, limit):
+    return {
+        facet: heapq.nlargest(
+            limit, values, key=lambda item: (item[1], -item[0])
+        )
+        for facet, values in counts.items()
+    }
+
+
+def _labels(top):
+    labels = {"topic": {}, "publisher": {}}
+    topic_ids = [value for value, _ in top.get("topic", ())]
+    for pk, name in Topic.objects.filter(pk__in=topic_ids).values_list(
+        "pk", "name"
+    ):
+        labels["topic"][pk] = name
+    publisher_ids = [value for value, _ in top.get("publisher", ())]
+    for pk, username in Redactor.objects.filter(
+        pk__in=publisher_ids
+    ).values_list("pk", "username"):
+        labels["publisher"][pk] = username
+    return labels
+
+
+def facet_counts(queryset, query, limit=None):
+    # Cached per normalized query under the newspaper list generation,
+    # like the search results themselves.
+    limit = limit or settings.PULSE_FACET_LIMIT
+    version = get_version(NEWSPAPER_LIST)
+    if version is None:
+        return _facet_entry(queryset, limit)
+    digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+    key = f"pulse:facets:{version}:{limit}:{digest}"
+    try:
+        entry = cache.get(key)
+    except Exception:
+        return _facet_entry(queryset, limit)
+    if entry is None:
+        entry = _facet_entry(queryset, limit)
+        try:
+            cache.set(key, entry, settings.PULSE_SEARCH_CACHE_TIMEOUT)
+        except Exception:
+            pass
+    return entry
+
+
+def _facet_entry(queryset, limit):
+    top = top_values(grouped_counts(queryset), limit)
+    labels = _labels(top)
+    return {
+        facet: [
+            (value, labels.get(facet, {}).get(value, str(value)), count)
+            for value, count in top.get(facet, ())
+        ]
+        for facet, _, _ in FACETS
+    }
+
+
+def facet_links(entry, params):
+    # params are the normalized search parameters; picking a value narrows
+    # the search, picking the selected one again drops that filter.
+    params = dict(params)
+    facets = []
+    for facet, field, heading in FACETS:
+        values = []
+        for value, label, count in entry.get(facet, ()):
+            selected = params.get(field) == str(value)
+            query = dict(params)
+            if selected:
+                del query[field]
+            else:
+                query[field] = str(value)
+            values.append(
+                {
+                    "label": label,
+                    "count": count,
+                    "selected": selected,
+                    "query": urlencode(sorted(query.items())),
+                }
+            )
+        if values:
+            facets.append(
+                {"name": facet, "heading": heading, "values": values}
+            )
+    return facets
@@ -0,0 +1,181 @@
+from datetime import datetime, time as datetime_time
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from pulse import edge
+from pulse.models import Topic, Redactor, Newspaper
+from pulse.versions import bump_version, get_version
+
+FEED_ITEMS = 20
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+class NewspaperFeed(Feed):
+    title = "Pulse News Portal"
+    link = reverse_lazy("pulse:newspapers")
+    description = "The latest newspapers from Pulse News Portal."
+
+    def get_queryset(self, obj):
+        return Newspaper.objects.all()
+
+    def items(self, obj):
+        return (
+            self.get_queryset(obj)
+            .order_by("-published_date", "-id")
+            .prefetch_related("topic", "publishers")[:FEED_ITEMS]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.content).words(60)
+
+    def item_link(self, item):
+        return reverse("pulse:newspaper-detail", args=[item.pk])
+
+    def item_pubdate(self, item):
+        return timezone.make_aware(
+            datetime.combine(item.published_date, datetime_time.min)
+        )
+
+    def item_author_name(self, item):
+        return ", ".join(
+            redactor.username for redactor in item.publishers.all()
+        )
+
+    def item_categories(self, item):
+        return [topic.name for topic in item.topic.all()]
+
+
+class TopicNewspaperFeed(NewspaperFeed):
+    def get_object(self, request, pk):
+        return get_object_or_404(Topic, pk=pk)
+
+    def title(self, obj):
+        return f"Pulse News Portal: {obj.name}"
+
+    def description(self, obj):
+        return f"The latest newspapers about {obj.name}."
+
+    def get_queryset(self, obj):
+        return Newspaper.objects.filter(topic=obj)
+
+
+class RedactorNewspaperFeed(NewspaperFeed):
+    def get_object(self, request, pk):
+        return get_object_or_404(Redactor, pk=pk)
+
+    def title(self, obj):
+        return f"Pulse News Portal: {obj.username}"
+
+    def link(self, obj):
+        return reverse("pulse:redactor-detail", args=[obj.pk])
+
+    def description(self, obj):
+        return f"The latest newspapers published by {obj.username}."
+
+    def get_queryset(self, obj):
+        return Newspaper.objects.filter(publishers=obj)
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr("description", obj)
+
+
+class NewspaperAtomFeed(AtomFeedMixin, NewspaperFeed):
+    pass
+
+
+class TopicNewspaperAtomFeed(AtomFeedMixin, TopicNewspaperFeed):
+    pass
+
+
+class RedactorNewspaperAtomFeed(AtomFeedMixin, RedactorNewspaperFeed):
+    pass
+
+
+FEEDS = {
+    "newspapers": {"rss": NewspaperFeed, "atom": NewspaperAtomFeed},
+    "topics": {"rss": TopicNewspaperFeed, "atom": TopicNewspaperAtomFeed},
+    "redactors": {
+        "rss": RedactorNewspaperFeed,
+        "atom": RedactorNewspaperAtomFeed,
+    },
+}
+
+
+def feed_version(kind, pk=None):
+    return get_version(f"feed:{kind}:{pk or 0}")
+
+
+def bump_feed_version(kind, pk=None):
+    bump_version(f"feed:{kind}:{pk or 0}")
+
+
+def feed_tag(kind, pk=None):
+    return f"feed:{kind}:{pk or 0}"
+
+
+def invalidate_feeds(topic_ids=(), redactor_ids=()):
+    bump_feed_version("newspapers")
+    for pk in topic_ids:
+        bump_feed_version("topics", pk)
+    for pk in redactor_ids:
+        bump_feed_version("redactors", pk)
+    edge.purge(
+        [feed_tag("newspapers")]
+        + [feed_tag("topics", pk) for pk in topic_ids]
+        + [feed_tag("redactors", pk) for pk in redactor_ids]
+    )
+
+
+def _feed_etag(request, kind, feed_format, pk=None):
+    version = feed_version(kind, pk)
+    if version is None:
+        return None
+    return f"{kind}-{pk or 0}-{feed_format}-{version}"
+
+
+def _feed_tags(request, kind, feed_format, pk=None):
+    return [feed_tag(kind, pk)]
+
+
+@edge.edge_cache(tags=_feed_tags)
+@condition(etag_func=_feed_etag)
+def feed_view(request, kind, feed_format, pk=None):
+    try:
+        feed_class = FEEDS[kind][feed_format]
+    except KeyError:
+        raise Http404("Unknown feed format")
+
+    version = feed_version(kind, pk)
+    key = f"pulse:feed:{kind}:{pk or 0}:{feed_format}:{version}"
+    cached = cache.get(key) if version is not None else None
+    if cached is None:
+        kwargs = {"pk": pk} if pk is not None else {}
+        rendered = feed_class()(request, **kwargs)
+        cached = (
+            rendered.content,
+            rendered["Content-Type"],
+            rendered.get("Last-Modified"),
+        )
+        if version is not None:
+            cache.set(key, cached, FEED_CACHE_TIMEOUT)
+
+    content, content_type, last_modified = cached
+    response = HttpResponse(content, content_type=content_type)
+    if last_modified:
+        response["Last-Modified"] = last_modified
+    return response
@@ -0,0 +1,44 @@
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from pulse import compression
+
+
+class CompressedTextDescriptor(DeferredAttribute):
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if instance is None or value:
+            return value
+        # Compressed rows keep an empty text column; inflate the blob only
+        # when the text is actually read, then keep the result.
+        blob = getattr(instance, self.field.blob_field)
+        if blob:
+            value = compression.decompress(blob)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedTextField(models.TextField):
+    descriptor_class = CompressedTextDescriptor
+
+    def __init__(self, *args, blob_field, **kwargs):
+        self.blob_field = blob_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["blob_field"] = self.blob_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if value and compression.active_codec():
+            setattr(
+                model_instance, self.blob_field, compression.compress(value)
+            )
+            return ""
+        setattr(model_instance, self.blob_field, None)
+        return value
@@ -3,6 +3,7 @@ from django.contrib.auth.forms import UserCreationForm
 from django.forms import ModelForm
 from django.contrib.auth import get_user_model
 
+from pulse.db import sync_m2m
 from pulse.models import Topic, Redactor, Newspaper
 
 
@@ -63,6 +64,8 @@ class NewspaperForm(ModelForm):
         required=False,
     )
 
+    relation_fields = ("topic", "publishers")
+
     class Meta:
         model = Newspaper
         fields = "__all__"
@@ -71,6 +74,26 @@ class NewspaperForm(ModelForm):
             "content": forms.Textarea(attrs={"rows": 4, "cols": 40}),
         }
 
+    def save(self, commit=True):
+        if not commit:
+            instance = super().save(commit=False)
+            self.save_m2m = self.save_relations
+            return instance
+        if self.errors:
+            return super().save(commit)
+        # An unchanged row is not written, so it fires no save signals.
+        if self.instance._state.adding or (
+            set(self.changed_data) - set(self.relation_fields)
+        ):
+            self.instance.save()
+        self.save_relations()
+        return self.instance
+
+    def save_relations(self):
+        for name in self.relation_fields:
+            if name in self.cleaned_data:
+                sync_m2m(self.instance, name, self.cleaned_data[name])
+
 
 class NewspaperSearchForm(forms.Form):
     title = forms.CharField(
@@ -90,3 +113,32 @@ class NewspaperSearchForm(forms.Form):
         label="",
         widget=forms.TextInput(attrs={"placeholder": "Search by content"}),
     )
+    include_archive = forms.BooleanField(
+        required=False,
+        label="Include archive",
+    )
+    # Set by the facet links under the results.
+    topic = forms.ModelChoiceField(
+        queryset=Topic.objects.all(),
+        required=False,
+        widget=forms.HiddenInput(),
+    )
+    publisher = forms.ModelChoiceField(
+        queryset=get_user_model().objects.all(),
+        required=False,
+        widget=forms.HiddenInput(),
+    )
+    year = forms.IntegerField(
+        min_value=1,
+        max_value=9999,
+        required=False,
+        widget=forms.HiddenInput(),
+    )
+
+    # Runs of whitespace are collapsed in what is searched, not just in the
+    # result cache key, so equal keys always mean equal queries.
+    def clean_title(self):
+        return " ".join(self.cleaned_data["title"].split())
+
+    def clean_content(self):
+        return " ".join(self.cleaned_data["content"].split())
@@ -0,0 +1,209 @@
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import wraps
+from importlib import import_module
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from pulse.models import Job
+
+RETRY_BACKOFF_SECONDS = 30
+STALE_GRACE_SECONDS = 60
+
+# Workers only run callables registered here by @job, never whatever
+# dotted path a job row names: the row is editable in the admin.
+registry = {}
+# Imported before a worker claims anything and before an unknown name is
+# enqueued, so every @job task is registered in every process.
+TASK_MODULES = ("pulse.edge", "pulse.pageviews", "pulse.related")
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def register(func):
+    task = f"{func.__module__}.{func.__qualname__}"
+    registry[task] = func
+    return task
+
+
+def autodiscover():
+    for module in TASK_MODULES:
+        import_module(module)
+
+
+def job(func):
+    task = register(func)
+
+    @wraps(func)
+    def delay(*args, **kwargs):
+        return enqueue(task, args=args, kwargs=kwargs)
+
+    func.task = task
+    func.delay = delay
+    return func
+
+
+def enqueue(
+    task, args=(), kwargs=None, run_at=None, max_attempts=3, timeout=300
+):
+    if callable(task):
+        task = getattr(task, "task", None) or repr(task)
+    if task not in registry:
+        autodiscover()
+    if task not in registry:
+        raise ValueError(f"{task} is not a @job task")
+    return Job.objects.create(
+        task=task,
+        args=list(args),
+        kwargs=kwargs or {},
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts,
+        timeout=timeout,
+    )
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_job(worker):
+    now = timezone.now()
+    queryset = Job.objects.filter(
+        status=Job.Status.QUEUED, run_at__lte=now
+    ).order_by("run_at", "id")
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = queryset.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = Job.Status.RUNNING
+            job.locked_by = worker
+            job.locked_at = now
+            job.attempts += 1
+            job.save(
+                update_fields=["status", "locked_by", "locked_at", "attempts"]
+            )
+            return job
+
+    # SQLite serializes writers, so a conditional UPDATE is enough to make
+    # sure only one worker wins each row.
+    for pk in queryset.values_list("pk", flat=True)[:10]:
+        claimed = Job.objects.filter(
+            pk=pk, status=Job.Status.QUEUED
+        ).update(
+            status=Job.Status.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+@contextmanager
+def time_limit(seconds):
+    if (
+        not seconds
+        or not hasattr(signal, "SIGALRM")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def handler(signum, frame):
+        raise JobTimeout(f"Job exceeded its {seconds}s timeout")
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.alarm(seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _finish(job, error=None, retry=True):
+    now = timezone.now()
+    if error is None:
+        job.status = Job.Status.SUCCEEDED
+        job.last_error = ""
+    elif retry and job.attempts < job.max_attempts:
+        job.status = Job.Status.QUEUED
+        job.run_at = now + timedelta(
+            seconds=RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        )
+        job.last_error = error
+    else:
+        job.status = Job.Status.FAILED
+        job.last_error = error
+    job.locked_by = ""
+    job.locked_at = None
+    job.finished_at = now if job.status != Job.Status.QUEUED else None
+    job.save(
+        update_fields=[
+            "status",
+            "run_at",
+            "last_error",
+            "locked_by",
+            "locked_at",
+            "finished_at",
+        ]
+    )
+
+
+def run_job(job):
+    func = registry.get(job.task)
+    if func is None:
+        _finish(job, f"Unknown task {job.task!r}", retry=False)
+        return job
+    try:
+        with time_limit(job.timeout):
+            func(*job.args, **job.kwargs)
+    except Exception:
+        _finish(job, traceback.format_exc())
+    else:
+        _finish(job)
+    return job
+
+
+def requeue_stale_jobs():
+    now = timezone.now()
+    stale = []
+    for job in Job.objects.filter(status=Job.Status.RUNNING):
+        deadline = job.locked_at + timedelta(
+            seconds=job.timeout + STALE_GRACE_SECONDS
+        )
+        if deadline < now:
+            _finish(job, f"Worker {job.locked_by} stopped responding")
+            stale.append(job)
+    return stale
+
+
+def work(worker=None, burst=False, poll_interval=1.0, stop=None):
+    worker = worker or worker_name()
+    autodiscover()
+    processed = 0
+    while stop is None or not stop.is_set():
+        close_old_connections()
+        job = claim_job(worker)
+        if job is None:
+            if burst:
+                break
+            requeue_stale_jobs()
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
+    return processed
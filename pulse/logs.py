@@ -0,0 +1,268 @@
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging import Filter, Formatter, getLogger
+from logging.handlers import BufferingHandler, QueueHandler, QueueListener
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+
+access_logger = getLogger("pulse.access")
+audit_logger = getLogger("pulse.audit")
+
+# The request being served, so audit entries can name the user behind a
+# save without every view passing it down.
+current_request = ContextVar("pulse_current_request", default=None)
+_batching = ContextVar("pulse_log_batching", default=False)
+
+_queue = queue.Queue(settings.PULSE_LOG_QUEUE_SIZE)
+_lock = threading.Lock()
+_handlers = []
+_listener = None
+_background = False
+_pid = os.getpid()
+_dropped = 0
+
+
+class JsonFormatter(Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class JsonLinesHandler(BufferingHandler):
+    # Each batch is a single write; the file is reopened per batch so it
+    # can be rotated underneath.
+    def __init__(self, path, capacity):
+        super().__init__(capacity)
+        self.path = path
+        self.setFormatter(JsonFormatter())
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self.buffer:
+                return
+            lines = "".join(
+                f"{self.format(record)}\n" for record in self.buffer
+            )
+            self.buffer.clear()
+            if self.path == "-":
+                sys.stderr.write(lines)
+                sys.stderr.flush()
+            else:
+                with open(self.path, "a", encoding="utf-8") as output:
+                    output.write(lines)
+        finally:
+            self.release()
+
+
+class AuditHandler(BufferingHandler):
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.addFilter(Filter(audit_logger.name))
+
+    def flush(self):
+        from pulse.models import AuditEntry
+
+        self.acquire()
+        try:
+            if not self.buffer:
+                return
+            records, self.buffer = self.buffer, []
+            try:
+                AuditEntry.objects.bulk_create(
+                    AuditEntry(
+                        created_at=datetime.fromtimestamp(
+                            record.created, timezone.utc
+                        ),
+                        **record.fields,
+                    )
+                    for record in records
+                )
+            except DatabaseError:
+                self.handleError(records[0])
+        finally:
+            self.release()
+
+
+class BatchingQueueListener(QueueListener):
+    # Handlers buffer what they are given; the listener flushes them every
+    # flush_seconds, so a partial batch never waits for more traffic.
+    def __init__(self, queue, *handlers, flush_seconds):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.flush_seconds = flush_seconds
+        self.flushed = time.monotonic()
+
+    def dequeue(self, block):
+        while True:
+            timeout = self.flushed + self.flush_seconds - time.monotonic()
+            if timeout <= 0:
+                self.flush()
+                continue
+            try:
+                return self.queue.get(block, timeout)
+            except queue.Empty:
+                if not block:
+                    raise
+
+    def flush(self):
+        # The listener thread keeps its own connection; drop it once it
+        # has gone stale, as request threads do between requests.
+        close_old_connections()
+        for handler in self.handlers:
+            handler.flush()
+        self.flushed = time.monotonic()
+
+
+class PipelineHandler(QueueHandler):
+    # What LOGGING attaches to the access and audit loggers. The calling
+    # thread only puts the record on the queue; a full queue drops it
+    # rather than making a request wait.
+    def __init__(self):
+        super().__init__(None)
+
+    def enqueue(self, record):
+        global _dropped
+        _claim()
+        if _background and _listener is None:
+            start()
+        if _listener is None:
+            # Outside the servers and job workers, e.g. in management
+            # commands and shells, records are written as they come unless
+            # the caller asked for them to be batched().
+            for handler in handlers():
+                handler.handle(record)
+                if not _batching.get():
+                    handler.flush()
+            return
+        try:
+            _queue.put_nowait(record)
+        except queue.Full:
+            with _lock:
+                _dropped += 1
+
+
+def handlers():
+    with _lock:
+        if not _handlers:
+            if settings.PULSE_LOG_FILE:
+                _handlers.append(
+                    JsonLinesHandler(
+                        settings.PULSE_LOG_FILE, settings.PULSE_LOG_BATCH_SIZE
+                    )
+                )
+            _handlers.append(AuditHandler(settings.PULSE_LOG_BATCH_SIZE))
+        return list(_handlers)
+
+
+def _claim():
+    # A process forked after the first record, e.g. a worker of a server
+    # started with --preload, inherits the parent's queue and buffers but
+    # not its listener thread; it starts over with its own.
+    global _queue, _handlers, _listener, _pid
+    if _pid == os.getpid():
+        return
+    with _lock:
+        if _pid != os.getpid():
+            _queue = queue.Queue(settings.PULSE_LOG_QUEUE_SIZE)
+            _handlers = []
+            _listener = None
+            _pid = os.getpid()
+
+
+def enable():
+    # Called where the server and job worker processes start. The listener
+    # itself only starts with the first record in each process.
+    global _background
+    _background = True
+
+
+def flush():
+    with _lock:
+        pending = list(_handlers)
+    for handler in pending:
+        handler.flush()
+
+
+@contextmanager
+def batched():
+    # For code that saves many rows without a listener: records wait in
+    # the handlers, which write a batch when one fills up and the rest on
+    # the way out.
+    token = _batching.set(True)
+    try:
+        yield
+    finally:
+        _batching.reset(token)
+        flush()
+
+
+def start():
+    global _listener
+    _claim()
+    with _lock:
+        if _listener is not None:
+            return _listener
+    listener = BatchingQueueListener(
+        _queue, *handlers(), flush_seconds=settings.PULSE_LOG_FLUSH_SECONDS
+    )
+    with _lock:
+        if _listener is not None:
+            return _listener
+        _listener = listener
+    listener.start()
+    return listener
+
+
+def stop():
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+    flush()
+
+
+atexit.register(stop)
+
+
+def dropped():
+    return _dropped
+
+
+def request_user_id():
+    request = current_request.get()
+    user = getattr(request, "user", None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def audit(action, instance):
+    # Captured now, while a deleted instance still has its pk, and logged
+    # once the change is committed.
+    fields = {
+        "action": action,
+        "model": instance._meta.label_lower,
+        "object_id": instance.pk,
+        "object_repr": str(instance)[:255],
+        "user_id": request_user_id(),
+    }
+    message = f"{action} {fields['model']} {instance.pk}"
+    transaction.on_commit(
+        lambda: audit_logger.info(message, extra={"fields": fields})
+    )
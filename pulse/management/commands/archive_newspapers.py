@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pulse import archive
+
+
+class Command(BaseCommand):
+    help = "Move old newspapers into the date-partitioned archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            type=date.fromisoformat,
+            help="Archive newspapers published before this date "
+            "(YYYY-MM-DD). Defaults to PULSE_ARCHIVE_AFTER_DAYS ago.",
+        )
+        parser.add_argument(
+            "--partition",
+            choices=["year", "month"],
+            default=settings.PULSE_ARCHIVE_PARTITION,
+            help="Postgres partition granularity.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        moved = archive.archive_newspapers(
+            before=options["before"],
+            batch_size=options["batch_size"],
+            granularity=options["partition"],
+        )
+        self.stdout.write(f"Archived {moved} newspaper(s).")
@@ -0,0 +1,73 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from pulse import compression, dedup
+from pulse.models import Newspaper, NewspaperSignature
+
+
+def _signature(row):
+    pk, text = row
+    return pk, dedup.minhash(text)
+
+
+class Command(BaseCommand):
+    help = "Compute MinHash signatures for newspapers that have none."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Number of processes computing signatures.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute signatures that already exist.",
+        )
+        parser.add_argument(
+            "--flag",
+            action="store_true",
+            help="Also flag duplicates among the backfilled newspapers.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Newspaper.objects.order_by("pk")
+        if not options["all"]:
+            queryset = queryset.exclude(
+                pk__in=NewspaperSignature.objects.values("newspaper_id")
+            )
+        # Workers only hash text; all database access stays in this process.
+        connections.close_all()
+        processed = 0
+        with multiprocessing.Pool(max(1, options["workers"])) as pool:
+            last_pk = 0
+            while True:
+                batch = [
+                    (pk, compression.stored_text(content, blob))
+                    for pk, content, blob in queryset.filter(
+                        pk__gt=last_pk
+                    ).values_list("pk", "content", "content_blob")[
+                        : options["batch_size"]
+                    ]
+                ]
+                if not batch:
+                    break
+                last_pk = batch[-1][0]
+                signatures = pool.map(_signature, batch, chunksize=64)
+                if options["flag"]:
+                    newspapers = Newspaper.objects.only(
+                        "duplicate_of"
+                    ).in_bulk([pk for pk, _ in signatures])
+                with transaction.atomic():
+                    for pk, signature in signatures:
+                        if options["flag"]:
+                            dedup.check_newspaper(newspapers[pk], signature)
+                        else:
+                            dedup.store_signature(pk, signature)
+                processed += len(batch)
+                self.stdout.write(f"Signed {processed} newspaper(s)...")
+        self.stdout.write(f"Done: signed {processed} newspaper(s).")
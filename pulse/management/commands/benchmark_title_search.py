@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from pulse import search
+from pulse.models import Newspaper
+
+
+class Command(BaseCommand):
+    help = "Compare icontains title search with the trigram index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "queries",
+            nargs="*",
+            help="Substrings to search for; defaults to sampled titles.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed runs per query.",
+        )
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or self.sample_queries()
+        if not queries:
+            self.stdout.write("No newspapers to benchmark against.")
+            return
+        queryset = Newspaper.objects.all()
+        strategies = {
+            "icontains": lambda query: queryset.filter(
+                title__icontains=query
+            ),
+            "trigram": lambda query: search.filter_substring(
+                queryset, "title", query
+            ),
+        }
+        for query in queries:
+            timings = {}
+            for name, strategy in strategies.items():
+                runs = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    count = len(strategy(query).values_list("pk", flat=True))
+                    runs.append((time.perf_counter() - started) * 1000)
+                timings[name] = (statistics.median(runs), count)
+            self.stdout.write(
+                f"{query!r}: "
+                + ", ".join(
+                    f"{name} {median:.2f} ms ({count} rows)"
+                    for name, (median, count) in timings.items()
+                )
+            )
+
+    def sample_queries(self):
+        titles = Newspaper.objects.order_by("?").values_list(
+            "title", flat=True
+        )[:5]
+        return [title[len(title) // 3:][:6] for title in titles if title]
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from pulse import related
+
+
+class Command(BaseCommand):
+    help = "Recompute TF-IDF vectors and related newspapers for every row."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=related.TOP_K,
+            help="Number of related newspapers to keep per newspaper.",
+        )
+
+    def handle(self, *args, **options):
+        count = related.rebuild(top_k=options["top_k"])
+        self.stdout.write(f"Computed related newspapers for {count} row(s).")
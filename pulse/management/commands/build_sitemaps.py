@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from pulse import sitemaps
+
+
+class Command(BaseCommand):
+    help = "Regenerate sitemap shards whose id range has changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate every shard, even ones that are up to date.",
+        )
+
+    def handle(self, *args, **options):
+        regenerated = sitemaps.refresh_shards(force=options["all"])
+        self.stdout.write(
+            f"Regenerated {len(regenerated)} of {sitemaps.shard_count()} "
+            "sitemap shard(s)."
+        )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pulse import queryplans
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the query plans of the hot querysets with the stored "
+        "baseline; run it against a seeded database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--update",
+            action="store_true",
+            help="Store the current plans as the new baseline.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Baseline file; defaults to the one for this database "
+            "vendor under pulse/query_plans/.",
+        )
+
+    def handle(self, *args, **options):
+        plans = queryplans.capture()
+        path = options["baseline"] or queryplans.baseline_path()
+        if options["update"]:
+            queryplans.save_baseline(plans, path)
+            self.stdout.write(f"Stored {len(plans)} plan(s) in {path}.")
+            return
+        baseline = queryplans.load_baseline(path)
+        if baseline is None:
+            raise CommandError(f"No baseline at {path}; run with --update.")
+        failures = queryplans.compare(baseline, plans)
+        for name, problems in sorted(failures.items()):
+            self.stderr.write(f"{name}: {'; '.join(problems)}")
+        if failures:
+            raise CommandError(
+                f"{len(failures)} query plan(s) regressed; rerun with "
+                "--update if the change is intended."
+            )
+        self.stdout.write(f"All {len(plans)} query plans match the baseline.")
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pulse import revisions
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the revision retention policy: drop old and short-lived "
+        "newspaper revisions and re-diff the ones around them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=settings.PULSE_REVISION_KEEP,
+            help="Revisions always kept per newspaper, newest first.",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.PULSE_REVISION_RETENTION_DAYS,
+            help="Drop revisions superseded more than this many days ago; "
+            "0 keeps them forever.",
+        )
+        parser.add_argument(
+            "--collapse-seconds",
+            type=int,
+            default=settings.PULSE_REVISION_COLLAPSE_SECONDS,
+            help="Drop versions replaced within this many seconds of "
+            "being saved.",
+        )
+
+    def handle(self, *args, **options):
+        removed, newspapers = revisions.compact_all(
+            options["keep"],
+            retention_days=options["retention_days"],
+            collapse_seconds=options["collapse_seconds"],
+        )
+        self.stdout.write(
+            f"Removed {removed} revision(s) from {newspapers} newspaper(s)."
+        )
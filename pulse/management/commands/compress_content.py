@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from pulse import compression
+from pulse.models import ContentDictionary, Newspaper
+
+
+class Command(BaseCommand):
+    help = "Convert stored newspaper content to the configured compression."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--train-dictionary",
+            action="store_true",
+            help="Train a new dictionary on the corpus before converting.",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=2000,
+            help="Number of articles to sample when training.",
+        )
+        parser.add_argument(
+            "--dictionary-size",
+            type=int,
+            default=compression.ZLIB_MAX_DICTIONARY_SIZE,
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompress rows that are already compressed, e.g. with "
+            "a freshly trained dictionary.",
+        )
+
+    def handle(self, *args, **options):
+        codec = compression.active_codec()
+        if codec is None:
+            raise CommandError(
+                "Set PULSE_CONTENT_COMPRESSION before converting content "
+                f"(currently {settings.PULSE_CONTENT_COMPRESSION!r})."
+            )
+        if options["train_dictionary"]:
+            self.train(codec, options["samples"], options["dictionary_size"])
+
+        queryset = Newspaper.objects.order_by("pk")
+        if not options["all"]:
+            queryset = queryset.exclude(content="")
+        converted = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk).values_list(
+                    "pk", "content", "content_blob"
+                )[: options["batch_size"]]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                for pk, content, blob in batch:
+                    text = compression.stored_text(content, blob)
+                    Newspaper.objects.filter(pk=pk).update(
+                        content="",
+                        content_blob=compression.compress(text, codec),
+                    )
+            converted += len(batch)
+            last_pk = batch[-1][0]
+            self.stdout.write(f"Compressed {converted} newspaper(s)...")
+        self.stdout.write(f"Done: compressed {converted} newspaper(s).")
+
+    def train(self, codec, samples, size):
+        texts = [
+            compression.stored_text(content, blob)
+            for content, blob in Newspaper.objects.order_by("?").values_list(
+                "content", "content_blob"
+            )[:samples]
+        ]
+        data = compression.train_dictionary(texts, codec, size)
+        dictionary = ContentDictionary.objects.create(
+            codec=codec, data=data, sample_count=len(texts)
+        )
+        compression.reset_dictionary_cache()
+        self.stdout.write(
+            f"Trained {dictionary} ({len(data)} bytes, {len(texts)} samples)."
+        )
@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from pulse import coldarchive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move old newspapers out of the database into a memory-mapped "
+        "cold archive segment."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            type=date.fromisoformat,
+            help="Export newspapers published before this date "
+            "(YYYY-MM-DD). Defaults to PULSE_COLD_ARCHIVE_AFTER_DAYS ago.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        exported = coldarchive.export_newspapers(
+            before=options["before"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(f"Exported {exported} newspaper(s).")
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from pulse import pageviews
+
+
+class Command(BaseCommand):
+    help = "Write buffered page views to the daily rollup table."
+
+    def handle(self, *args, **options):
+        pageviews.push()
+        written = pageviews.flush()
+        self.stdout.write(f"Flushed page views for {written} row(s).")
@@ -0,0 +1,34 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pulse import prerender
+
+
+class Command(BaseCommand):
+    help = (
+        "Write static HTML for newspaper and topic pages that changed, for "
+        "the read-only mirror."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Render every page and remove pages of deleted rows.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Processes used by --all.",
+        )
+
+    def handle(self, *args, **options):
+        if not prerender.is_enabled():
+            raise CommandError("Set PULSE_PRERENDER_ROOT to prerender pages.")
+        if options["all"]:
+            rendered = prerender.build_all(workers=max(1, options["workers"]))
+        else:
+            rendered = prerender.refresh()
+        self.stdout.write(f"Rendered {rendered} page(s).")
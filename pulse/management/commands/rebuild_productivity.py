@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from pulse import productivity
+
+
+class Command(BaseCommand):
+    help = "Recompute the redactor output rollups from the publisher links."
+
+    def handle(self, *args, **options):
+        count = productivity.rebuild()
+        self.stdout.write(f"Rebuilt output for {count} redactor(s).")
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pulse import coldarchive
+
+
+class Command(BaseCommand):
+    help = "Restore newspapers from the cold archive into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Restore every newspaper still in the cold archive.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["ids"] and not options["all"]:
+            raise CommandError("Give newspaper ids or --all.")
+        restored = coldarchive.restore_newspapers(
+            None if options["all"] else options["ids"]
+        )
+        self.stdout.write(f"Restored {restored} newspaper(s).")
@@ -0,0 +1,77 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from pulse import jobs, logs
+
+
+class Command(BaseCommand):
+    help = "Run background job workers backed by the pulse_job table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes to start.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep between polls of an empty queue.",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        if workers == 1:
+            processed = self.run_worker(options)
+            self.stdout.write(f"Processed {processed} job(s).")
+            return
+
+        # Connections must not be shared across forked processes.
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(
+                target=self.run_worker, args=(options,), daemon=False
+            )
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {workers} workers.")
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+    def run_worker(self, options):
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            stop.set()
+
+        signal.signal(signal.SIGTERM, request_stop)
+        # Forked workers exit without running atexit hooks, so the log
+        # listener is drained here.
+        logs.start()
+        try:
+            return jobs.work(
+                burst=options["burst"],
+                poll_interval=options["poll_interval"],
+                stop=stop,
+            )
+        finally:
+            logs.stop()
@@ -0,0 +1,100 @@
+import multiprocessing
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from pulse import productivity, seeding
+from pulse.versions import NEWSPAPER_LIST, bump_version
+
+
+class Command(BaseCommand):
+    help = "Generate a large synthetic dataset for load and scale testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--newspapers", type=int, default=1_000_000,
+            help="Number of newspapers to create.",
+        )
+        parser.add_argument("--topics", type=int, default=500)
+        parser.add_argument("--redactors", type=int, default=2000)
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="The same seed always produces the same dataset.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Number of processes generating newspapers.",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=seeding.CHUNK_SIZE
+        )
+        parser.add_argument(
+            "--end-date",
+            type=date.fromisoformat,
+            help="Latest publication date (YYYY-MM-DD). Defaults to today.",
+        )
+        parser.add_argument(
+            "--days", type=int, default=seeding.DAYS,
+            help="Spread publication dates over this many days.",
+        )
+
+    def handle(self, *args, **options):
+        if min(options["topics"], options["redactors"], options["days"]) < 1:
+            raise CommandError(
+                "--topics, --redactors and --days must be positive."
+            )
+        plan = seeding.prepare(
+            options["seed"],
+            options["topics"],
+            options["redactors"],
+            end_date=options["end_date"],
+            days=options["days"],
+        )
+        self.stdout.write(
+            f"Using {len(plan.topic_ids)} topic(s) and "
+            f"{len(plan.redactor_ids)} redactor(s)."
+        )
+        chunks = seeding.chunks(options["newspapers"], options["chunk_size"])
+        workers = min(max(1, options["workers"]), len(chunks) or 1)
+        created = 0
+        if workers == 1:
+            for number, size in chunks:
+                created += seeding.write_chunk(
+                    seeding.generate_chunk(plan, number, size)
+                )
+                self.report(created)
+        else:
+            # SQLite allows a single writer, so there the workers only
+            # generate rows and this process writes them. imap keeps the
+            # chunks in order, so one --seed always yields the same ids;
+            # with parallel writes only the rows themselves are repeatable.
+            parallel_writes = connection.vendor != "sqlite"
+            connections.close_all()
+            with multiprocessing.Pool(
+                workers, initializer=seeding.init_worker, initargs=(plan,)
+            ) as pool:
+                task = (
+                    seeding.seed_chunk
+                    if parallel_writes
+                    else seeding.build_chunk
+                )
+                for result in pool.imap(task, chunks):
+                    if not parallel_writes:
+                        result = seeding.write_chunk(result)
+                    created += result
+                    self.report(created)
+
+        # Bulk inserts skip model signals, so rebuild what they maintain.
+        productivity.rebuild()
+        bump_version(NEWSPAPER_LIST)
+        self.stdout.write(
+            f"Done: created {created} newspaper(s). Run build_related, "
+            "backfill_signatures and build_sitemaps to refresh the "
+            "remaining derived data."
+        )
+
+    def report(self, created):
+        self.stdout.write(f"Created {created} newspaper(s)...")
@@ -0,0 +1,238 @@
+import gzip
+import hashlib
+import secrets
+import struct
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+from pulse import logs
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Streams are flushed after every chunk, so a cheaper setting keeps
+# per-chunk latency low.
+BROTLI_STREAM_QUALITY = 4
+MAX_RANDOM_BYTES = 100
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "image/svg+xml",
+)
+
+
+def accepted_encodings(header):
+    accepted = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def negotiate(header, allow_brotli=True):
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get("*", 0.0)
+    choices = ["br", "gzip"] if brotli and allow_brotli else ["gzip"]
+    best = max(choices, key=lambda name: accepted.get(name, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+def compress_body(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # Random gzip header padding is Django's BREACH mitigation.
+    return compress_string(body, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+def _padded_gzip_header():
+    # The same random-length FNAME padding compress_string() adds.
+    padding = b"a" * secrets.randbelow(MAX_RANDOM_BYTES)
+    return (
+        b"\x1f\x8b\x08"
+        + bytes([gzip.FNAME])
+        + struct.pack("<I", 0)
+        + b"\x00\xff"
+        + padding
+        + b"\x00"
+    )
+
+
+class StreamCompressor:
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_STREAM_QUALITY)
+        else:
+            # Raw deflate with a hand-written header and trailer, so the
+            # stream gets BREACH padding like non-streamed bodies.
+            self._compressor = zlib.compressobj(
+                GZIP_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS
+            )
+            self._header = _padded_gzip_header()
+            self._crc = 0
+            self._size = 0
+
+    def compress(self, chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        self._crc = zlib.crc32(chunk, self._crc)
+        self._size += len(chunk)
+        data = self._header + self._compressor.compress(chunk)
+        self._header = b""
+        return data + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return (
+            self._header
+            + self._compressor.flush()
+            + struct.pack("<II", self._crc, self._size & 0xFFFFFFFF)
+        )
+
+
+def compress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def is_cacheable(response):
+    cache_control = response.get("Cache-Control", "").lower()
+    if "private" in cache_control or "no-store" in cache_control:
+        return False
+    return response.has_header("ETag") or "max-age" in cache_control
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        min_length = settings.PULSE_RESPONSE_COMPRESSION_MIN_LENGTH
+        if not response.streaming and len(response.content) < min_length:
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        # Byte ranges refer to the identity encoding.
+        if response.status_code == 206 or response.has_header(
+            "Content-Range"
+        ):
+            return response
+        content_type = response.get("Content-Type", "").lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        # Brotli has no header field to pad against BREACH, so HTML, which
+        # reflects input and carries CSRF tokens, only gets padded gzip.
+        encoding = negotiate(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            allow_brotli=not content_type.startswith("text/html"),
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(
+                    response.streaming_content, encoding
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    response.streaming_content, encoding
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed = self.compress_content(response, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def compress_content(self, response, encoding):
+        if not is_cacheable(response):
+            return compress_body(response.content, encoding)
+        # Keyed by a digest of the body, so identical responses share one
+        # entry and a changed page can never be served a stale encoding.
+        digest = hashlib.sha256(response.content).hexdigest()
+        key = f"pulse:compressed:{encoding}:{digest}"
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress_body(response.content, encoding)
+            cache.set(
+                key,
+                compressed,
+                settings.PULSE_RESPONSE_COMPRESSION_CACHE_TIMEOUT,
+            )
+        return compressed
+
+
+class AccessLogMiddleware(MiddlewareMixin):
+    # Goes first so the duration covers the rest of the stack. Logging
+    # only enqueues; the pipeline in pulse.logs does the writing.
+    def process_request(self, request):
+        request._access_started = time.perf_counter()
+        logs.current_request.set(request)
+
+    def process_response(self, request, response):
+        logs.current_request.set(None)
+        started = getattr(request, "_access_started", None)
+        if started is None:
+            return response
+        user = getattr(request, "user", None)
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "user_id": (
+                user.pk if user is not None and user.is_authenticated
+                else None
+            ),
+        }
+        logs.access_logger.info(
+            f"{request.method} {request.path} {response.status_code}",
+            extra={"fields": fields},
+        )
+        return response
@@ -0,0 +1,80 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+PARTITIONED_TABLE_SQL = """
+CREATE TABLE pulse_newspaperarchive (
+    id bigint NOT NULL,
+    title varchar(255) NOT NULL,
+    content text NOT NULL,
+    published_date date NOT NULL,
+    archived_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, published_date)
+) PARTITION BY RANGE (published_date);
+CREATE INDEX pulse_newspaperarchive_published_date_idx
+    ON pulse_newspaperarchive (published_date);
+CREATE TABLE pulse_newspaperarchive_default
+    PARTITION OF pulse_newspaperarchive DEFAULT;
+"""
+
+
+def create_archive_table(apps, schema_editor):
+    model = apps.get_model("pulse", "NewspaperArchive")
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.create_model(model)
+        return
+    # Postgres gets a range-partitioned table; the M2M tables are created
+    # without FK constraints since partitioned tables cannot be referenced
+    # by id alone.
+    schema_editor.execute(PARTITIONED_TABLE_SQL)
+    for field in model._meta.local_many_to_many:
+        schema_editor.create_model(field.remote_field.through)
+
+
+def drop_archive_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model("pulse", "NewspaperArchive"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0002_job"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="NewspaperArchive",
+                    fields=[
+                        (
+                            "id",
+                            models.BigIntegerField(primary_key=True, serialize=False),
+                        ),
+                        ("title", models.CharField(max_length=255)),
+                        ("content", models.TextField()),
+                        ("published_date", models.DateField(db_index=True)),
+                        ("archived_at", models.DateTimeField(auto_now_add=True)),
+                        (
+                            "publishers",
+                            models.ManyToManyField(
+                                db_constraint=False,
+                                related_name="archived_newspapers",
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                        (
+                            "topic",
+                            models.ManyToManyField(
+                                db_constraint=False,
+                                related_name="archived_newspapers",
+                                to="pulse.topic",
+                            ),
+                        ),
+                    ],
+                ),
+            ],
+        ),
+        migrations.RunPython(create_archive_table, drop_archive_table),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:32
+
+import pulse.fields
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE TABLE pulse_newspaper_fts ("
+            "newspaper_id bigint PRIMARY KEY REFERENCES pulse_newspaper (id) "
+            "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX pulse_newspaper_fts_document_idx "
+            "ON pulse_newspaper_fts USING gin (document)"
+        )
+        schema_editor.execute(
+            "INSERT INTO pulse_newspaper_fts (newspaper_id, document) "
+            "SELECT id, setweight(to_tsvector('simple', title), 'A') || "
+            "to_tsvector('simple', content) FROM pulse_newspaper"
+        )
+    else:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE pulse_newspaper_fts "
+            "USING fts5(title, content, content='')"
+        )
+        schema_editor.execute(
+            "INSERT INTO pulse_newspaper_fts (rowid, title, content) "
+            "SELECT id, title, content FROM pulse_newspaper"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    schema_editor.execute("DROP TABLE IF EXISTS pulse_newspaper_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0003_newspaperarchive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentDictionary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("codec", models.CharField(max_length=16)),
+                ("data", models.BinaryField()),
+                ("sample_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name_plural": "content dictionaries",
+            },
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="content_blob",
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="newspaper",
+            name="content",
+            field=pulse.fields.CompressedTextField(blob_field="content_blob"),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0004_content_compression"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="newspaper",
+            name="published_date",
+            field=models.DateField(db_index=True),
+        ),
+    ]
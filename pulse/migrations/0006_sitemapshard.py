@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0005_newspaper_published_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SitemapShard",
+            fields=[
+                (
+                    "number",
+                    models.PositiveIntegerField(primary_key=True, serialize=False),
+                ),
+                ("url_count", models.PositiveIntegerField(default=0)),
+                ("stale", models.BooleanField(default=True)),
+                ("generated_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0006_sitemapshard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewspaperSignature",
+            fields=[
+                (
+                    "newspaper",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to="pulse.newspaper",
+                    ),
+                ),
+                ("signature", models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="pulse.newspaper",
+            ),
+        ),
+        migrations.CreateModel(
+            name="SignatureBand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band", models.PositiveSmallIntegerField()),
+                ("bucket", models.BigIntegerField()),
+                (
+                    "newspaper",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="signature_bands",
+                        to="pulse.newspaper",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["band", "bucket"], name="pulse_signa_band_494fa8_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0007_newspaper_signatures"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TermStat",
+            fields=[
+                (
+                    "term",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("document_frequency", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="NewspaperTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("weight", models.FloatField()),
+                (
+                    "newspaper",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="pulse.newspaper",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["term"], name="pulse_newsp_term_964a85_idx")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="RelatedNewspaper",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "newspaper",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="pulse.newspaper",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="pulse.newspaper",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-score"],
+                "indexes": [
+                    models.Index(
+                        fields=["newspaper", "-score"],
+                        name="pulse_relat_newspap_931e66_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="relatednewspaper",
+            constraint=models.UniqueConstraint(
+                fields=("newspaper", "related"), name="unique_related_newspaper"
+            ),
+        ),
+    ]
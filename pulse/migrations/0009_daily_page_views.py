@@ -0,0 +1,51 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0008_related_newspapers"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPageViews",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("views", models.PositiveIntegerField(default=0)),
+                (
+                    "newspaper",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_views",
+                        to="pulse.newspaper",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["date", "newspaper"], name="pulse_daily_date_e38791_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailypageviews",
+            constraint=models.UniqueConstraint(
+                fields=("newspaper", "date"), name="unique_daily_page_views"
+            ),
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_output(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        month = "date_trunc('month', n.published_date)::date"
+    else:
+        month = "date(n.published_date, 'start of month')"
+    schema_editor.execute(
+        "INSERT INTO pulse_redactormonthlyoutput (redactor_id, month, articles) "
+        f"SELECT p.redactor_id, {month}, COUNT(*) "
+        "FROM pulse_newspaper_publishers p "
+        "JOIN pulse_newspaper n ON n.id = p.newspaper_id "
+        f"GROUP BY p.redactor_id, {month}"
+    )
+    schema_editor.execute(
+        "INSERT INTO pulse_redactortopicoutput (redactor_id, topic_id, articles) "
+        "SELECT p.redactor_id, t.topic_id, COUNT(*) "
+        "FROM pulse_newspaper_publishers p "
+        "JOIN pulse_newspaper_topic t ON t.newspaper_id = p.newspaper_id "
+        "GROUP BY p.redactor_id, t.topic_id"
+    )
+    schema_editor.execute(
+        "UPDATE pulse_redactor SET article_count = ("
+        "SELECT COUNT(*) FROM pulse_newspaper_publishers p "
+        "WHERE p.redactor_id = pulse_redactor.id)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0009_daily_page_views"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="redactor",
+            name="article_count",
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="RedactorMonthlyOutput",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("articles", models.IntegerField(default=0)),
+                (
+                    "redactor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_output",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["month"],
+            },
+        ),
+        migrations.CreateModel(
+            name="RedactorTopicOutput",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("articles", models.IntegerField(default=0)),
+                (
+                    "redactor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="topic_output",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "topic",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="pulse.topic",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-articles"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="redactormonthlyoutput",
+            constraint=models.UniqueConstraint(
+                fields=("redactor", "month"), name="unique_redactor_monthly_output"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="redactortopicoutput",
+            constraint=models.UniqueConstraint(
+                fields=("redactor", "topic"), name="unique_redactor_topic_output"
+            ),
+        ),
+        migrations.RunPython(backfill_output, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+TRIGRAM_TABLES = [
+    ("pulse_newspaper_title_trgm", "pulse_newspaper", "title"),
+    ("pulse_topic_name_trgm", "pulse_topic", "name"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for _, table, column in TRIGRAM_TABLES:
+            schema_editor.execute(
+                f"CREATE INDEX {table}_{column}_trgm_idx ON {table} "
+                f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+            )
+        return
+    for trigram_table, table, column in TRIGRAM_TABLES:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {trigram_table} "
+            f"USING fts5({column}, tokenize='trigram', content='')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {trigram_table} (rowid, {column}) "
+            f"SELECT id, {column} FROM {table}"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    for trigram_table, table, column in TRIGRAM_TABLES:
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(
+                f"DROP INDEX IF EXISTS {table}_{column}_trgm_idx"
+            )
+        else:
+            schema_editor.execute(f"DROP TABLE IF EXISTS {trigram_table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0010_redactor_output"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
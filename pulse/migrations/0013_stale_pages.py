@@ -0,0 +1,35 @@
+# Generated by Django 5.0.4 on 2026-10-19 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0012_newspaper_revisions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StalePage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kind", models.CharField(max_length=16)),
+                ("object_id", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="stalepage",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="unique_stale_page"
+            ),
+        ),
+    ]
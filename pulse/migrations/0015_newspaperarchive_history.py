@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-19 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pulse", "0014_audit_entries"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspaperarchive",
+            name="history",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
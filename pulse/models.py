@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
+
+from pulse.fields import CompressedTextField
 
 
 class Topic(models.Model):
@@ -11,6 +14,9 @@ class Topic(models.Model):
 
 class Redactor(AbstractUser):
     years_of_experience = models.IntegerField(default=0)
+    article_count = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True
+    )
 
     def __str__(self):
         return (
@@ -20,10 +26,280 @@ class Redactor(AbstractUser):
 
 class Newspaper(models.Model):
     title = models.CharField(max_length=255)
-    content = models.TextField()
-    published_date = models.DateField()
+    content = CompressedTextField(blob_field="content_blob")
+    published_date = models.DateField(db_index=True)
     topic = models.ManyToManyField(Topic)
     publishers = models.ManyToManyField(Redactor)
+    content_blob = models.BinaryField(null=True, editable=False)
+    duplicate_of = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name="duplicates",
+    )
+
+    is_archived = False
+
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "content_blob"}
+        super().save(*args, **kwargs)
+
+
+class ContentDictionary(models.Model):
+    codec = models.CharField(max_length=16)
+    data = models.BinaryField()
+    sample_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "content dictionaries"
+
+    def __str__(self):
+        return f"{self.codec} dictionary #{self.pk}"
+
+
+class NewspaperArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    content = models.TextField()
+    published_date = models.DateField(db_index=True)
+    topic = models.ManyToManyField(
+        Topic, related_name="archived_newspapers", db_constraint=False
+    )
+    publishers = models.ManyToManyField(
+        Redactor, related_name="archived_newspapers", db_constraint=False
+    )
+    # Revisions, page views and duplicate links, as archive.history()
+    # collects them when the row leaves the live table.
+    history = models.JSONField(default=dict, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    is_archived = True
 
     def __str__(self):
         return self.title
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    timeout = models.PositiveIntegerField(default=300)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [models.Index(fields=["status", "run_at"])]
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
+
+
+class SitemapShard(models.Model):
+    number = models.PositiveIntegerField(primary_key=True)
+    url_count = models.PositiveIntegerField(default=0)
+    stale = models.BooleanField(default=True)
+    generated_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"sitemap-{self.number}.xml"
+
+
+class StalePage(models.Model):
+    # Prerendered pages queued for regeneration by the save signals.
+    NEWSPAPER = "newspaper"
+    TOPIC = "topic"
+    TOPIC_INDEX = "topics"
+
+    kind = models.CharField(max_length=16)
+    object_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="unique_stale_page"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
+
+
+class NewspaperSignature(models.Model):
+    newspaper = models.OneToOneField(
+        Newspaper, on_delete=models.CASCADE, primary_key=True
+    )
+    signature = models.BinaryField()
+
+
+class SignatureBand(models.Model):
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="signature_bands"
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["band", "bucket"])]
+
+
+class TermStat(models.Model):
+    term = models.CharField(max_length=64, primary_key=True)
+    document_frequency = models.PositiveIntegerField()
+
+
+class NewspaperTerm(models.Model):
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="terms"
+    )
+    term = models.CharField(max_length=64)
+    weight = models.FloatField()
+
+    class Meta:
+        indexes = [models.Index(fields=["term"])]
+
+
+class RelatedNewspaper(models.Model):
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="related_entries"
+    )
+    related = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="+"
+    )
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["-score"]
+        indexes = [models.Index(fields=["newspaper", "-score"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["newspaper", "related"],
+                name="unique_related_newspaper",
+            )
+        ]
+
+
+class DailyPageViews(models.Model):
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="daily_views"
+    )
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["date", "newspaper"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["newspaper", "date"], name="unique_daily_page_views"
+            )
+        ]
+
+
+class RedactorMonthlyOutput(models.Model):
+    # Counters are signed because decrements go through the same
+    # INSERT ... ON CONFLICT upsert, whose CHECK runs on the inserted row.
+    redactor = models.ForeignKey(
+        Redactor, on_delete=models.CASCADE, related_name="monthly_output"
+    )
+    month = models.DateField()
+    articles = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["redactor", "month"],
+                name="unique_redactor_monthly_output",
+            )
+        ]
+
+
+class RedactorTopicOutput(models.Model):
+    redactor = models.ForeignKey(
+        Redactor, on_delete=models.CASCADE, related_name="topic_output"
+    )
+    topic = models.ForeignKey(
+        Topic, on_delete=models.CASCADE, related_name="+"
+    )
+    articles = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["-articles"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["redactor", "topic"],
+                name="unique_redactor_topic_output",
+            )
+        ]
+
+
+class NewspaperRevision(models.Model):
+    # An earlier version of a newspaper. Only the newspaper row holds the
+    # latest text in full; each revision stores a delta that rebuilds its
+    # content from the next newer revision (or the current row).
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="revisions"
+    )
+    title = models.CharField(max_length=255)
+    published_date = models.DateField()
+    delta = models.BinaryField()
+    edited_by = models.ForeignKey(
+        Redactor,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-pk"]
+
+    def __str__(self):
+        return f"{self.title} (revision #{self.pk})"
+
+
+class AuditEntry(models.Model):
+    # Bulk-inserted by the logging pipeline, so rows name their object and
+    # user by id rather than through foreign keys that could be gone.
+    class Action(models.TextChoices):
+        CREATE = "create", "Create"
+        UPDATE = "update", "Update"
+        DELETE = "delete", "Delete"
+
+    action = models.CharField(max_length=8, choices=Action.choices)
+    model = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    object_repr = models.CharField(max_length=255)
+    user_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-pk"]
+        indexes = [models.Index(fields=["model", "object_id"])]
+
+    def __str__(self):
+        return f"{self.action} {self.model} #{self.object_id}"
@@ -0,0 +1,179 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+from pulse import jobs
+from pulse.db import increment_rows
+from pulse.models import Newspaper, DailyPageViews
+
+logger = logging.getLogger(__name__)
+
+SEQUENCE_KEY = "pulse:views:sequence"
+CURSOR_KEY = "pulse:views:cursor"
+LOCK_KEY = "pulse:views:lock"
+FLUSH_QUEUED_KEY = "pulse:views:flush_queued"
+BATCH_TIMEOUT = 60 * 60
+LOCK_TIMEOUT = 60
+# A batch whose sequence number was taken but whose payload is not in the
+# cache yet is retried until this many newer batches exist; after that it
+# is assumed to be evicted and skipped.
+PENDING_BATCH_WINDOW = 20
+MOST_READ_CACHE_TIMEOUT = 60
+
+_buffer = Counter()
+_lock = threading.Lock()
+_last_push = time.monotonic()
+
+
+def _batch_key(sequence):
+    return f"pulse:views:batch:{sequence}"
+
+
+def record_view(pk):
+    global _last_push
+    today = timezone.localdate().isoformat()
+    with _lock:
+        _buffer[(today, pk)] += 1
+        due = (
+            time.monotonic() - _last_push
+            >= settings.PULSE_PAGEVIEW_FLUSH_SECONDS
+        )
+        if due:
+            _last_push = time.monotonic()
+    if due and push() is not None:
+        _queue_flush()
+
+
+def _queue_flush():
+    # The request only hands its batch over; a job worker writes it, and
+    # at most one flush job is queued per interval across processes.
+    try:
+        queued = cache.add(
+            FLUSH_QUEUED_KEY, True, settings.PULSE_PAGEVIEW_FLUSH_SECONDS
+        )
+    except Exception:
+        logger.warning("Could not queue a page view flush", exc_info=True)
+        return
+    if queued:
+        flush.delay()
+
+
+def push():
+    with _lock:
+        if not _buffer:
+            return None
+        buffered = Counter(_buffer)
+        _buffer.clear()
+    counts = [[day, pk, views] for (day, pk), views in buffered.items()]
+    # Each worker hands its aggregated counts over as one immutable batch;
+    # whichever worker holds the flush lock drains them into the database.
+    try:
+        cache.add(SEQUENCE_KEY, 0, None)
+        sequence = cache.incr(SEQUENCE_KEY)
+        cache.set(_batch_key(sequence), counts, BATCH_TIMEOUT)
+    except Exception:
+        # Kept for the next push rather than lost with the cache.
+        logger.warning("Could not push page views", exc_info=True)
+        with _lock:
+            _buffer.update(buffered)
+        return None
+    return sequence
+
+
+atexit.register(push)
+
+
+def _upsert(totals):
+    existing = set(
+        Newspaper.objects.filter(
+            pk__in={pk for _, pk in totals}
+        ).values_list("pk", flat=True)
+    )
+    rows = [
+        (pk, day, views)
+        for (day, pk), views in totals.items()
+        if pk in existing
+    ]
+    return increment_rows(
+        DailyPageViews, ("newspaper", "date"), "views", rows
+    )
+
+
+@jobs.job
+def flush():
+    if not cache.add(LOCK_KEY, True, LOCK_TIMEOUT):
+        return 0
+    try:
+        cursor = cache.get(CURSOR_KEY, 0)
+        sequence = cache.get(SEQUENCE_KEY, 0)
+        keys = [_batch_key(n) for n in range(cursor + 1, sequence + 1)]
+        batches = cache.get_many(keys)
+        totals = Counter()
+        drained = []
+        for number in range(cursor + 1, sequence + 1):
+            batch = batches.get(_batch_key(number))
+            if batch is None and sequence - number < PENDING_BATCH_WINDOW:
+                break
+            for day, pk, views in batch or ():
+                totals[(day, pk)] += views
+            drained.append(_batch_key(number))
+            cursor = number
+        written = _upsert(totals)
+        cache.set(CURSOR_KEY, cursor, None)
+        cache.delete_many(drained)
+        if written:
+            cache.delete(_most_read_key())
+        return written
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def _most_read_key(days=None, limit=None):
+    days = days or settings.PULSE_MOST_READ_DAYS
+    limit = limit or settings.PULSE_MOST_READ_LIMIT
+    return f"pulse:views:most_read:{days}:{limit}"
+
+
+def most_read(days=None, limit=None):
+    key = _most_read_key(days, limit)
+    try:
+        ranking = cache.get(key)
+    except Exception:
+        logger.warning("Could not read the most read list", exc_info=True)
+        ranking = None
+    if ranking is None:
+        since = timezone.localdate() - timedelta(
+            days=(days or settings.PULSE_MOST_READ_DAYS) - 1
+        )
+        totals = list(
+            DailyPageViews.objects.filter(date__gte=since)
+            .values("newspaper")
+            .annotate(total=Sum("views"))
+            .order_by("-total", "newspaper")
+            .values_list("newspaper", "total")[
+                : limit or settings.PULSE_MOST_READ_LIMIT
+            ]
+        )
+        titles = dict(
+            Newspaper.objects.filter(
+                pk__in=[pk for pk, _ in totals]
+            ).values_list("pk", "title")
+        )
+        ranking = [
+            {"pk": pk, "title": titles[pk], "views": total}
+            for pk, total in totals
+            if pk in titles
+        ]
+        try:
+            cache.set(key, ranking, MOST_READ_CACHE_TIMEOUT)
+        except Exception:
+            logger.warning("Could not cache the most read list", exc_info=True)
+    return ranking
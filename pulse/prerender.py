@@ -0,0 +1,280 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.urls import reverse
+
+from pulse import coldarchive, related
+from pulse.models import Newspaper, NewspaperArchive, StalePage, Topic
+
+CHUNK_SIZE = 500
+
+Topics = Newspaper.topic.through
+Publishers = Newspaper.publishers.through
+
+
+def is_enabled():
+    return bool(settings.PULSE_PRERENDER_ROOT)
+
+
+def root():
+    return Path(settings.PULSE_PRERENDER_ROOT)
+
+
+def mark(pages):
+    if not is_enabled():
+        return
+    StalePage.objects.bulk_create(
+        [StalePage(kind=kind, object_id=pk) for kind, pk in set(pages)],
+        ignore_conflicts=True,
+    )
+
+
+# The mark_* helpers check is_enabled() themselves, before any lookup, so
+# a site without a mirror pays nothing on save.
+def mark_newspapers(ids):
+    if not is_enabled():
+        return
+    # Topic pages list titles and dates, so they go stale with the rows.
+    ids = list(ids)
+    topic_ids = Topics.objects.filter(newspaper_id__in=ids).values_list(
+        "topic_id", flat=True
+    )
+    mark(
+        [(StalePage.NEWSPAPER, pk) for pk in ids]
+        + [(StalePage.TOPIC, pk) for pk in topic_ids]
+    )
+
+
+def mark_topics(ids, with_newspapers=False):
+    if not is_enabled():
+        return
+    ids = list(ids)
+    pages = [(StalePage.TOPIC_INDEX, 0)]
+    pages += [(StalePage.TOPIC, pk) for pk in ids]
+    if with_newspapers:
+        pages += [
+            (StalePage.NEWSPAPER, pk)
+            for pk in Topics.objects.filter(topic_id__in=ids).values_list(
+                "newspaper_id", flat=True
+            )
+        ]
+    mark(pages)
+
+
+def mark_redactor(redactor_id):
+    if not is_enabled():
+        return
+    mark(
+        (StalePage.NEWSPAPER, pk)
+        for pk in Publishers.objects.filter(
+            redactor_id=redactor_id
+        ).values_list("newspaper_id", flat=True)
+    )
+
+
+def _request(path):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return request
+
+
+def _page_file(path):
+    return root() / path.strip("/") / "index.html"
+
+
+def write_page(path, html):
+    target = _page_file(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    with os.fdopen(handle, "w", encoding="utf-8") as output:
+        output.write(html)
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, target)
+
+
+def remove_page(path):
+    _page_file(path).unlink(missing_ok=True)
+
+
+def newspaper_path(pk):
+    return reverse("pulse:newspaper-detail", args=[pk])
+
+
+def topic_path(pk, page=1):
+    # The live site has no per-topic page, so the mirror gets its own
+    # under the topic list.
+    path = f"{reverse('pulse:topics')}{pk}/"
+    return path if page == 1 else f"{path}{page}/"
+
+
+def render_newspaper(pk):
+    path = newspaper_path(pk)
+    # Archiving keeps the article readable, so the page follows it through
+    # the same tables the detail view falls back to.
+    newspaper = (
+        Newspaper.objects.filter(pk=pk)
+        .prefetch_related("topic", "publishers")
+        .first()
+        or NewspaperArchive.objects.filter(pk=pk)
+        .prefetch_related("topic", "publishers")
+        .first()
+        or coldarchive.get(pk)
+    )
+    if newspaper is None:
+        remove_page(path)
+        return
+    context = {"newspaper": newspaper, "read_only": True}
+    if not newspaper.is_archived:
+        context["related_newspapers"] = related.related_newspapers(newspaper)
+    write_page(
+        path,
+        render_to_string(
+            "pulse/newspaper_detail.html", context, _request(path)
+        ),
+    )
+
+
+def render_topic(pk):
+    directory = _page_file(topic_path(pk)).parent
+    topic = Topic.objects.filter(pk=pk).first()
+    if topic is None:
+        shutil.rmtree(directory, ignore_errors=True)
+        return
+    newspapers = topic.newspaper_set.order_by(
+        "-published_date", "-pk"
+    ).only("id", "title", "published_date")
+    paginator = Paginator(newspapers, settings.PULSE_PRERENDER_PAGE_SIZE)
+    for page in paginator:
+        path = topic_path(pk, page.number)
+        context = {
+            "topic": topic,
+            "page_obj": page,
+            "newspapers": page.object_list,
+            "previous_url": (
+                topic_path(pk, page.previous_page_number())
+                if page.has_previous()
+                else None
+            ),
+            "next_url": (
+                topic_path(pk, page.next_page_number())
+                if page.has_next()
+                else None
+            ),
+            "read_only": True,
+        }
+        write_page(
+            path,
+            render_to_string(
+                "pulse/topic_detail.html", context, _request(path)
+            ),
+        )
+    # Drop pages left over from when the topic had more newspapers.
+    for child in directory.iterdir():
+        if (
+            child.is_dir()
+            and child.name.isdigit()
+            and int(child.name) > paginator.num_pages
+        ):
+            shutil.rmtree(child)
+
+
+def render_topic_index():
+    path = reverse("pulse:topics")
+    context = {
+        "topic_list": Topic.objects.order_by("name"),
+        "read_only": True,
+    }
+    write_page(
+        path,
+        render_to_string("pulse/topic_list.html", context, _request(path)),
+    )
+
+
+RENDERERS = {
+    StalePage.NEWSPAPER: render_newspaper,
+    StalePage.TOPIC: render_topic,
+    StalePage.TOPIC_INDEX: lambda pk: render_topic_index(),
+}
+
+
+def render_chunk(chunk):
+    kind, ids = chunk
+    for pk in ids:
+        RENDERERS[kind](pk)
+    return len(ids)
+
+
+def refresh():
+    # Claim the queue before rendering: anything saved while this runs is
+    # queued again and picked up by the next refresh.
+    claimed = StalePage.objects.aggregate(last=Max("pk"))["last"]
+    if claimed is None:
+        return 0
+    pages = list(
+        StalePage.objects.filter(pk__lte=claimed).values_list(
+            "kind", "object_id"
+        )
+    )
+    StalePage.objects.filter(pk__lte=claimed).delete()
+    try:
+        for kind, pk in pages:
+            RENDERERS[kind](pk)
+    except Exception:
+        mark(pages)
+        raise
+    return len(pages)
+
+
+def _chunks(kind, ids):
+    return [
+        (kind, ids[start:start + CHUNK_SIZE])
+        for start in range(0, len(ids), CHUNK_SIZE)
+    ]
+
+
+def _remove_orphans(directory, ids):
+    if not directory.is_dir():
+        return
+    for child in directory.iterdir():
+        if child.is_dir() and child.name.isdigit() and (
+            int(child.name) not in ids
+        ):
+            shutil.rmtree(child)
+
+
+def build_all(workers=1):
+    StalePage.objects.all().delete()
+    newspaper_ids = sorted(
+        set(Newspaper.objects.values_list("pk", flat=True))
+        | set(NewspaperArchive.objects.values_list("pk", flat=True))
+        | set(coldarchive.live_ids())
+    )
+    topic_ids = list(Topic.objects.order_by("pk").values_list("pk", flat=True))
+    chunks = _chunks(StalePage.NEWSPAPER, newspaper_ids) + _chunks(
+        StalePage.TOPIC, topic_ids
+    )
+    if workers > 1 and len(chunks) > 1:
+        # Forked workers must not share the parent's database connection.
+        connections.close_all()
+        with multiprocessing.Pool(min(workers, len(chunks))) as pool:
+            for _ in pool.imap_unordered(render_chunk, chunks):
+                pass
+    else:
+        for chunk in chunks:
+            render_chunk(chunk)
+    render_topic_index()
+    _remove_orphans(
+        _page_file(newspaper_path(1)).parent.parent, set(newspaper_ids)
+    )
+    _remove_orphans(_page_file(topic_path(1)).parent.parent, set(topic_ids))
+    return len(newspaper_ids) + len(topic_ids) + 1
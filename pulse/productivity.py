@@ -0,0 +1,194 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+
+from pulse.db import increment_rows
+from pulse.models import (
+    Redactor,
+    Newspaper,
+    NewspaperArchive,
+    RedactorMonthlyOutput,
+    RedactorTopicOutput,
+    Topic,
+)
+
+Publishers = Newspaper.publishers.through
+Topics = Newspaper.topic.through
+# Archived newspapers keep counting: only a deletion takes an article off
+# a redactor's record. The archive's relation rows have no constraints, so
+# they may name redactors and topics that are gone.
+TIERS = (
+    (Publishers, "newspaper"),
+    (NewspaperArchive.publishers.through, "newspaperarchive"),
+)
+BATCH_SIZE = 1000
+
+
+def month_of(day):
+    return day.replace(day=1)
+
+
+def publication_deltas(pairs, sign=1):
+    pairs = list(pairs)
+    newspaper_ids = {newspaper_id for _, newspaper_id in pairs}
+    dates = dict(
+        Newspaper.objects.filter(pk__in=newspaper_ids).values_list(
+            "pk", "published_date"
+        )
+    )
+    topics = defaultdict(list)
+    for newspaper_id, topic_id in Topics.objects.filter(
+        newspaper_id__in=newspaper_ids
+    ).values_list("newspaper_id", "topic_id"):
+        topics[newspaper_id].append(topic_id)
+    deltas = Counter()
+    for redactor_id, newspaper_id in pairs:
+        if newspaper_id not in dates:
+            continue
+        deltas["total", redactor_id] += sign
+        deltas["month", redactor_id, month_of(dates[newspaper_id])] += sign
+        for topic_id in topics[newspaper_id]:
+            deltas["topic", redactor_id, topic_id] += sign
+    return deltas
+
+
+def topic_deltas(pairs, sign=1):
+    pairs = list(pairs)
+    publishers = defaultdict(list)
+    for newspaper_id, redactor_id in Publishers.objects.filter(
+        newspaper_id__in={newspaper_id for newspaper_id, _ in pairs}
+    ).values_list("newspaper_id", "redactor_id"):
+        publishers[newspaper_id].append(redactor_id)
+    deltas = Counter()
+    for newspaper_id, topic_id in pairs:
+        for redactor_id in publishers[newspaper_id]:
+            deltas["topic", redactor_id, topic_id] += sign
+    return deltas
+
+
+def date_deltas(newspaper_id, old_date, new_date):
+    deltas = Counter()
+    if month_of(old_date) == month_of(new_date):
+        return deltas
+    for redactor_id in Publishers.objects.filter(
+        newspaper_id=newspaper_id
+    ).values_list("redactor_id", flat=True):
+        deltas["month", redactor_id, month_of(old_date)] -= 1
+        deltas["month", redactor_id, month_of(new_date)] += 1
+    return deltas
+
+
+def apply(deltas):
+    rows = defaultdict(list)
+    for (kind, redactor_id, *key), delta in deltas.items():
+        if delta:
+            rows[kind].append((redactor_id, *key, delta))
+    if not rows:
+        return
+    with transaction.atomic():
+        increment_rows(
+            RedactorMonthlyOutput,
+            ("redactor", "month"),
+            "articles",
+            rows["month"],
+        )
+        increment_rows(
+            RedactorTopicOutput,
+            ("redactor", "topic"),
+            "articles",
+            rows["topic"],
+        )
+        for redactor_id, delta in rows["total"]:
+            Redactor.objects.filter(pk=redactor_id).update(
+                article_count=F("article_count") + delta
+            )
+        redactor_ids = {
+            row[0] for kind_rows in rows.values() for row in kind_rows
+        }
+        for model in (RedactorMonthlyOutput, RedactorTopicOutput):
+            model.objects.filter(
+                redactor_id__in=redactor_ids, articles=0
+            ).delete()
+
+
+def rebuild():
+    redactor_ids = set(Redactor.objects.values_list("pk", flat=True))
+    topic_ids = set(Topic.objects.values_list("pk", flat=True))
+    monthly, by_topic, totals = Counter(), Counter(), Counter()
+    for through, newspaper in TIERS:
+        for redactor_id, month, articles in (
+            through.objects.annotate(
+                month=TruncMonth(f"{newspaper}__published_date")
+            )
+            .values_list("redactor_id", "month")
+            .annotate(articles=Count("id"))
+            .order_by()
+        ):
+            monthly[redactor_id, month] += articles
+        for redactor_id, topic_id, articles in (
+            through.objects.filter(**{f"{newspaper}__topic__isnull": False})
+            .values_list("redactor_id", f"{newspaper}__topic")
+            .annotate(articles=Count("id"))
+            .order_by()
+        ):
+            by_topic[redactor_id, topic_id] += articles
+        for redactor_id, articles in (
+            through.objects.values_list("redactor_id")
+            .annotate(articles=Count("id"))
+            .order_by()
+        ):
+            totals[redactor_id] += articles
+    with transaction.atomic():
+        RedactorMonthlyOutput.objects.all().delete()
+        RedactorTopicOutput.objects.all().delete()
+        RedactorMonthlyOutput.objects.bulk_create(
+            (
+                RedactorMonthlyOutput(
+                    redactor_id=redactor_id, month=month, articles=articles
+                )
+                for (redactor_id, month), articles in monthly.items()
+                if redactor_id in redactor_ids
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        RedactorTopicOutput.objects.bulk_create(
+            (
+                RedactorTopicOutput(
+                    redactor_id=redactor_id, topic_id=topic_id,
+                    articles=articles,
+                )
+                for (redactor_id, topic_id), articles in by_topic.items()
+                if redactor_id in redactor_ids and topic_id in topic_ids
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        redactors = list(Redactor.objects.only("pk", "article_count"))
+        for redactor in redactors:
+            redactor.article_count = totals.get(redactor.pk, 0)
+        Redactor.objects.bulk_update(
+            redactors, ["article_count"], batch_size=BATCH_SIZE
+        )
+    return len(totals.keys() & redactor_ids)
+
+
+def monthly_chart(redactor):
+    months = list(
+        redactor.monthly_output.values_list("month", "articles")
+    )
+    peak = max((articles for _, articles in months), default=0)
+    return [
+        {
+            "month": month,
+            "articles": articles,
+            "percent": round(100 * articles / peak),
+        }
+        for month, articles in months
+    ]
+
+
+def topic_breakdown(redactor):
+    return list(
+        redactor.topic_output.values_list("topic__name", "articles")
+    )
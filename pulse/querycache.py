@@ -0,0 +1,123 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
+
+from pulse.versions import NEWSPAPER_LIST, get_version
+
+_local = OrderedDict()
+_lock = threading.Lock()
+
+
+def normalize(cleaned_data):
+    # Only drops what cannot change the search; text is used as the form
+    # cleaned it, because case-insensitive matching is ASCII-only on
+    # SQLite.
+    params = {}
+    for name, value in cleaned_data.items():
+        if isinstance(value, bool):
+            value = "on" if value else ""
+        elif isinstance(value, str):
+            pass
+        elif isinstance(value, Model):
+            value = str(value.pk)
+        elif isinstance(value, int):
+            value = str(value)
+        elif value is not None:
+            value = value.isoformat()
+        if value:
+            params[name] = value
+    return urlencode(sorted(params.items()))
+
+
+def _local_get(key):
+    with _lock:
+        entry = _local.get(key)
+        if entry is not None:
+            _local.move_to_end(key)
+        return entry
+
+
+def _local_set(key, entry):
+    with _lock:
+        _local[key] = entry
+        _local.move_to_end(key)
+        while len(_local) > settings.PULSE_SEARCH_CACHE_SIZE:
+            _local.popitem(last=False)
+
+
+def clear_local():
+    with _lock:
+        _local.clear()
+
+
+def cached_ids(queryset, query, limit):
+    # Entries are keyed by the newspaper list generation, so any change
+    # makes every cached result unreachable without deleting keys; old
+    # generations age out of the LRU and the shared cache on their own.
+    version = get_version(NEWSPAPER_LIST)
+    if version is None:
+        return _search(queryset, limit)
+    digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+    key = f"pulse:search:{version}:{limit}:{digest}"
+    entry = _local_get(key)
+    if entry is None:
+        try:
+            entry = cache.get(key)
+        except Exception:
+            return _search(queryset, limit)
+        if entry is None:
+            entry = _search(queryset, limit)
+            try:
+                cache.set(key, entry, settings.PULSE_SEARCH_CACHE_TIMEOUT)
+            except Exception:
+                return entry
+        _local_set(key, entry)
+    return entry
+
+
+def _search(queryset, limit):
+    return (
+        queryset.count(),
+        list(queryset.values_list("pk", flat=True)[:limit]),
+    )
+
+
+class CachedResults:
+    ordered = True
+
+    def __init__(self, queryset, base, query, limit):
+        self.queryset = queryset
+        self.base = base
+        self.query = query
+        self.limit = limit
+
+    @cached_property
+    def entry(self):
+        return cached_ids(self.queryset, self.query, self.limit)
+
+    def as_queryset(self):
+        # The filtered queryset the cached results stand in for.
+        return self.queryset
+
+    def count(self):
+        return self.entry[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        count, ids = self.entry
+        start, stop, _ = index.indices(count)
+        if stop > len(ids):
+            return list(self.queryset[index])
+        page_ids = ids[start:stop]
+        objects = self.base.in_bulk(page_ids)
+        return [objects[pk] for pk in page_ids if pk in objects]
@@ -0,0 +1,176 @@
+import json
+import re
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from pulse.models import Topic, Redactor, Newspaper
+from pulse.querycache import CachedResults
+from pulse.views import (
+    NewspaperListView,
+    RedactorListView,
+    TopicListView,
+)
+
+BASELINE_DIR = Path(__file__).resolve().parent / "query_plans"
+
+# How much of a table an access path reads, from a targeted lookup up to a
+# full sequential scan.
+ACCESS_COST = {"index": 0, "virtual": 0, "full-index": 1, "scan": 2}
+
+SQLITE_ACCESS = re.compile(
+    r"\b(?P<kind>SCAN|SEARCH) (?P<table>\w+)(?P<rest>.*)"
+)
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR (?P<what>.+)")
+POSTGRES_ACCESS = [
+    (re.compile(r"Seq Scan on (?P<table>\w+)"), "scan"),
+    (
+        re.compile(
+            r"Index (?:Only )?Scan (?:Backward )?using \w+ on (?P<table>\w+)"
+        ),
+        "index",
+    ),
+    (re.compile(r"Bitmap Heap Scan on (?P<table>\w+)"), "index"),
+]
+POSTGRES_SPILL = re.compile(r"Sort Method: external")
+
+
+def _list_view_queryset(view_class, params=None):
+    request = HttpRequest()
+    request.method = "GET"
+    request.GET = QueryDict(urlencode(params or {}))
+    request.user = AnonymousUser()
+    view = view_class()
+    view.setup(request)
+    queryset = view.get_queryset()
+    if isinstance(queryset, CachedResults):
+        queryset = queryset.as_queryset()
+    return queryset[: view.paginate_by]
+
+
+def hot_querysets():
+    sample = Newspaper.objects.order_by("pk").first()
+    title = sample.title.split()[0] if sample else "news"
+    word = sample.content.split()[0].strip(".") if sample else "news"
+    recent = timezone.localdate() - timedelta(days=1)
+    topic = Topic.objects.order_by("pk").first()
+    return {
+        "newspaper-list": lambda: _list_view_queryset(NewspaperListView),
+        "newspaper-list-title": lambda: _list_view_queryset(
+            NewspaperListView, {"title": title}
+        ),
+        "newspaper-list-content": lambda: _list_view_queryset(
+            NewspaperListView, {"content": word}
+        ),
+        "newspaper-list-date": lambda: _list_view_queryset(
+            NewspaperListView, {"published_date": recent.isoformat()}
+        ),
+        "redactor-list": lambda: _list_view_queryset(RedactorListView),
+        "redactor-list-output": lambda: _list_view_queryset(
+            RedactorListView, {"sort": "output"}
+        ),
+        "topic-list": lambda: _list_view_queryset(TopicListView),
+        "topic-newspapers": lambda: Newspaper.objects.filter(
+            topic=topic
+        ).order_by("-published_date")[:20],
+        "redactor-newspapers": lambda: Newspaper.objects.filter(
+            publishers=Redactor.objects.order_by("pk").first()
+        ).order_by("-published_date")[:20],
+    }
+
+
+def explain(queryset):
+    if connection.vendor == "postgresql":
+        # ANALYZE runs the query, which is the only way to see a sort
+        # spilling to disk.
+        return queryset.explain(analyze=True)
+    return queryset.explain()
+
+
+def summarize(plan, vendor=None):
+    vendor = vendor or connection.vendor
+    access = {}
+    sorts = []
+
+    def record(table, kind):
+        if ACCESS_COST[kind] >= ACCESS_COST.get(access.get(table), -1):
+            access[table] = kind
+
+    for line in plan.splitlines():
+        if vendor == "postgresql":
+            for pattern, kind in POSTGRES_ACCESS:
+                match = pattern.search(line)
+                if match:
+                    record(match["table"], kind)
+            if POSTGRES_SPILL.search(line):
+                sorts.append("external sort")
+            continue
+        match = SQLITE_ACCESS.search(line)
+        if match:
+            rest = match["rest"]
+            if "VIRTUAL TABLE" in rest:
+                kind = "virtual"
+            elif match["kind"] == "SEARCH":
+                kind = "index"
+            elif "USING" in rest:
+                kind = "full-index"
+            else:
+                kind = "scan"
+            record(match["table"], kind)
+        match = SQLITE_SORT.search(line)
+        if match:
+            sorts.append(match["what"].strip())
+    return {"access": dict(sorted(access.items())), "sorts": sorted(sorts)}
+
+
+def capture():
+    return {
+        name: summarize(explain(build()))
+        for name, build in hot_querysets().items()
+    }
+
+
+def regressions(baseline, current):
+    problems = []
+    for table, kind in current["access"].items():
+        before = baseline["access"].get(table)
+        if before is not None and ACCESS_COST[kind] > ACCESS_COST[before]:
+            problems.append(f"{table}: {before} -> {kind}")
+    for sort in current["sorts"]:
+        if current["sorts"].count(sort) > baseline["sorts"].count(sort):
+            problems.append(f"new sort: {sort}")
+    return sorted(set(problems))
+
+
+def baseline_path(vendor=None):
+    return BASELINE_DIR / f"{vendor or connection.vendor}.json"
+
+
+def load_baseline(path=None):
+    path = Path(path or baseline_path())
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_baseline(plans, path=None):
+    path = Path(path or baseline_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(plans, indent=2, sort_keys=True) + "\n")
+
+
+def compare(baseline, plans):
+    failures = {}
+    for name, plan in plans.items():
+        if name not in baseline:
+            failures[name] = ["no baseline"]
+            continue
+        problems = regressions(baseline[name], plan)
+        if problems:
+            failures[name] = problems
+    return failures
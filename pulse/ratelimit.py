@@ -0,0 +1,150 @@
+import math
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+
+STATE_TIMEOUT = 60 * 60
+OUTCOMES = ("allowed", "blocked")
+SCOPES = set()
+
+_local_buckets = {}
+_local_metrics = Counter()
+_local_lock = threading.Lock()
+
+
+def parse_rate(rate):
+    tokens, seconds = rate.split("/")
+    return int(tokens), float(seconds)
+
+
+def client_key(request):
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def _refill(state, capacity, per_second, now):
+    tokens, updated_at = state or (capacity, now)
+    return min(capacity, tokens + (now - updated_at) * per_second)
+
+
+def _take(key, capacity, per_second, now):
+    # The read-modify-write is not atomic across workers, so a burst can
+    # slip a few requests past the limit; that is fine for cost control
+    # and avoids a lock round trip on every request.
+    try:
+        state = cache.get(key)
+    except Exception:
+        with _local_lock:
+            return _take_local(key, capacity, per_second, now)
+    tokens = _refill(state, capacity, per_second, now)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    try:
+        cache.set(key, (tokens, now), STATE_TIMEOUT)
+    except Exception:
+        with _local_lock:
+            _local_buckets[key] = (tokens, now)
+    return allowed, tokens
+
+
+def _take_local(key, capacity, per_second, now):
+    tokens = _refill(_local_buckets.get(key), capacity, per_second, now)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    _local_buckets[key] = (tokens, now)
+    return allowed, tokens
+
+
+def _metric_key(scope, cost, outcome):
+    return f"pulse:ratelimit:metrics:{scope}:{cost}:{outcome}"
+
+
+def _count(scope, cost, outcome):
+    key = _metric_key(scope, cost, outcome)
+    try:
+        cache.add(key, 0, None)
+        cache.incr(key)
+    except Exception:
+        with _local_lock:
+            _local_metrics[key] += 1
+
+
+def hit(request, scope, cost):
+    rate = settings.PULSE_RATE_LIMITS.get(cost)
+    if not rate:
+        return None
+    capacity, seconds = parse_rate(rate)
+    per_second = capacity / seconds
+    key = f"pulse:ratelimit:{scope}:{cost}:{client_key(request)}"
+    allowed, tokens = _take(key, capacity, per_second, time.time())
+    _count(scope, cost, OUTCOMES[not allowed])
+    if allowed:
+        return None
+    return max(1, math.ceil((1 - tokens) / per_second))
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        "Too many requests, please slow down.",
+        status=429,
+        content_type="text/plain",
+    )
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+class RateLimitMixin:
+    # Place after LoginRequiredMixin so anonymous requests are redirected
+    # to the login page before they spend any tokens.
+    rate_limit_scope = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.rate_limit_scope:
+            SCOPES.add(cls.rate_limit_scope)
+
+    def get_rate_limit_cost(self):
+        return "cheap"
+
+    def dispatch(self, request, *args, **kwargs):
+        retry_after = hit(
+            request, self.rate_limit_scope, self.get_rate_limit_cost()
+        )
+        if retry_after is not None:
+            return too_many_requests(retry_after)
+        return super().dispatch(request, *args, **kwargs)
+
+
+def metrics():
+    scopes = {}
+    keys = [
+        _metric_key(scope, cost, outcome)
+        for scope in SCOPES
+        for cost in settings.PULSE_RATE_LIMITS
+        for outcome in OUTCOMES
+    ]
+    try:
+        values = cache.get_many(keys)
+    except Exception:
+        values = {}
+    for scope in sorted(SCOPES):
+        for cost, rate in settings.PULSE_RATE_LIMITS.items():
+            entry = {"rate": rate}
+            for outcome in OUTCOMES:
+                key = _metric_key(scope, cost, outcome)
+                entry[outcome] = values.get(key, 0) + _local_metrics[key]
+            scopes.setdefault(scope, {})[cost] = entry
+    return scopes
+
+
+@staff_member_required
+def metrics_view(request):
+    return JsonResponse(metrics())
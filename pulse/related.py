@@ -0,0 +1,239 @@
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Count
+
+from pulse import compression, jobs
+from pulse.models import (
+    Newspaper,
+    NewspaperTerm,
+    RelatedNewspaper,
+    TermStat,
+)
+
+TOP_K = 5
+TERMS_PER_DOCUMENT = 30
+MAX_POSTINGS_PER_TERM = 5000
+TITLE_BOOST = 2
+TOPIC_BOOST = 3
+BATCH_SIZE = 1000
+MAX_TERM_LENGTH = 64
+STOPWORDS = frozenset(
+    "about after all also and any are been before being between both "
+    "but can could each for from had has have her his into its more "
+    "most not now other our out over said she some such than that the "
+    "their them then there these they this those through under very "
+    "were what when where which while who will with would you your".split()
+)
+
+
+def _words(text):
+    return [
+        word
+        for word in re.findall(r"[^\W\d_]{3,}", text.lower())
+        if word not in STOPWORDS and len(word) <= MAX_TERM_LENGTH
+    ][:5000]
+
+
+def term_counts(title, content, topic_ids):
+    counts = Counter(_words(content))
+    for word in _words(title):
+        counts[word] += TITLE_BOOST
+    for pk in topic_ids:
+        counts[f"topic:{pk}"] += TOPIC_BOOST
+    return counts
+
+
+def vectorize(counts, document_frequency, total):
+    weights = {
+        term: (1 + math.log(count))
+        * (math.log((1 + total) / (1 + document_frequency.get(term, 0))) + 1)
+        for term, count in counts.items()
+    }
+    top = heapq.nlargest(
+        TERMS_PER_DOCUMENT, weights.items(), key=itemgetter(1)
+    )
+    norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1.0
+    return {term: weight / norm for term, weight in top}
+
+
+def _documents(queryset):
+    last_pk = 0
+    through = Newspaper.topic.through
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "title", "content", "content_blob")[
+                :BATCH_SIZE
+            ]
+        )
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        topics = defaultdict(list)
+        for newspaper_id, topic_id in through.objects.filter(
+            newspaper_id__in=[row[0] for row in rows]
+        ).values_list("newspaper_id", "topic_id"):
+            topics[newspaper_id].append(topic_id)
+        for pk, title, content, blob in rows:
+            text = compression.stored_text(content, blob)
+            yield pk, term_counts(title, text, topics[pk])
+
+
+def _top_neighbours(scores, top_k=TOP_K):
+    return heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+
+
+def rebuild(top_k=TOP_K):
+    document_frequency = Counter()
+    total = 0
+    for _, counts in _documents(Newspaper.objects.all()):
+        document_frequency.update(counts.keys())
+        total += 1
+
+    vectors = {}
+    postings = defaultdict(list)
+    for pk, counts in _documents(Newspaper.objects.all()):
+        vector = vectorize(counts, document_frequency, total)
+        vectors[pk] = vector
+        for term, weight in vector.items():
+            postings[term].append((pk, weight))
+
+    # Sparse X * X^T one row at a time; very common terms add little
+    # signal and would dominate the cost, so their postings are skipped.
+    related = {}
+    for pk, vector in vectors.items():
+        scores = defaultdict(float)
+        for term, weight in vector.items():
+            entries = postings[term]
+            if len(entries) > MAX_POSTINGS_PER_TERM:
+                continue
+            for other, other_weight in entries:
+                if other != pk:
+                    scores[other] += weight * other_weight
+        related[pk] = _top_neighbours(scores, top_k)
+
+    with transaction.atomic():
+        TermStat.objects.all().delete()
+        NewspaperTerm.objects.all().delete()
+        RelatedNewspaper.objects.all().delete()
+        TermStat.objects.bulk_create(
+            (
+                TermStat(term=term, document_frequency=count)
+                for term, count in document_frequency.items()
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        NewspaperTerm.objects.bulk_create(
+            (
+                NewspaperTerm(newspaper_id=pk, term=term, weight=weight)
+                for pk, vector in vectors.items()
+                for term, weight in vector.items()
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        RelatedNewspaper.objects.bulk_create(
+            (
+                RelatedNewspaper(newspaper_id=pk, related_id=other, score=s)
+                for pk, neighbours in related.items()
+                for other, s in neighbours
+            ),
+            batch_size=BATCH_SIZE,
+        )
+    return len(vectors)
+
+
+@jobs.job
+def refresh_newspaper(pk):
+    document = next(_documents(Newspaper.objects.filter(pk=pk)), None)
+    with transaction.atomic():
+        RelatedNewspaper.objects.filter(related_id=pk).delete()
+        if document is None:
+            return
+        _, counts = document
+        document_frequency = dict(
+            TermStat.objects.filter(term__in=list(counts)).values_list(
+                "term", "document_frequency"
+            )
+        )
+        vector = vectorize(
+            counts, document_frequency, Newspaper.objects.count()
+        )
+        NewspaperTerm.objects.filter(newspaper_id=pk).delete()
+        NewspaperTerm.objects.bulk_create(
+            NewspaperTerm(newspaper_id=pk, term=term, weight=weight)
+            for term, weight in vector.items()
+        )
+
+        # Same cut as rebuild(): terms with too many postings are skipped,
+        # so an edit never costs a scan of a common term's whole list.
+        postings = dict(
+            NewspaperTerm.objects.filter(term__in=list(vector))
+            .values("term")
+            .annotate(size=Count("id"))
+            .values_list("term", "size")
+        )
+        terms = [
+            term
+            for term in vector
+            if postings.get(term, 0) <= MAX_POSTINGS_PER_TERM
+        ]
+        scores = defaultdict(float)
+        for other, term, weight in (
+            NewspaperTerm.objects.filter(term__in=terms)
+            .exclude(newspaper_id=pk)
+            .values_list("newspaper_id", "term", "weight")
+        ):
+            scores[other] += vector[term] * weight
+
+        RelatedNewspaper.objects.filter(newspaper_id=pk).delete()
+        RelatedNewspaper.objects.bulk_create(
+            RelatedNewspaper(newspaper_id=pk, related_id=other, score=score)
+            for other, score in _top_neighbours(scores)
+        )
+        _offer_to_neighbours(pk, scores)
+
+
+def _offer_to_neighbours(pk, scores):
+    # The changed article may now belong in other articles' top-k lists;
+    # only lists that it actually enters are touched.
+    existing = defaultdict(list)
+    candidates = list(scores)
+    for start in range(0, len(candidates), BATCH_SIZE):
+        for row in RelatedNewspaper.objects.filter(
+            newspaper_id__in=candidates[start:start + BATCH_SIZE]
+        ).only("id", "newspaper_id", "score"):
+            existing[row.newspaper_id].append(row)
+    created = []
+    evicted = []
+    for other, score in scores.items():
+        rows = existing[other]
+        if len(rows) >= TOP_K:
+            weakest = min(rows, key=lambda row: row.score)
+            if score <= weakest.score:
+                continue
+            evicted.append(weakest.pk)
+        created.append(
+            RelatedNewspaper(newspaper_id=other, related_id=pk, score=score)
+        )
+    for start in range(0, len(evicted), BATCH_SIZE):
+        RelatedNewspaper.objects.filter(
+            pk__in=evicted[start:start + BATCH_SIZE]
+        ).delete()
+    RelatedNewspaper.objects.bulk_create(created, batch_size=BATCH_SIZE)
+
+
+def related_newspapers(newspaper, limit=TOP_K):
+    return [
+        entry.related
+        for entry in RelatedNewspaper.objects.filter(newspaper=newspaper)
+        .select_related("related")
+        .only("related__id", "related__title", "related__published_date")[
+            :limit
+        ]
+    ]
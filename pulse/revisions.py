@@ -0,0 +1,248 @@
+import re
+import zlib
+from datetime import timedelta
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from pulse.models import Newspaper, NewspaperRevision
+
+COPY = 0
+INSERT = 1
+TOKEN = re.compile(r"\s*\S+|\s+")
+
+
+def _cache_key(pk):
+    return f"pulse:revision:{pk}"
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_varint(data, position):
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def make_delta(source, target):
+    # Word-level diff: the target as COPY ranges of the source and INSERTed
+    # text, zlib-compressed. The common prefix and suffix are matched
+    # without SequenceMatcher, so a small correction to a long article
+    # only diffs the words around it.
+    old = TOKEN.findall(source)
+    new = TOKEN.findall(target)
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and old[len(old) - suffix - 1] == new[len(new) - suffix - 1]
+    ):
+        suffix += 1
+    blocks = [(0, 0, prefix)]
+    matcher = SequenceMatcher(
+        None, old[prefix:len(old) - suffix], new[prefix:len(new) - suffix]
+    )
+    for a, b, size in matcher.get_matching_blocks():
+        if size:
+            blocks.append((prefix + a, prefix + b, size))
+    blocks.append((len(old) - suffix, len(new) - suffix, suffix))
+
+    offsets = [0]
+    for token in old:
+        offsets.append(offsets[-1] + len(token))
+    ops = bytearray()
+    position = 0
+    for a, b, size in blocks:
+        if not size:
+            continue
+        if b > position:
+            data = "".join(new[position:b]).encode("utf-8")
+            ops += bytes([INSERT]) + _varint(len(data)) + data
+        start = offsets[a]
+        ops += bytes([COPY]) + _varint(start)
+        ops += _varint(offsets[a + size] - start)
+        position = b + size
+    if position < len(new):
+        data = "".join(new[position:]).encode("utf-8")
+        ops += bytes([INSERT]) + _varint(len(data)) + data
+    return zlib.compress(bytes(ops), 9)
+
+
+def apply_delta(source, delta):
+    data = zlib.decompress(bytes(delta))
+    parts = []
+    position = 0
+    while position < len(data):
+        op = data[position]
+        position += 1
+        if op == COPY:
+            start, position = _read_varint(data, position)
+            length, position = _read_varint(data, position)
+            parts.append(source[start:start + length])
+        else:
+            length, position = _read_varint(data, position)
+            parts.append(
+                data[position:position + length].decode("utf-8")
+            )
+            position += length
+    return "".join(parts)
+
+
+def record_revision(newspaper, previous, edited_by=None):
+    # previous is the (title, content, published_date) the row had before
+    # the save. One diff and one INSERT, however long the history is.
+    title, content, published_date = previous
+    current_date = Newspaper._meta.get_field("published_date").to_python(
+        newspaper.published_date
+    )
+    if (title, content, published_date) == (
+        newspaper.title,
+        newspaper.content,
+        current_date,
+    ):
+        return None
+    return NewspaperRevision.objects.create(
+        newspaper=newspaper,
+        title=title,
+        published_date=published_date,
+        delta=make_delta(newspaper.content, content),
+        edited_by=edited_by,
+    )
+
+
+def revision_content(revision):
+    # Rebuilt by applying deltas newest first, starting from the closest
+    # newer revision whose text is cached. A revision's text never
+    # changes, compaction included, so cached texts are never stale.
+    key = _cache_key(revision.pk)
+    content = cache.get(key)
+    if content is not None:
+        return content
+    newer = list(
+        NewspaperRevision.objects.filter(
+            newspaper_id=revision.newspaper_id, pk__gt=revision.pk
+        )
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    cached = cache.get_many([_cache_key(pk) for pk in newer])
+    start = next((pk for pk in newer if _cache_key(pk) in cached), None)
+    if start is None:
+        content = Newspaper.objects.get(pk=revision.newspaper_id).content
+        chain = NewspaperRevision.objects.filter(
+            newspaper_id=revision.newspaper_id, pk__gte=revision.pk
+        )
+    else:
+        content = cached[_cache_key(start)]
+        chain = NewspaperRevision.objects.filter(
+            newspaper_id=revision.newspaper_id,
+            pk__gte=revision.pk,
+            pk__lt=start,
+        )
+    for delta in chain.order_by("-pk").values_list("delta", flat=True):
+        content = apply_delta(content, delta)
+    cache.set(key, content, settings.PULSE_REVISION_CACHE_TIMEOUT)
+    return content
+
+
+def forget(pks):
+    # For revisions created with a pk an earlier, deleted revision may
+    # have had, e.g. by a cold archive restore.
+    cache.delete_many([_cache_key(pk) for pk in pks])
+
+
+def compact(newspaper, keep, retain_before=None, collapse_seconds=0):
+    # Drops revisions superseded before retain_before and versions that
+    # were replaced within collapse_seconds of being saved, always keeping
+    # the newest `keep`. Survivors whose newer neighbour went away get
+    # their delta rebuilt against the next survivor.
+    revisions = list(newspaper.revisions.order_by("-pk"))
+    texts = []
+    content = newspaper.content
+    for revision in revisions:
+        content = apply_delta(content, revision.delta)
+        texts.append(content)
+
+    collapse = timedelta(seconds=collapse_seconds)
+    dropped = set()
+    for index, revision in enumerate(revisions):
+        if index < keep:
+            continue
+        if retain_before and revision.created_at < retain_before:
+            dropped.add(index)
+            continue
+        older = index + 1
+        # The version a revision holds was saved when the older revision
+        # was recorded; the oldest one's lifetime is unknown, so it stays.
+        if (
+            collapse
+            and older < len(revisions)
+            and revision.created_at - revisions[older].created_at < collapse
+        ):
+            dropped.add(index)
+    if not dropped:
+        return 0
+
+    changed = []
+    source = newspaper.content
+    rebuild = False
+    for index, revision in enumerate(revisions):
+        if index in dropped:
+            rebuild = True
+            continue
+        if rebuild:
+            revision.delta = make_delta(source, texts[index])
+            changed.append(revision)
+            rebuild = False
+        source = texts[index]
+    with transaction.atomic():
+        NewspaperRevision.objects.bulk_update(changed, ["delta"])
+        NewspaperRevision.objects.filter(
+            pk__in=[revisions[index].pk for index in dropped]
+        ).delete()
+    return len(dropped)
+
+
+def compact_all(keep, retention_days=0, collapse_seconds=0):
+    retain_before = (
+        timezone.now() - timedelta(days=retention_days)
+        if retention_days
+        else None
+    )
+    newspaper_ids = (
+        NewspaperRevision.objects.values("newspaper")
+        .annotate(revisions=Count("pk"))
+        .filter(revisions__gt=keep)
+        .values_list("newspaper", flat=True)
+    )
+    removed = newspapers = 0
+    for newspaper in Newspaper.objects.filter(pk__in=newspaper_ids).iterator(
+        chunk_size=100
+    ):
+        count = compact(newspaper, keep, retain_before, collapse_seconds)
+        if count:
+            removed += count
+            newspapers += 1
+    return removed, newspapers
@@ -0,0 +1,275 @@
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "pulse_newspaper_fts"
+TITLE_TRIGRAM_TABLE = "pulse_newspaper_title_trgm"
+TOPIC_TRIGRAM_TABLE = "pulse_topic_name_trgm"
+TRIGRAM_TABLES = {
+    "newspaper": (TITLE_TRIGRAM_TABLE, "pulse_newspaper", "title"),
+    "topic": (TOPIC_TRIGRAM_TABLE, "pulse_topic", "name"),
+}
+SIMILARITY_THRESHOLD = 0.3
+SUGGESTION_CANDIDATES = 50
+
+SQLITE_CREATE_SQL = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} "
+    f"USING fts5(title, content, content='')",
+]
+POSTGRES_CREATE_SQL = [
+    f"CREATE TABLE {FTS_TABLE} ("
+    "newspaper_id bigint PRIMARY KEY REFERENCES pulse_newspaper (id) "
+    "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    f"CREATE INDEX {FTS_TABLE}_document_idx ON {FTS_TABLE} "
+    "USING gin (document)",
+]
+POSTGRES_DOCUMENT_SQL = (
+    "setweight(to_tsvector('simple', %s), 'A') || "
+    "to_tsvector('simple', %s)"
+)
+
+
+def create_index(schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        statements = POSTGRES_CREATE_SQL
+    else:
+        statements = SQLITE_CREATE_SQL
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_index(schema_editor):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def _terms(query):
+    return re.findall(r"\w+", query.lower())
+
+
+def index_newspaper(pk, title, content, previous=None):
+    if previous == (title, content):
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (newspaper_id, document) "
+                f"VALUES (%s, {POSTGRES_DOCUMENT_SQL}) "
+                "ON CONFLICT (newspaper_id) "
+                "DO UPDATE SET document = EXCLUDED.document",
+                [pk, title, content],
+            )
+            return
+        # Contentless FTS5 tables can only forget a row when they are given
+        # the exact values that were indexed.
+        if previous is not None:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, content)"
+                " VALUES ('delete', %s, %s, %s)",
+                [pk, *previous],
+            )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, content) "
+            "VALUES (%s, %s, %s)",
+            [pk, title, content],
+        )
+
+
+def unindex_newspaper(pk, title, content):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE newspaper_id = %s", [pk]
+            )
+        else:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, title, content)"
+                " VALUES ('delete', %s, %s, %s)",
+                [pk, title, content],
+            )
+
+
+def bulk_index_newspapers(rows):
+    rows = list(rows)
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (newspaper_id, document) "
+                f"VALUES (%s, {POSTGRES_DOCUMENT_SQL}) "
+                "ON CONFLICT (newspaper_id) "
+                "DO UPDATE SET document = EXCLUDED.document",
+                rows,
+            )
+            return
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, content) "
+            "VALUES (%s, %s, %s)",
+            rows,
+        )
+    bulk_index_trigrams("newspaper", ((pk, title) for pk, title, _ in rows))
+
+
+def matching_ids(query, column="content"):
+    terms = _terms(query)
+    if not terms:
+        return None
+    if connection.vendor == "postgresql":
+        weights = {"title": ":*A", "content": ":*D"}[column]
+        return RawSQL(
+            f"SELECT newspaper_id FROM {FTS_TABLE} "
+            "WHERE document @@ to_tsquery('simple', %s)",
+            [" & ".join(term + weights for term in terms)],
+        )
+    match = " ".join(f'"{term}"*' for term in terms)
+    return RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {column} MATCH %s", [match]
+    )
+
+
+def filter_content(queryset, query):
+    ids = matching_ids(query)
+    if ids is None:
+        return queryset
+    return queryset.filter(pk__in=ids)
+
+
+def create_trigram_indexes(schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # Django compiles icontains to UPPER(col::text) LIKE UPPER(...), so
+        # the index is built on that expression to be usable as is.
+        for _, table, column in TRIGRAM_TABLES.values():
+            schema_editor.execute(
+                f"CREATE INDEX {table}_{column}_trgm_idx ON {table} "
+                f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+            )
+        return
+    for trigram_table, table, column in TRIGRAM_TABLES.values():
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {trigram_table} "
+            f"USING fts5({column}, tokenize='trigram', content='')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {trigram_table} (rowid, {column}) "
+            f"SELECT id, {column} FROM {table}"
+        )
+
+
+def drop_trigram_indexes(schema_editor):
+    for trigram_table, table, column in TRIGRAM_TABLES.values():
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(
+                f"DROP INDEX IF EXISTS {table}_{column}_trgm_idx"
+            )
+        else:
+            schema_editor.execute(f"DROP TABLE IF EXISTS {trigram_table}")
+
+
+def index_trigrams(kind, pk, value, previous=None):
+    if connection.vendor == "postgresql" or value == previous:
+        return
+    trigram_table, _, column = TRIGRAM_TABLES[kind]
+    with connection.cursor() as cursor:
+        if previous is not None:
+            cursor.execute(
+                f"INSERT INTO {trigram_table} ({trigram_table}, rowid, "
+                f"{column}) VALUES ('delete', %s, %s)",
+                [pk, previous],
+            )
+        cursor.execute(
+            f"INSERT INTO {trigram_table} (rowid, {column}) VALUES (%s, %s)",
+            [pk, value],
+        )
+
+
+def bulk_index_trigrams(kind, rows):
+    if connection.vendor == "postgresql":
+        return
+    trigram_table, _, column = TRIGRAM_TABLES[kind]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {trigram_table} (rowid, {column}) VALUES (%s, %s)",
+            list(rows),
+        )
+
+
+def unindex_trigrams(kind, pk, value):
+    if connection.vendor == "postgresql":
+        return
+    trigram_table, _, column = TRIGRAM_TABLES[kind]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {trigram_table} ({trigram_table}, rowid, {column}) "
+            "VALUES ('delete', %s, %s)",
+            [pk, value],
+        )
+
+
+def filter_substring(queryset, field, query, kind="newspaper"):
+    lookup = {f"{field}__icontains": query}
+    if connection.vendor == "postgresql" or len(query.strip()) < 3:
+        return queryset.filter(**lookup)
+    # A quoted FTS5 trigram phrase narrows the rows through the index; the
+    # icontains re-check keeps LIKE semantics for the few candidates left.
+    trigram_table, _, column = TRIGRAM_TABLES[kind]
+    phrase = '"' + query.replace('"', '""') + '"'
+    candidates = RawSQL(
+        f"SELECT rowid FROM {trigram_table} WHERE {column} MATCH %s",
+        [phrase],
+    )
+    return queryset.filter(pk__in=candidates, **lookup)
+
+
+def trigrams(text):
+    grams = set()
+    for word in re.findall(r"\w+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(first, second):
+    first, second = trigrams(first), trigrams(second)
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def suggest(query, kind="newspaper", limit=3):
+    trigram_table, table, column = TRIGRAM_TABLES[kind]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # The % operator uses pg_trgm.similarity_threshold, whose
+            # default of 0.3 matches SIMILARITY_THRESHOLD.
+            cursor.execute(
+                f"SELECT id, {column} FROM {table} "
+                f"WHERE UPPER({column}::text) %% UPPER(%s) "
+                f"ORDER BY similarity(UPPER({column}::text), UPPER(%s)) DESC "
+                "LIMIT %s",
+                [query, query, limit],
+            )
+            return cursor.fetchall()
+        # FTS5 trigrams never span the padding, so only full trigrams
+        # inside words can be looked up.
+        grams = {gram.strip() for gram in trigrams(query)}
+        grams = sorted(gram for gram in grams if len(gram) == 3)
+        if not grams:
+            return []
+        match = " OR ".join(f'"{gram}"' for gram in grams)
+        cursor.execute(
+            f"SELECT t.id, t.{column} FROM {table} t JOIN ("
+            f"SELECT rowid FROM {trigram_table} WHERE {trigram_table} "
+            "MATCH %s ORDER BY rank LIMIT %s) m ON m.rowid = t.id",
+            [match, SUGGESTION_CANDIDATES],
+        )
+        rows = cursor.fetchall()
+    scored = sorted(
+        ((similarity(query, value), pk, value) for pk, value in rows),
+        key=lambda row: (-row[0], row[1]),
+    )
+    return [
+        (pk, value)
+        for score, pk, value in scored[:limit]
+        if score >= SIMILARITY_THRESHOLD
+    ]
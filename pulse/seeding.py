@@ -0,0 +1,249 @@
+import itertools
+import math
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from pulse import search
+from pulse.models import Topic, Redactor, Newspaper
+
+Publishers = Newspaper.publishers.through
+Topics = Newspaper.topic.through
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 5000
+SYLLABLES = (
+    "ba", "ca", "da", "fe", "ga", "hi", "jo", "ka", "li", "mo", "na", "no",
+    "pa", "qui", "ra", "re", "sa", "si", "ta", "to", "u", "ve", "wa", "xe",
+    "yo", "za", "an", "el", "in", "or", "um", "est", "ion", "ter", "lar",
+)
+VOCABULARY_SIZE = 5000
+# Word frequencies in prose, topic popularity and the share of articles
+# written by each redactor all follow power laws.
+WORD_EXPONENT = 1.0
+TOPIC_EXPONENT = 1.1
+PUBLISHER_EXPONENT = 0.8
+TOPICS_PER_ARTICLE = ((1, 70), (2, 24), (3, 6))
+PUBLISHERS_PER_ARTICLE = ((1, 62), (2, 25), (3, 9), (4, 4))
+# Log-normal article lengths with a median of about 400 words.
+LENGTH_MU = math.log(400)
+LENGTH_SIGMA = 0.6
+MIN_WORDS = 40
+MAX_WORDS = 5000
+TITLE_WORDS = (3, 10)
+SENTENCE_WORDS = (6, 24)
+DAYS = 3650
+
+
+def zipf_cum_weights(count, exponent):
+    return list(
+        itertools.accumulate(
+            1 / rank**exponent for rank in range(1, count + 1)
+        )
+    )
+
+
+def vocabulary(seed, size=VOCABULARY_SIZE):
+    rng = random.Random(f"{seed}:vocabulary")
+    words = set()
+    while len(words) < size:
+        words.add(
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+        )
+    # Sorting first keeps the order independent of string hashing.
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+class Plan:
+    def __init__(self, seed, topic_ids, redactor_ids, end_date, days=DAYS):
+        self.seed = seed
+        self.topic_ids = topic_ids
+        self.redactor_ids = redactor_ids
+        self.end_date = end_date
+        self.days = days
+        self.words = vocabulary(seed)
+        self.word_weights = zipf_cum_weights(len(self.words), WORD_EXPONENT)
+        self.topic_weights = zipf_cum_weights(len(topic_ids), TOPIC_EXPONENT)
+        self.redactor_weights = zipf_cum_weights(
+            len(redactor_ids), PUBLISHER_EXPONENT
+        )
+
+
+def _distinct(rng, population, cum_weights, count):
+    count = min(count, len(population))
+    chosen = set()
+    while len(chosen) < count:
+        chosen.add(rng.choices(population, cum_weights=cum_weights)[0])
+    return sorted(chosen)
+
+
+def _sentence(rng, plan, length):
+    words = rng.choices(plan.words, cum_weights=plan.word_weights, k=length)
+    return " ".join(words).capitalize() + "."
+
+
+def _content(rng, plan):
+    length = round(rng.lognormvariate(LENGTH_MU, LENGTH_SIGMA))
+    length = max(MIN_WORDS, min(MAX_WORDS, length))
+    sentences = []
+    while length > 0:
+        size = min(length, rng.randint(*SENTENCE_WORDS))
+        sentences.append(_sentence(rng, plan, size))
+        length -= size
+    paragraphs = [
+        " ".join(sentences[start:start + 5])
+        for start in range(0, len(sentences), 5)
+    ]
+    return "\n\n".join(paragraphs)
+
+
+def generate_chunk(plan, number, size):
+    # Every chunk has its own generator, so the data does not depend on how
+    # chunks are spread across worker processes.
+    rng = random.Random(f"{plan.seed}:chunk:{number}")
+    topic_counts, topic_count_weights = zip(*TOPICS_PER_ARTICLE)
+    publisher_counts, publisher_count_weights = zip(*PUBLISHERS_PER_ARTICLE)
+    rows = []
+    for _ in range(size):
+        title = _sentence(rng, plan, rng.randint(*TITLE_WORDS))[:-1]
+        published_date = plan.end_date - timedelta(
+            days=rng.randrange(plan.days)
+        )
+        topics = _distinct(
+            rng,
+            plan.topic_ids,
+            plan.topic_weights,
+            rng.choices(topic_counts, topic_count_weights)[0],
+        )
+        publishers = _distinct(
+            rng,
+            plan.redactor_ids,
+            plan.redactor_weights,
+            rng.choices(publisher_counts, publisher_count_weights)[0],
+        )
+        rows.append(
+            (title, _content(rng, plan), published_date, topics, publishers)
+        )
+    return rows
+
+
+def write_chunk(rows):
+    newspapers = [
+        Newspaper(title=title, content=content, published_date=day)
+        for title, content, day, _, _ in rows
+    ]
+    with transaction.atomic():
+        Newspaper.objects.bulk_create(newspapers, batch_size=BATCH_SIZE)
+        Topics.objects.bulk_create(
+            (
+                Topics(newspaper_id=newspaper.pk, topic_id=topic_id)
+                for newspaper, row in zip(newspapers, rows)
+                for topic_id in row[3]
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Publishers.objects.bulk_create(
+            (
+                Publishers(newspaper_id=newspaper.pk, redactor_id=redactor_id)
+                for newspaper, row in zip(newspapers, rows)
+                for redactor_id in row[4]
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        search.bulk_index_newspapers(
+            (newspaper.pk, row[0], row[1])
+            for newspaper, row in zip(newspapers, rows)
+        )
+    return len(newspapers)
+
+
+def ensure_topics(seed, count):
+    rng = random.Random(f"{seed}:topics")
+    words = vocabulary(seed)
+    names = []
+    seen = set()
+    while len(names) < count:
+        name = " ".join(
+            rng.choice(words) for _ in range(rng.randint(1, 2))
+        ).title()
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    existing = dict(
+        Topic.objects.filter(name__in=names).values_list("name", "pk")
+    )
+    created = Topic.objects.bulk_create(
+        (Topic(name=name) for name in names if name not in existing),
+        batch_size=BATCH_SIZE,
+    )
+    search.bulk_index_trigrams(
+        "topic", ((topic.pk, topic.name) for topic in created)
+    )
+    existing.update((topic.name, topic.pk) for topic in created)
+    return [existing[name] for name in names]
+
+
+def ensure_redactors(seed, count):
+    rng = random.Random(f"{seed}:redactors")
+    words = vocabulary(seed)
+    usernames = [f"seed{seed}-{number:06d}" for number in range(count)]
+    existing = dict(
+        Redactor.objects.filter(username__in=usernames).values_list(
+            "username", "pk"
+        )
+    )
+    password = make_password(None)
+    redactors = []
+    for username in usernames:
+        first_name, last_name = rng.sample(words, 2)
+        experience = min(45, int(rng.expovariate(1 / 8)))
+        if username in existing:
+            continue
+        redactors.append(
+            Redactor(
+                username=username,
+                password=password,
+                first_name=first_name.title(),
+                last_name=last_name.title(),
+                years_of_experience=experience,
+            )
+        )
+    created = Redactor.objects.bulk_create(redactors, batch_size=BATCH_SIZE)
+    existing.update((redactor.username, redactor.pk) for redactor in created)
+    return [existing[username] for username in usernames]
+
+
+def prepare(seed, topics, redactors, end_date=None, days=DAYS):
+    with transaction.atomic():
+        topic_ids = ensure_topics(seed, topics)
+        redactor_ids = ensure_redactors(seed, redactors)
+    return Plan(
+        seed, topic_ids, redactor_ids, end_date or date.today(), days
+    )
+
+
+def chunks(count, size=CHUNK_SIZE):
+    return [
+        (number, min(size, count - start))
+        for number, start in enumerate(range(0, count, size))
+    ]
+
+
+_plan = None
+
+
+def init_worker(plan):
+    global _plan
+    _plan = plan
+
+
+def build_chunk(chunk):
+    return generate_chunk(_plan, *chunk)
+
+
+def seed_chunk(chunk):
+    return write_chunk(generate_chunk(_plan, *chunk))
@@ -0,0 +1,424 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from pulse import (
+    archive,
+    compression,
+    dedup,
+    edge,
+    events,
+    feeds,
+    logs,
+    prerender,
+    productivity,
+    related,
+    revisions,
+    search,
+    sitemaps,
+)
+from pulse.models import Topic, Redactor, Newspaper, Job, AuditEntry
+from pulse.versions import NEWSPAPER_LIST, bump_version
+
+
+@receiver(pre_save, sender=Newspaper)
+def remember_indexed_text(sender, instance, **kwargs):
+    instance._indexed_text = None
+    instance._previous_published_date = None
+    if instance.pk is None:
+        return
+    row = (
+        Newspaper.objects.filter(pk=instance.pk)
+        .values_list("title", "content", "content_blob", "published_date")
+        .first()
+    )
+    if row is not None:
+        title, content, blob, published_date = row
+        content = compression.stored_text(content, blob)
+        instance._indexed_text = (title, content)
+        instance._previous_published_date = published_date
+
+
+@receiver(post_save, sender=Newspaper)
+def index_newspaper(sender, instance, **kwargs):
+    previous = getattr(instance, "_indexed_text", None)
+    search.index_newspaper(
+        instance.pk, instance.title, instance.content, previous=previous
+    )
+    search.index_trigrams(
+        "newspaper",
+        instance.pk,
+        instance.title,
+        previous=previous[0] if previous else None,
+    )
+
+
+@receiver(post_save, sender=Newspaper)
+def record_revision(sender, instance, created, raw=False, **kwargs):
+    previous = getattr(instance, "_indexed_text", None)
+    if created or raw or previous is None:
+        return
+    revisions.record_revision(
+        instance,
+        (*previous, instance._previous_published_date),
+        edited_by=getattr(instance, "_edited_by", None),
+    )
+
+
+@receiver(post_delete, sender=Newspaper)
+def unindex_newspaper(sender, instance, **kwargs):
+    search.unindex_newspaper(instance.pk, instance.title, instance.content)
+    search.unindex_trigrams("newspaper", instance.pk, instance.title)
+
+
+@receiver(pre_save, sender=Topic)
+def remember_topic_name(sender, instance, **kwargs):
+    instance._indexed_name = None
+    if instance.pk is not None:
+        instance._indexed_name = (
+            Topic.objects.filter(pk=instance.pk)
+            .values_list("name", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Topic)
+def index_topic(sender, instance, **kwargs):
+    search.index_trigrams(
+        "topic",
+        instance.pk,
+        instance.name,
+        previous=getattr(instance, "_indexed_name", None),
+    )
+
+
+@receiver(post_delete, sender=Topic)
+def unindex_topic(sender, instance, **kwargs):
+    search.unindex_trigrams("topic", instance.pk, instance.name)
+
+
+def _invalidate_feeds_on_commit(newspaper):
+    topic_ids = list(newspaper.topic.values_list("pk", flat=True))
+    redactor_ids = list(newspaper.publishers.values_list("pk", flat=True))
+    transaction.on_commit(
+        lambda: feeds.invalidate_feeds(topic_ids, redactor_ids)
+    )
+
+
+@receiver(post_save, sender=Newspaper)
+def invalidate_feeds_on_save(sender, instance, **kwargs):
+    _invalidate_feeds_on_commit(instance)
+
+
+@receiver(pre_delete, sender=Newspaper)
+def invalidate_feeds_on_delete(sender, instance, **kwargs):
+    _invalidate_feeds_on_commit(instance)
+
+
+def _invalidate_relation_feeds(kind, field, instance, action, reverse, pk_set):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        related_ids = [instance.pk]
+    elif action == "pre_clear":
+        related_ids = list(
+            getattr(instance, field).values_list("pk", flat=True)
+        )
+    else:
+        related_ids = list(pk_set)
+    kwargs = {f"{kind}_ids": related_ids}
+    transaction.on_commit(lambda: feeds.invalidate_feeds(**kwargs))
+
+
+@receiver(m2m_changed, sender=Newspaper.topic.through)
+def invalidate_topic_feeds(sender, instance, action, reverse, pk_set, **kw):
+    _invalidate_relation_feeds(
+        "topic", "topic", instance, action, reverse, pk_set
+    )
+
+
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def invalidate_redactor_feeds(
+    sender, instance, action, reverse, pk_set, **kw
+):
+    _invalidate_relation_feeds(
+        "redactor", "publishers", instance, action, reverse, pk_set
+    )
+
+
+@receiver(post_save, sender=Topic)
+def invalidate_feeds_on_topic_save(sender, instance, created, **kwargs):
+    if not created:
+        transaction.on_commit(
+            lambda: feeds.invalidate_feeds(topic_ids=[instance.pk])
+        )
+
+
+@receiver(post_save, sender=Redactor)
+def invalidate_feeds_on_redactor_save(sender, instance, created, **kwargs):
+    # Logins save last_login and must not churn the feed cache.
+    if not created and kwargs["update_fields"] != {"last_login"}:
+        transaction.on_commit(
+            lambda: feeds.bump_feed_version("redactors", instance.pk)
+        )
+
+
+@receiver(post_save, sender=Newspaper)
+def mark_sitemap_stale_on_save(sender, instance, created, **kwargs):
+    update_fields = kwargs["update_fields"]
+    if created or update_fields is None or "published_date" in update_fields:
+        sitemaps.mark_stale(instance.pk)
+
+
+@receiver(post_delete, sender=Newspaper)
+def mark_sitemap_stale_on_delete(sender, instance, **kwargs):
+    sitemaps.mark_stale(instance.pk)
+
+
+@receiver(post_save, sender=Newspaper)
+def check_duplicates(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_indexed_text", None)
+    if created or previous is None or previous[1] != instance.content:
+        dedup.check_newspaper(instance)
+
+
+def _refresh_related(pk):
+    queued = Job.objects.filter(
+        task=related.refresh_newspaper.task,
+        args=[pk],
+        status=Job.Status.QUEUED,
+    )
+    if not queued.exists():
+        related.refresh_newspaper.delay(pk)
+
+
+@receiver(post_save, sender=Newspaper)
+def refresh_related_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_indexed_text", None)
+    if created or previous != (instance.title, instance.content):
+        pk = instance.pk
+        transaction.on_commit(lambda: _refresh_related(pk))
+
+
+@receiver(m2m_changed, sender=Newspaper.topic.through)
+def refresh_related_on_topic_change(
+    sender, instance, action, reverse, pk_set, **kw
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    newspaper_ids = list(pk_set or ()) if reverse else [instance.pk]
+    for pk in newspaper_ids:
+        transaction.on_commit(lambda pk=pk: _refresh_related(pk))
+
+
+def _relation_pairs(instance, field, reverse, pk_set):
+    if reverse:
+        return [(pk, instance.pk) for pk in pk_set]
+    if pk_set is None:
+        pk_set = getattr(instance, field).values_list("pk", flat=True)
+    return [(instance.pk, pk) for pk in pk_set]
+
+
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def update_output_on_publishers_change(
+    sender, instance, action, reverse, pk_set, **kw
+):
+    if action == "pre_clear":
+        if reverse:
+            pk_set = instance.newspaper_set.values_list("pk", flat=True)
+        instance._cleared_publications = [
+            (redactor_id, newspaper_id)
+            for newspaper_id, redactor_id in _relation_pairs(
+                instance, "publishers", reverse, pk_set
+            )
+        ]
+    elif action in ("post_add", "post_remove"):
+        pairs = [
+            (redactor_id, newspaper_id)
+            for newspaper_id, redactor_id in _relation_pairs(
+                instance, "publishers", reverse, pk_set
+            )
+        ]
+        sign = 1 if action == "post_add" else -1
+        productivity.apply(productivity.publication_deltas(pairs, sign))
+    elif action == "post_clear":
+        productivity.apply(
+            productivity.publication_deltas(
+                instance.__dict__.pop("_cleared_publications", ()), -1
+            )
+        )
+
+
+@receiver(m2m_changed, sender=Newspaper.topic.through)
+def update_output_on_topic_change(
+    sender, instance, action, reverse, pk_set, **kw
+):
+    if action == "pre_clear":
+        if reverse:
+            pk_set = instance.newspaper_set.values_list("pk", flat=True)
+        instance._cleared_topics = _relation_pairs(
+            instance, "topic", reverse, pk_set
+        )
+    elif action in ("post_add", "post_remove"):
+        pairs = _relation_pairs(instance, "topic", reverse, pk_set)
+        sign = 1 if action == "post_add" else -1
+        productivity.apply(productivity.topic_deltas(pairs, sign))
+    elif action == "post_clear":
+        productivity.apply(
+            productivity.topic_deltas(
+                instance.__dict__.pop("_cleared_topics", ()), -1
+            )
+        )
+
+
+@receiver(post_save, sender=Newspaper)
+def update_output_on_date_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_published_date", None)
+    current = sender._meta.get_field("published_date").to_python(
+        instance.published_date
+    )
+    if not created and previous and previous != current:
+        productivity.apply(
+            productivity.date_deltas(instance.pk, previous, current)
+        )
+
+
+@receiver(pre_delete, sender=Newspaper)
+def update_output_on_delete(sender, instance, **kwargs):
+    # Archived newspapers still count towards their redactors' output.
+    if archive.is_moving():
+        return
+    # Deleting a newspaper drops its publisher rows without m2m_changed.
+    redactor_ids = instance.publishers.values_list("pk", flat=True)
+    productivity.apply(
+        productivity.publication_deltas(
+            [(redactor_id, instance.pk) for redactor_id in redactor_ids], -1
+        )
+    )
+
+
+def _publish_event_on_commit(newspaper, kind):
+    transaction.on_commit(
+        lambda: events.publish(events.payload(newspaper, kind))
+    )
+
+
+@receiver(post_save, sender=Newspaper)
+def publish_event_on_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        _publish_event_on_commit(
+            instance, "created" if created else "updated"
+        )
+
+
+@receiver(m2m_changed, sender=Newspaper.topic.through)
+def publish_event_on_topic_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    # The create form saves topics after the row, so the "created" event
+    # is followed by an "updated" one carrying them.
+    if reverse or action not in ("post_add", "post_remove", "post_clear"):
+        return
+    _publish_event_on_commit(instance, "updated")
+
+
+@receiver([post_save, post_delete], sender=Newspaper)
+@receiver([post_save, post_delete], sender=Topic)
+@receiver(m2m_changed, sender=Newspaper.topic.through)
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+@receiver(post_delete, sender=Redactor)
+def bump_newspaper_list_version(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(NEWSPAPER_LIST))
+
+
+@receiver([post_save, post_delete], sender=Newspaper)
+@receiver([post_save, post_delete], sender=Topic)
+@receiver([post_save, post_delete], sender=Redactor)
+def purge_index(sender, raw=False, **kwargs):
+    # Logins only touch last_login, which the index page does not show.
+    if raw or kwargs.get("update_fields") == {"last_login"}:
+        return
+    transaction.on_commit(lambda: edge.purge([edge.INDEX_TAG]))
+
+
+@receiver(post_save, sender=Newspaper)
+@receiver(pre_delete, sender=Newspaper)
+def mark_prerendered_newspaper(sender, instance, raw=False, **kwargs):
+    if not raw:
+        prerender.mark_newspapers([instance.pk])
+
+
+@receiver(m2m_changed, sender=Newspaper.topic.through)
+def mark_prerendered_topics(sender, instance, action, reverse, pk_set, **kw):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if action == "pre_clear" and reverse:
+        pk_set = instance.newspaper_set.values_list("pk", flat=True)
+    pairs = _relation_pairs(instance, "topic", reverse, pk_set)
+    prerender.mark_newspapers({newspaper_id for newspaper_id, _ in pairs})
+    prerender.mark_topics({topic_id for _, topic_id in pairs})
+
+
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def mark_prerendered_publishers(
+    sender, instance, action, reverse, pk_set, **kw
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if action == "pre_clear" and reverse:
+        pk_set = instance.newspaper_set.values_list("pk", flat=True)
+    pairs = _relation_pairs(instance, "publishers", reverse, pk_set)
+    prerender.mark_newspapers({newspaper_id for newspaper_id, _ in pairs})
+
+
+@receiver(post_save, sender=Topic)
+def mark_prerendered_topic_on_save(
+    sender, instance, created, raw=False, **kwargs
+):
+    if not raw:
+        prerender.mark_topics([instance.pk], with_newspapers=not created)
+
+
+@receiver(pre_delete, sender=Topic)
+def mark_prerendered_topic_on_delete(sender, instance, **kwargs):
+    prerender.mark_topics([instance.pk], with_newspapers=True)
+
+
+@receiver(post_save, sender=Redactor)
+def mark_prerendered_redactor_on_save(
+    sender, instance, created, raw=False, **kwargs
+):
+    # Logins only touch last_login, which no page shows.
+    if raw or created or kwargs["update_fields"] == {"last_login"}:
+        return
+    prerender.mark_redactor(instance.pk)
+
+
+@receiver(pre_delete, sender=Redactor)
+def mark_prerendered_redactor_on_delete(sender, instance, **kwargs):
+    prerender.mark_redactor(instance.pk)
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_save, sender=Redactor)
+@receiver(post_save, sender=Newspaper)
+def audit_save(sender, instance, created, raw=False, **kwargs):
+    if raw or kwargs["update_fields"] == {"last_login"}:
+        return
+    action = AuditEntry.Action.CREATE if created else AuditEntry.Action.UPDATE
+    logs.audit(action, instance)
+
+
+@receiver(post_delete, sender=Topic)
+@receiver(post_delete, sender=Redactor)
+@receiver(post_delete, sender=Newspaper)
+def audit_delete(sender, instance, **kwargs):
+    if sender is Newspaper and archive.is_moving():
+        return
+    logs.audit(AuditEntry.Action.DELETE, instance)
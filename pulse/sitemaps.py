@@ -0,0 +1,175 @@
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+
+from pulse.models import Newspaper, SitemapShard
+
+SHARD_SIZE = 50000
+STREAM_CHUNK_SIZE = 2000
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+SITEMAP_CONTENT_TYPE = "application/xml; charset=utf-8"
+
+
+def shard_for(pk):
+    return (pk - 1) // SHARD_SIZE
+
+
+def shard_bounds(number):
+    return number * SHARD_SIZE, (number + 1) * SHARD_SIZE
+
+
+def shard_count():
+    max_id = Newspaper.objects.aggregate(max_id=Max("id"))["max_id"]
+    return shard_for(max_id) + 1 if max_id else 0
+
+
+def mark_stale(pk):
+    SitemapShard.objects.filter(number=shard_for(pk)).update(stale=True)
+
+
+def _absolute(path):
+    return escape(settings.PULSE_SITE_URL.rstrip("/") + path)
+
+
+def iter_shard_xml(number):
+    low, high = shard_bounds(number)
+    rows = (
+        Newspaper.objects.filter(id__gt=low, id__lte=high)
+        .order_by("id")
+        .values_list("id", "published_date")
+        .iterator(chunk_size=STREAM_CHUNK_SIZE)
+    )
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+    )
+    # Reversing once and splicing ids in keeps 50k URLs cheap to build.
+    marker = "987654321"
+    prefix, suffix = _absolute(
+        reverse("pulse:newspaper-detail", args=[marker])
+    ).split(marker)
+    chunk = []
+    for pk, published_date in rows:
+        chunk.append(
+            f"<url><loc>{prefix}{pk}{suffix}</loc>"
+            f"<lastmod>{published_date.isoformat()}</lastmod></url>\n"
+        )
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    yield "".join(chunk)
+    yield "</urlset>\n"
+
+
+def _shard_cache_key(number):
+    return f"pulse:sitemap:shard:{number}"
+
+
+def _shard_path(number):
+    return os.path.join(settings.PULSE_SITEMAP_ROOT, f"sitemap-{number}.xml")
+
+
+def _write_file(path, chunks):
+    # mkstemp creates the file 0600; the proxy serving it may run as
+    # another user.
+    os.makedirs(settings.PULSE_SITEMAP_ROOT, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(
+        dir=settings.PULSE_SITEMAP_ROOT, suffix=".tmp"
+    )
+    with os.fdopen(handle, "w", encoding="utf-8") as output:
+        for chunk in chunks:
+            output.write(chunk)
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, path)
+
+
+def generate_shard(number):
+    low, high = shard_bounds(number)
+    url_count = Newspaper.objects.filter(id__gt=low, id__lte=high).count()
+    if settings.PULSE_SITEMAP_ROOT:
+        _write_file(_shard_path(number), iter_shard_xml(number))
+        content = None
+    else:
+        content = "".join(iter_shard_xml(number)).encode("utf-8")
+        cache.set(_shard_cache_key(number), content, None)
+    SitemapShard.objects.update_or_create(
+        number=number,
+        defaults={
+            "url_count": url_count,
+            "stale": False,
+            "generated_at": timezone.now(),
+        },
+    )
+    return content
+
+
+def _is_current(shard):
+    if shard is None or shard.stale:
+        return False
+    if settings.PULSE_SITEMAP_ROOT:
+        return os.path.exists(_shard_path(shard.number))
+    return _shard_cache_key(shard.number) in cache
+
+
+def refresh_shards(force=False):
+    shards = SitemapShard.objects.in_bulk()
+    regenerated = []
+    for number in range(shard_count()):
+        if force or not _is_current(shards.get(number)):
+            generate_shard(number)
+            regenerated.append(number)
+    if settings.PULSE_SITEMAP_ROOT:
+        _write_file(
+            os.path.join(settings.PULSE_SITEMAP_ROOT, "sitemap.xml"),
+            [render_index()],
+        )
+    return regenerated
+
+
+def render_index():
+    shards = SitemapShard.objects.in_bulk()
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n',
+    ]
+    for number in range(shard_count()):
+        location = _absolute(reverse("pulse:sitemap-shard", args=[number]))
+        lines.append(f"<sitemap><loc>{location}</loc>")
+        shard = shards.get(number)
+        if shard is not None and shard.generated_at:
+            lines.append(
+                f"<lastmod>{shard.generated_at.date().isoformat()}</lastmod>"
+            )
+        lines.append("</sitemap>\n")
+    lines.append("</sitemapindex>\n")
+    return "".join(lines)
+
+
+def sitemap_index(request):
+    return HttpResponse(render_index(), content_type=SITEMAP_CONTENT_TYPE)
+
+
+def sitemap_shard(request, number):
+    if number >= shard_count():
+        raise Http404("No such sitemap shard")
+    shard = SitemapShard.objects.filter(number=number).first()
+    if settings.PULSE_SITEMAP_ROOT:
+        if not _is_current(shard):
+            generate_shard(number)
+        return FileResponse(
+            open(_shard_path(number), "rb"),
+            content_type=SITEMAP_CONTENT_TYPE,
+        )
+    content = None
+    if shard is not None and not shard.stale:
+        content = cache.get(_shard_cache_key(number))
+    if content is None:
+        content = generate_shard(number)
+    return HttpResponse(content, content_type=SITEMAP_CONTENT_TYPE)
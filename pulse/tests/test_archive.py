@@ -0,0 +1,160 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from pulse import archive, productivity
+from pulse.models import (
+    AuditEntry,
+    DailyPageViews,
+    Topic,
+    Redactor,
+    Newspaper,
+    NewspaperArchive,
+)
+
+
+class ArchiveNewspapersTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.topic = Topic.objects.create(name="History")
+        self.redactor = Redactor.objects.create(username="archivist")
+        self.old = Newspaper.objects.create(
+            title="Old News",
+            content="Old content",
+            published_date=datetime.date(2015, 3, 1),
+        )
+        self.old.topic.add(self.topic)
+        self.old.publishers.add(self.redactor)
+        self.recent = Newspaper.objects.create(
+            title="Recent News",
+            content="Recent content",
+            published_date=datetime.date.today(),
+        )
+
+    def test_old_newspapers_are_moved(self):
+        moved = archive.archive_newspapers(before=datetime.date(2020, 1, 1))
+        self.assertEqual(moved, 1)
+        self.assertFalse(Newspaper.objects.filter(pk=self.old.pk).exists())
+        archived = NewspaperArchive.objects.get(pk=self.old.pk)
+        self.assertEqual(archived.title, "Old News")
+        self.assertEqual(list(archived.topic.all()), [self.topic])
+        self.assertEqual(list(archived.publishers.all()), [self.redactor])
+        self.assertTrue(Newspaper.objects.filter(pk=self.recent.pk).exists())
+
+    def test_archiving_keeps_history_and_output(self):
+        self.old.content = "Revised content"
+        self.old.save()
+        DailyPageViews.objects.create(
+            newspaper=self.old, date=datetime.date(2024, 5, 1), views=7
+        )
+        copy = Newspaper.objects.create(
+            title="Copy",
+            content="Revised content",
+            published_date="2024-01-01",
+        )
+        self.assertEqual(copy.duplicate_of_id, self.old.pk)
+        AuditEntry.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            archive.archive_newspapers(before=datetime.date(2020, 1, 1))
+
+        history = NewspaperArchive.objects.get(pk=self.old.pk).history
+        self.assertEqual(
+            [revision[0] for revision in history["revisions"]], ["Old News"]
+        )
+        self.assertEqual(history["views"], [["2024-05-01", 7]])
+        self.assertEqual(history["duplicates"], [copy.pk])
+        self.assertFalse(
+            AuditEntry.objects.filter(action=AuditEntry.Action.DELETE)
+        )
+        self.redactor.refresh_from_db()
+        self.assertEqual(self.redactor.article_count, 1)
+        productivity.rebuild()
+        self.redactor.refresh_from_db()
+        self.assertEqual(self.redactor.article_count, 1)
+
+    def test_command_uses_cutoff(self):
+        out = StringIO()
+        call_command("archive_newspapers", stdout=out)
+        self.assertIn("Archived 1 newspaper(s).", out.getvalue())
+
+    def test_should_search_archive(self):
+        archive.archive_newspapers(before=datetime.date(2020, 1, 1))
+        self.assertTrue(
+            archive.should_search_archive(
+                {"published_date": datetime.date(2015, 3, 1)}
+            )
+        )
+        self.assertFalse(
+            archive.should_search_archive(
+                {"published_date": datetime.date.today()}
+            )
+        )
+        self.assertFalse(archive.should_search_archive({}))
+        self.assertTrue(archive.should_search_archive({"include_archive": 1}))
+
+
+class ArchiveViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+        self.old = Newspaper.objects.create(
+            title="Archived Story",
+            content="Old content",
+            published_date=datetime.date(2015, 3, 1),
+        )
+        Newspaper.objects.create(
+            title="Backdated Story",
+            content="Old content",
+            published_date=datetime.date(2015, 3, 1),
+        )
+        archive.archive_newspapers(before=datetime.date(2015, 3, 2))
+        Newspaper.objects.create(
+            title="Late Story",
+            content="Old content",
+            published_date=datetime.date(2015, 3, 1),
+        )
+
+    def test_unfiltered_list_skips_archive(self):
+        response = self.client.get(reverse("pulse:newspapers"))
+        titles = [n.title for n in response.context["newspaper_list"]]
+        self.assertEqual(titles, ["Late Story"])
+
+    def test_date_filter_reaches_archive(self):
+        response = self.client.get(
+            reverse("pulse:newspapers"), {"published_date": "2015-03-01"}
+        )
+        titles = [n.title for n in response.context["newspaper_list"]]
+        self.assertEqual(
+            titles, ["Archived Story", "Backdated Story", "Late Story"]
+        )
+        self.assertContains(response, "Archived")
+
+    def test_include_archive_with_title_filter(self):
+        response = self.client.get(
+            reverse("pulse:newspapers"),
+            {"title": "archived", "include_archive": "on"},
+        )
+        titles = [n.title for n in response.context["newspaper_list"]]
+        self.assertEqual(titles, ["Archived Story"])
+
+    def test_detail_view_serves_archived_newspaper(self):
+        response = self.client.get(
+            reverse("pulse:newspaper-detail", args=[self.old.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["newspaper"].is_archived)
+
+    def test_detail_view_missing_newspaper(self):
+        response = self.client.get(
+            reverse("pulse:newspaper-detail", args=[9999])
+        )
+        self.assertEqual(response.status_code, 404)
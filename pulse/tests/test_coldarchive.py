@@ -0,0 +1,211 @@
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import archive, coldarchive, dedup, revisions, search
+from pulse.models import (
+    AuditEntry,
+    DailyPageViews,
+    Newspaper,
+    NewspaperArchive,
+    Redactor,
+    Topic,
+)
+
+
+class ColdArchiveTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(coldarchive.reset)
+        settings_override = override_settings(
+            PULSE_COLD_ARCHIVE_DIR=directory.name
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.topic = Topic.objects.create(name="History")
+        self.redactor = get_user_model().objects.create_user(
+            username="editor", password="12345"
+        )
+        self.old = Newspaper.objects.create(
+            title="Ancient news",
+            content="Pyramids finished ✓",
+            published_date="2001-02-03",
+        )
+        self.old.topic.add(self.topic)
+        self.old.publishers.add(self.redactor)
+        self.recent = Newspaper.objects.create(
+            title="Recent news", content="Content", published_date="2024-01-01"
+        )
+        self.warm = NewspaperArchive.objects.create(
+            id=10_000,
+            title="Warm archive",
+            content="Archived content",
+            published_date=date(2002, 1, 1),
+        )
+        self.warm.topic.add(self.topic)
+
+    def search(self, query):
+        return list(
+            search.filter_content(Newspaper.objects.all(), query).values_list(
+                "pk", flat=True
+            )
+        )
+
+    def export(self):
+        return coldarchive.export_newspapers(before=date(2010, 1, 1))
+
+    def test_export_moves_old_rows_out_of_the_database(self):
+        self.assertEqual(self.export(), 2)
+        self.assertEqual(list(Newspaper.objects.all()), [self.recent])
+        self.assertFalse(NewspaperArchive.objects.exists())
+        self.assertFalse(self.search("pyramids"))
+        self.assertEqual(
+            Redactor.objects.get(pk=self.redactor.pk).article_count, 0
+        )
+
+        newspaper = coldarchive.get(self.old.pk)
+        self.assertEqual(newspaper.title, "Ancient news")
+        self.assertEqual(newspaper.content, "Pyramids finished ✓")
+        self.assertEqual(newspaper.published_date, date(2001, 2, 3))
+        self.assertEqual(list(newspaper.topic.all()), [self.topic])
+        self.assertEqual(list(newspaper.publishers.all()), [self.redactor])
+        self.assertEqual(coldarchive.get(self.warm.pk).title, "Warm archive")
+        self.assertIsNone(coldarchive.get(self.recent.pk))
+        self.assertEqual(coldarchive.export_newspapers(date(2010, 1, 1)), 0)
+        self.assertEqual(len(coldarchive.segments()), 1)
+
+    def test_detail_view_serves_archived_articles(self):
+        self.export()
+        self.client.login(username="editor", password="12345")
+        response = self.client.get(
+            reverse("pulse:newspaper-detail", args=[self.old.pk])
+        )
+        self.assertContains(response, "Pyramids finished")
+        self.assertContains(response, "History")
+        self.assertNotContains(
+            response, reverse("pulse:newspaper-update", args=[self.old.pk])
+        )
+        response = self.client.get(
+            reverse("pulse:newspaper-detail", args=[99_999])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_restore_round_trip(self):
+        self.export()
+        self.assertEqual(
+            coldarchive.restore_newspapers([self.old.pk, 99_999]), 1
+        )
+        restored = Newspaper.objects.get(pk=self.old.pk)
+        self.assertEqual(restored.content, "Pyramids finished ✓")
+        self.assertEqual(list(restored.topic.all()), [self.topic])
+        self.assertEqual(list(restored.publishers.all()), [self.redactor])
+        self.assertEqual(self.search("pyramids"), [self.old.pk])
+        self.assertEqual(
+            Redactor.objects.get(pk=self.redactor.pk).article_count, 1
+        )
+        self.assertIsNone(coldarchive.get(self.old.pk))
+        self.assertEqual(coldarchive.live_ids(), [self.warm.pk])
+        self.assertEqual(coldarchive.restore_newspapers([self.old.pk]), 0)
+
+        # A later export of the same row supersedes the tombstone.
+        self.assertEqual(self.export(), 1)
+        self.assertEqual(coldarchive.get(self.old.pk).title, "Ancient news")
+
+    def test_archived_rows_are_restored_to_the_archive(self):
+        self.warm.history = {"views": [["2003-01-01", 4]]}
+        self.warm.save()
+        self.warm.publishers.add(self.redactor)
+        AuditEntry.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.export()
+        self.assertFalse(AuditEntry.objects.exists())
+        self.assertEqual(
+            Redactor.objects.get(pk=self.redactor.pk).article_count, 0
+        )
+
+        self.assertEqual(coldarchive.restore_newspapers([self.warm.pk]), 1)
+        self.assertFalse(Newspaper.objects.filter(pk=self.warm.pk).exists())
+        restored = NewspaperArchive.objects.get(pk=self.warm.pk)
+        self.assertEqual(restored.content, "Archived content")
+        self.assertEqual(restored.history["views"], [["2003-01-01", 4]])
+        self.assertEqual(list(restored.topic.all()), [self.topic])
+        self.assertEqual(list(restored.publishers.all()), [self.redactor])
+        self.assertFalse(self.search("archived"))
+        self.assertEqual(
+            Redactor.objects.get(pk=self.redactor.pk).article_count, 0
+        )
+
+    def test_restore_keeps_history_and_duplicate_links(self):
+        self.old.title = "Ancient news, revised"
+        self.old.content = "Pyramids finished ✓ at last"
+        self.old.save()
+        self.old.content = "Pyramids finished ✓ at long last"
+        self.old.save()
+        DailyPageViews.objects.create(
+            newspaper=self.old, date=date(2024, 5, 1), views=7
+        )
+        original = Newspaper.objects.create(
+            title="Older copy",
+            content="Obelisk raised",
+            published_date="2000-01-01",
+        )
+        Newspaper.objects.filter(pk=self.old.pk).update(duplicate_of=original)
+        copy = Newspaper.objects.create(
+            title="Copy",
+            content=self.old.content,
+            published_date="2024-02-02",
+        )
+        self.assertEqual(copy.duplicate_of_id, self.old.pk)
+        history = [
+            (revision.title, revisions.revision_content(revision))
+            for revision in self.old.revisions.order_by("pk")
+        ]
+        self.assertEqual(len(history), 2)
+
+        self.assertEqual(self.export(), 3)
+        copy.refresh_from_db()
+        self.assertIsNone(copy.duplicate_of_id)
+        coldarchive.restore_newspapers()
+
+        restored = Newspaper.objects.get(pk=self.old.pk)
+        self.assertEqual(restored.duplicate_of_id, original.pk)
+        copy.refresh_from_db()
+        self.assertEqual(copy.duplicate_of_id, self.old.pk)
+        self.assertEqual(
+            [
+                (revision.title, revisions.revision_content(revision))
+                for revision in restored.revisions.order_by("pk")
+            ],
+            history,
+        )
+        matches = dedup.find_duplicates(dedup.minhash(copy.content))
+        self.assertEqual([pk for pk, _ in matches], [self.old.pk, copy.pk])
+        self.assertEqual(
+            list(
+                DailyPageViews.objects.filter(newspaper=restored).values_list(
+                    "date", "views"
+                )
+            ),
+            [(date(2024, 5, 1), 7)],
+        )
+
+    def test_commands(self):
+        out = StringIO()
+        call_command("export_cold_archive", before="2010-01-01", stdout=out)
+        call_command("restore_cold_archive", all=True, stdout=out)
+        self.assertEqual(
+            out.getvalue(),
+            "Exported 2 newspaper(s).\nRestored 2 newspaper(s).\n",
+        )
+        self.assertEqual(Newspaper.objects.count(), 2)
+        self.assertEqual(NewspaperArchive.objects.count(), 1)
+        self.assertEqual(archive.latest_archived_date(), date(2002, 1, 1))
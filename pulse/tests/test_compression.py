@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import compression
+from pulse.models import ContentDictionary, Newspaper
+
+ARTICLE = (
+    "The city council approved the new budget on Tuesday. "
+    "The budget includes funding for schools, roads and parks. "
+) * 20
+
+
+class CompressionTest(TestCase):
+    def tearDown(self):
+        compression.reset_dictionary_cache()
+
+    def test_round_trip(self):
+        blob = compression.compress(ARTICLE, "zlib")
+        self.assertLess(len(blob), len(ARTICLE))
+        self.assertEqual(compression.decompress(blob), ARTICLE)
+
+    def test_round_trip_with_dictionary(self):
+        data = compression.train_dictionary([ARTICLE] * 3, "zlib")
+        dictionary = ContentDictionary.objects.create(codec="zlib", data=data)
+        compression.reset_dictionary_cache()
+        blob = compression.compress("The budget includes funding", "zlib")
+        self.assertEqual(
+            compression.HEADER.unpack_from(blob)[1], dictionary.pk
+        )
+        compression.reset_dictionary_cache()
+        self.assertEqual(
+            compression.decompress(blob), "The budget includes funding"
+        )
+
+
+@override_settings(PULSE_CONTENT_COMPRESSION="zlib")
+class CompressedContentFieldTest(TestCase):
+    def test_content_is_stored_compressed(self):
+        newspaper = Newspaper.objects.create(
+            title="Budget", content=ARTICLE, published_date="2024-01-01"
+        )
+        self.assertEqual(newspaper.content, ARTICLE)
+        row = Newspaper.objects.values("content", "content_blob").get()
+        self.assertEqual(row["content"], "")
+        self.assertEqual(compression.decompress(row["content_blob"]), ARTICLE)
+
+    def test_content_is_decompressed_lazily(self):
+        Newspaper.objects.create(
+            title="Budget", content=ARTICLE, published_date="2024-01-01"
+        )
+        newspaper = Newspaper.objects.get()
+        self.assertNotIn(ARTICLE, newspaper.__dict__.values())
+        self.assertEqual(newspaper.content, ARTICLE)
+        self.assertEqual(newspaper.__dict__["content"], ARTICLE)
+
+    def test_update_content_only(self):
+        newspaper = Newspaper.objects.create(
+            title="Budget", content=ARTICLE, published_date="2024-01-01"
+        )
+        newspaper.content = "Corrected"
+        newspaper.save(update_fields=["content"])
+        self.assertEqual(Newspaper.objects.get().content, "Corrected")
+
+    def test_compress_content_command(self):
+        with self.settings(PULSE_CONTENT_COMPRESSION=""):
+            Newspaper.objects.create(
+                title="Budget", content=ARTICLE, published_date="2024-01-01"
+            )
+        call_command(
+            "compress_content", "--train-dictionary", stdout=StringIO()
+        )
+        row = Newspaper.objects.values("content", "content_blob").get()
+        self.assertEqual(row["content"], "")
+        self.assertEqual(Newspaper.objects.get().content, ARTICLE)
+        self.assertEqual(ContentDictionary.objects.count(), 1)
+
+
+class ContentSearchTest(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+        self.budget = Newspaper.objects.create(
+            title="Budget", content=ARTICLE, published_date="2024-01-01"
+        )
+        Newspaper.objects.create(
+            title="Sports",
+            content="Local team wins",
+            published_date="2024-01-01",
+        )
+
+    def search(self, query):
+        response = self.client.get(
+            reverse("pulse:newspapers"), {"content": query}
+        )
+        return [n.title for n in response.context["newspaper_list"]]
+
+    def test_search_uses_index(self):
+        self.assertEqual(self.search("council budget"), ["Budget"])
+        self.assertEqual(self.search("tea"), ["Sports"])
+        self.assertEqual(self.search("weather"), [])
+
+    @override_settings(PULSE_CONTENT_COMPRESSION="zlib")
+    def test_search_compressed_content_after_update(self):
+        self.budget.content = "Snowstorm closes schools"
+        self.budget.save()
+        self.assertEqual(self.search("snowstorm"), ["Budget"])
+        self.assertEqual(self.search("council"), [])
+
+    def test_deleted_newspaper_leaves_index(self):
+        self.budget.delete()
+        self.assertEqual(self.search("council"), [])
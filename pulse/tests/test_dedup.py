@@ -0,0 +1,137 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import dedup
+from pulse.models import Topic, Newspaper, NewspaperSignature
+
+STORY = (
+    "Heavy rain flooded the lower districts of the city overnight, "
+    "forcing hundreds of residents to leave their homes. Emergency crews "
+    "worked until morning to pump water out of the metro stations, and "
+    "the mayor said schools will remain closed until Friday while "
+    "engineers inspect the bridges along the river."
+)
+EDITED_STORY = STORY.replace("hundreds of", "several hundred")
+OTHER_STORY = (
+    "The national football team won the championship final after a "
+    "dramatic penalty shootout that kept fans on the edge of their seats."
+)
+
+
+class MinHashTest(TestCase):
+    def test_similar_texts_have_similar_signatures(self):
+        score = dedup.similarity(
+            dedup.minhash(STORY), dedup.minhash(EDITED_STORY)
+        )
+        self.assertGreater(score, 0.7)
+
+    def test_different_texts_have_different_signatures(self):
+        score = dedup.similarity(
+            dedup.minhash(STORY), dedup.minhash(OTHER_STORY)
+        )
+        self.assertLess(score, 0.2)
+
+    def test_signature_round_trip(self):
+        signature = dedup.minhash(STORY)
+        self.assertEqual(list(dedup.unpack(dedup.pack(signature))), signature)
+
+    def test_empty_text_has_no_signature(self):
+        self.assertIsNone(dedup.minhash(""))
+
+
+@override_settings(PULSE_DUPLICATE_THRESHOLD=0.7)
+class DuplicateDetectionTest(TestCase):
+    def setUp(self):
+        self.original = Newspaper.objects.create(
+            title="Floods", content=STORY, published_date="2024-01-01"
+        )
+
+    def test_signature_is_stored_on_save(self):
+        self.assertTrue(
+            NewspaperSignature.objects.filter(newspaper=self.original).exists()
+        )
+        self.assertEqual(self.original.signature_bands.count(), dedup.BANDS)
+
+    def test_near_duplicate_is_flagged(self):
+        copy = Newspaper.objects.create(
+            title="Floods (update)",
+            content=EDITED_STORY,
+            published_date="2024-01-01",
+        )
+        copy.refresh_from_db()
+        self.assertEqual(copy.duplicate_of, self.original)
+        self.original.refresh_from_db()
+        self.assertIsNone(self.original.duplicate_of)
+
+    def test_unrelated_newspaper_is_not_flagged(self):
+        other = Newspaper.objects.create(
+            title="Football", content=OTHER_STORY, published_date="2024-01-01"
+        )
+        other.refresh_from_db()
+        self.assertIsNone(other.duplicate_of)
+
+    def test_editing_content_clears_flag(self):
+        copy = Newspaper.objects.create(
+            title="Floods (update)",
+            content=EDITED_STORY,
+            published_date="2024-01-01",
+        )
+        copy.content = OTHER_STORY
+        copy.save()
+        copy.refresh_from_db()
+        self.assertIsNone(copy.duplicate_of)
+
+    def test_backfill_command(self):
+        copy = Newspaper.objects.create(
+            title="Floods (update)",
+            content=EDITED_STORY,
+            published_date="2024-01-01",
+        )
+        NewspaperSignature.objects.all().delete()
+        Newspaper.objects.update(duplicate_of=None)
+        out = StringIO()
+        call_command(
+            "backfill_signatures", "--workers", "1", "--flag", stdout=out
+        )
+        self.assertIn("signed 2 newspaper(s)", out.getvalue())
+        self.assertTrue(
+            NewspaperSignature.objects.filter(newspaper=self.original).exists()
+        )
+        copy.refresh_from_db()
+        self.assertEqual(copy.duplicate_of, self.original)
+
+
+@override_settings(
+    PULSE_DUPLICATE_THRESHOLD=0.7, PULSE_DUPLICATE_ACTION="merge"
+)
+class DuplicateMergeTest(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+        self.original = Newspaper.objects.create(
+            title="Floods", content=STORY, published_date="2024-01-01"
+        )
+
+    def test_create_merges_into_original(self):
+        topic = Topic.objects.create(name="Weather")
+        response = self.client.post(
+            reverse("pulse:newspaper-create"),
+            {
+                "title": "Floods (wire copy)",
+                "content": EDITED_STORY,
+                "published_date": "2024-01-01",
+                "topic": [topic.pk],
+            },
+        )
+        self.assertRedirects(
+            response,
+            reverse("pulse:newspaper-detail", args=[self.original.pk]),
+        )
+        self.assertEqual(Newspaper.objects.count(), 1)
+        self.assertEqual(list(self.original.topic.all()), [topic])
@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import edge
+from pulse.models import Topic, Newspaper, Job
+
+INDEX_URL = reverse("pulse:index")
+
+
+class EdgeCacheTest(TestCase):
+    def test_anonymous_index_is_public(self):
+        response = self.client.get(INDEX_URL)
+        cache_control = response["Cache-Control"]
+        self.assertIn("public", cache_control)
+        self.assertIn("s-maxage=60", cache_control)
+        self.assertIn("stale-while-revalidate=600", cache_control)
+        self.assertIn("max-age=0", cache_control)
+        self.assertEqual(response["Cache-Tag"], "index")
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+        self.assertFalse(response.cookies)
+
+    def test_logged_in_index_is_private(self):
+        user = get_user_model().objects.create_user(
+            username="reader", password="password123"
+        )
+        self.client.force_login(user)
+        response = self.client.get(INDEX_URL)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertNotIn("public", response["Cache-Control"])
+        self.assertNotIn("Cache-Tag", response)
+        self.assertContains(response, "Logout")
+
+    def test_feeds_are_tagged(self):
+        topic = Topic.objects.create(name="Politics")
+        response = self.client.get(
+            reverse("pulse:topic-feed", args=[topic.pk, "rss"])
+        )
+        self.assertIn("public", response["Cache-Control"])
+        self.assertEqual(response["Surrogate-Key"], f"feed:topics:{topic.pk}")
+
+    def test_model_changes_send_purge_signal(self):
+        received = []
+
+        def listener(sender, tags, **kwargs):
+            received.append(tags)
+
+        edge.purge_requested.connect(listener)
+        self.addCleanup(edge.purge_requested.disconnect, listener)
+        with self.captureOnCommitCallbacks(execute=True):
+            Newspaper.objects.create(
+                title="Election", published_date="2024-01-01"
+            )
+        self.assertIn(["index"], received)
+        self.assertIn(["feed:newspapers:0"], received)
+
+    def test_login_does_not_purge(self):
+        get_user_model().objects.create_user(
+            username="reader", password="password123"
+        )
+        received = []
+
+        def listener(sender, tags, **kwargs):
+            received.append(tags)
+
+        edge.purge_requested.connect(listener)
+        self.addCleanup(edge.purge_requested.disconnect, listener)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(username="reader", password="password123")
+        self.assertEqual(received, [])
+
+    @override_settings(PULSE_EDGE_PURGE_URL="https://cdn.example/purge")
+    def test_purge_url_is_called_from_a_job(self):
+        edge.purge(["index", "index"])
+        edge.purge(["index"])
+        job = Job.objects.get(task=edge.purge_tags.task)
+        self.assertEqual(job.args, [["index"]])
+        with mock.patch("urllib.request.urlopen") as urlopen:
+            edge.purge_tags(["index"])
+        request = urlopen.call_args.args[0]
+        self.assertEqual(request.full_url, "https://cdn.example/purge")
+        self.assertEqual(request.data, b'{"tags": ["index"]}')
+        self.assertEqual(request.get_header("Surrogate-key"), "index")
+
+    def test_no_purge_job_without_url(self):
+        edge.purge(["index"])
+        self.assertFalse(Job.objects.exists())
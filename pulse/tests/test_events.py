@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import events
+from pulse.models import Topic, Newspaper
+
+EVENTS_URL = reverse("pulse:newspaper-events")
+
+
+def decode(chunk):
+    lines = dict(
+        line.split(": ", 1) for line in chunk.strip().splitlines()
+    )
+    return int(lines["id"]), json.loads(lines["data"])
+
+
+@override_settings(PULSE_EVENTS_POLL_SECONDS=0.01)
+class NewspaperEventsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_saves_publish_events_on_commit(self):
+        topic = Topic.objects.create(name="Politics")
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(
+                title="Election", published_date="2024-01-01"
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper.topic.add(topic)
+        _, published = events.read_since(0)
+        self.assertEqual(
+            [event["type"] for _, event in published],
+            ["created", "updated"],
+        )
+        self.assertEqual(published[1][1]["topics"], ["Politics"])
+        self.assertEqual(
+            published[1][1]["url"],
+            reverse("pulse:newspaper-detail", args=[newspaper.pk]),
+        )
+
+    def test_read_since_returns_only_newer_events(self):
+        for number in range(3):
+            events.publish({"id": number})
+        sequence, published = events.read_since(1)
+        self.assertEqual(sequence, 3)
+        self.assertEqual([number for number, _ in published], [2, 3])
+        self.assertEqual(events.read_since(3), (3, []))
+
+    async def test_stream_fans_out_published_events(self):
+        first, second = events.stream(), events.stream()
+        self.assertEqual(await anext(first), "retry: 5000\n\n")
+        self.assertEqual(await anext(second), "retry: 5000\n\n")
+        broadcaster = events.get_broadcaster()
+        self.assertEqual(len(broadcaster.subscribers), 2)
+        while broadcaster.cursor is None:
+            await asyncio.sleep(0.01)
+        await sync_to_async(events.publish)({"type": "created", "id": 7})
+        for stream in (first, second):
+            chunk = await asyncio.wait_for(anext(stream), 1)
+            self.assertEqual(decode(chunk)[1], {"type": "created", "id": 7})
+            await stream.aclose()
+        self.assertFalse(broadcaster.subscribers)
+        await asyncio.wait_for(broadcaster.task, 1)
+
+    async def test_stream_replays_missed_events(self):
+        for number in range(3):
+            await sync_to_async(events.publish)({"id": number})
+        stream = events.stream(last_event_id=1)
+        await anext(stream)
+        self.assertEqual(decode(await anext(stream))[0], 2)
+        self.assertEqual(decode(await anext(stream))[0], 3)
+        await stream.aclose()
+        await asyncio.wait_for(events.get_broadcaster().task, 1)
+
+    async def test_slow_clients_are_disconnected(self):
+        broadcaster = events.Broadcaster()
+        queue = asyncio.Queue(1)
+        broadcaster.subscribers.add(queue)
+        await broadcaster.poll()
+        for number in range(2):
+            await sync_to_async(events.publish)({"id": number})
+        await broadcaster.poll()
+        self.assertNotIn(queue, broadcaster.subscribers)
+        self.assertIsNone(queue.get_nowait())
+
+    async def test_view_requires_login(self):
+        response = await self.async_client.get(EVENTS_URL)
+        self.assertEqual(response.status_code, 302)
+
+    def test_view_is_disabled_under_wsgi(self):
+        user = get_user_model().objects.create(username="editor")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(EVENTS_URL).status_code, 204)
+
+    async def test_view_streams_events(self):
+        user = await get_user_model().objects.acreate(username="editor")
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get(EVENTS_URL)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        content = aiter(response.streaming_content)
+        self.assertEqual(await anext(content), b"retry: 5000\n\n")
+        await content.aclose()
@@ -0,0 +1,122 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from pulse import facets, querycache
+from pulse.models import Newspaper, Topic
+
+
+class FacetCountsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        querycache.clear_local()
+        self.politics = Topic.objects.create(name="Politics")
+        self.sports = Topic.objects.create(name="Sports")
+        self.alice = get_user_model().objects.create_user(
+            username="alice", password="12345", years_of_experience=1
+        )
+        self.bob = get_user_model().objects.create_user(
+            username="bob", password="12345", years_of_experience=1
+        )
+        for title, date, topics, publishers in [
+            ("Vote", "2023-05-01", [self.politics], [self.alice]),
+            ("Vote again", "2024-05-01", [self.politics], [self.bob]),
+            ("Match", "2024-06-01", [self.sports], [self.alice, self.bob]),
+            ("Debate", "2024-07-01", [self.politics, self.sports], []),
+        ]:
+            newspaper = Newspaper.objects.create(
+                title=title, content="Content", published_date=date
+            )
+            newspaper.topic.set(topics)
+            newspaper.publishers.set(publishers)
+
+    def test_one_query_counts_every_facet(self):
+        with self.assertNumQueries(1):
+            counts = facets.grouped_counts(Newspaper.objects.all())
+        self.assertEqual(
+            sorted(counts["topic"]),
+            [(self.politics.pk, 3), (self.sports.pk, 2)],
+        )
+        self.assertEqual(
+            sorted(counts["publisher"]),
+            [(self.alice.pk, 2), (self.bob.pk, 2)],
+        )
+        self.assertEqual(sorted(counts["year"]), [(2023, 1), (2024, 3)])
+
+    def test_counts_follow_the_filters(self):
+        counts = facets.grouped_counts(
+            Newspaper.objects.filter(published_date__year=2024)
+        )
+        self.assertEqual(
+            sorted(counts["topic"]),
+            [(self.politics.pk, 2), (self.sports.pk, 2)],
+        )
+
+    def test_values_are_capped_and_cached(self):
+        entry = facets.facet_counts(Newspaper.objects.all(), "", limit=1)
+        self.assertEqual(entry["topic"], [(self.politics.pk, "Politics", 3)])
+        self.assertEqual(entry["year"], [(2024, "2024", 3)])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                facets.facet_counts(Newspaper.objects.all(), "", limit=1),
+                entry,
+            )
+
+    def test_publisher_change_invalidates(self):
+        facets.facet_counts(Newspaper.objects.all(), "")
+        with self.captureOnCommitCallbacks(execute=True):
+            Newspaper.objects.get(title="Debate").publishers.add(self.alice)
+        entry = facets.facet_counts(Newspaper.objects.all(), "")
+        self.assertIn((self.alice.pk, "alice", 3), entry["publisher"])
+
+    def test_links_toggle_the_filter(self):
+        entry = facets.facet_counts(Newspaper.objects.all(), "")
+        links = facets.facet_links(
+            entry, [("title", "vote"), ("topic", str(self.politics.pk))]
+        )
+        topics = {value["label"]: value for value in links[0]["values"]}
+        self.assertTrue(topics["Politics"]["selected"])
+        self.assertEqual(topics["Politics"]["query"], "title=vote")
+        self.assertEqual(
+            topics["Sports"]["query"], f"title=vote&topic={self.sports.pk}"
+        )
+
+
+class NewspaperListFacetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        querycache.clear_local()
+        self.topic = Topic.objects.create(name="Science")
+        for i in range(3):
+            newspaper = Newspaper.objects.create(
+                title=f"Paper {i}",
+                content="Content",
+                published_date=f"202{i}-01-01",
+            )
+            if i:
+                newspaper.topic.add(self.topic)
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+
+    def test_facets_and_filters(self):
+        url = reverse("pulse:newspapers")
+        response = self.client.get(url)
+        facet_names = [facet["name"] for facet in response.context["facets"]]
+        self.assertEqual(facet_names, ["topic", "year"])
+        self.assertContains(response, f'href="?topic={self.topic.pk}"')
+
+        response = self.client.get(url, {"topic": self.topic.pk})
+        self.assertEqual(
+            [n.title for n in response.context["newspaper_list"]],
+            ["Paper 1", "Paper 2"],
+        )
+        response = self.client.get(
+            url, {"topic": self.topic.pk, "year": 2022}
+        )
+        self.assertEqual(
+            [n.title for n in response.context["newspaper_list"]],
+            ["Paper 2"],
+        )
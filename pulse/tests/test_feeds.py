@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from pulse.models import Topic, Redactor, Newspaper
+
+
+class FeedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.topic = Topic.objects.create(name="Science")
+        self.redactor = Redactor.objects.create(username="editor")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper = Newspaper.objects.create(
+                title="Moon Landing",
+                content="Astronauts landed on the moon.",
+                published_date="2024-01-01",
+            )
+            self.newspaper.topic.add(self.topic)
+            self.newspaper.publishers.add(self.redactor)
+
+    def test_rss_feed(self):
+        response = self.client.get(
+            reverse("pulse:newspaper-feed", args=["rss"])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Type"], "application/rss+xml; charset=utf-8"
+        )
+        self.assertContains(response, "Moon Landing")
+        self.assertContains(response, "<category>Science</category>")
+        self.assertTrue(response.has_header("ETag"))
+
+    def test_atom_feeds_per_topic_and_redactor(self):
+        for name, pk in (
+            ("pulse:topic-feed", self.topic.pk),
+            ("pulse:redactor-feed", self.redactor.pk),
+        ):
+            response = self.client.get(reverse(name, args=[pk, "atom"]))
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "Moon Landing")
+            self.assertContains(response, "http://www.w3.org/2005/Atom")
+
+    def test_topic_feed_only_lists_topic_newspapers(self):
+        other = Topic.objects.create(name="Sports")
+        response = self.client.get(
+            reverse("pulse:topic-feed", args=[other.pk, "rss"])
+        )
+        self.assertNotContains(response, "Moon Landing")
+
+    def test_unknown_feed(self):
+        response = self.client.get(
+            reverse("pulse:newspaper-feed", args=["json"])
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(
+            reverse("pulse:topic-feed", args=[9999, "rss"])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_conditional_get_returns_not_modified(self):
+        url = reverse("pulse:newspaper-feed", args=["rss"])
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_feed_is_served_from_cache(self):
+        url = reverse("pulse:newspaper-feed", args=["rss"])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, "Moon Landing")
+
+    def test_feed_regenerated_when_newspaper_changes(self):
+        url = reverse("pulse:topic-feed", args=[self.topic.pk, "rss"])
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.title = "Mars Landing"
+            self.newspaper.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Mars Landing")
+
+    def test_unrelated_feed_is_not_invalidated(self):
+        other = Topic.objects.create(name="Sports")
+        url = reverse("pulse:topic-feed", args=[other.pk, "rss"])
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.title = "Mars Landing"
+            self.newspaper.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_removing_topic_invalidates_topic_feed(self):
+        url = reverse("pulse:topic-feed", args=[self.topic.pk, "rss"])
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.topic.remove(self.topic)
+        self.assertNotContains(self.client.get(url), "Moon Landing")
@@ -1,3 +1,4 @@
+from django.db.models.signals import m2m_changed, post_save
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from datetime import date
@@ -7,7 +8,7 @@ from pulse.forms import (
     NewspaperForm,
     NewspaperSearchForm
 )
-from pulse.models import Topic
+from pulse.models import Topic, Newspaper
 
 
 class TopicFormTest(TestCase):
@@ -91,3 +92,71 @@ class NewspaperSearchFormTest(TestCase):
     def test_newspaper_search_form_invalid(self):
         form = NewspaperSearchForm(data={})
         self.assertTrue(form.is_valid())
+
+
+class NewspaperFormRelationsTest(TestCase):
+    def setUp(self):
+        self.politics = Topic.objects.create(name="Politics")
+        self.economy = Topic.objects.create(name="Economy")
+        self.sport = Topic.objects.create(name="Sport")
+        self.redactor = get_user_model().objects.create_user(
+            username="editor", password="password123"
+        )
+        self.newspaper = Newspaper.objects.create(
+            title="Budget", content="Text", published_date="2024-01-01"
+        )
+        self.newspaper.topic.set([self.politics, self.economy])
+        self.newspaper.publishers.set([self.redactor])
+        self.newspaper.refresh_from_db()
+        self.signals = []
+        m2m_changed.connect(self.record)
+        post_save.connect(self.record, sender=Newspaper)
+        self.addCleanup(m2m_changed.disconnect, self.record)
+        self.addCleanup(post_save.disconnect, self.record, sender=Newspaper)
+
+    def record(self, sender, **kwargs):
+        self.signals.append(
+            (sender.__name__, kwargs.get("action"), kwargs.get("pk_set"))
+        )
+
+    def form(self, topics):
+        return NewspaperForm(
+            data={
+                "title": "Budget",
+                "content": "Text",
+                "published_date": "2024-01-01",
+                "topic": [topic.pk for topic in topics],
+                "publishers": [self.redactor.pk],
+            },
+            instance=self.newspaper,
+        )
+
+    def test_unchanged_form_writes_nothing(self):
+        form = self.form([self.politics, self.economy])
+        self.assertTrue(form.is_valid())
+        with self.assertNumQueries(2):
+            form.save()
+        self.assertEqual(self.signals, [])
+
+    def test_only_changed_relations_are_written(self):
+        form = self.form([self.politics, self.sport])
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.assertEqual(
+            sorted(self.newspaper.topic.values_list("name", flat=True)),
+            ["Politics", "Sport"],
+        )
+        self.assertEqual(
+            [action for _, action, _ in self.signals],
+            ["pre_remove", "post_remove", "pre_add", "post_add"],
+        )
+        self.assertEqual(self.signals[0][2], {self.economy.pk})
+        self.assertEqual(self.signals[2][2], {self.sport.pk})
+
+    def test_commit_false_defers_relations(self):
+        form = self.form([self.sport])
+        self.assertTrue(form.is_valid())
+        newspaper = form.save(commit=False)
+        newspaper.save()
+        form.save_m2m()
+        self.assertEqual(list(newspaper.topic.all()), [self.sport])
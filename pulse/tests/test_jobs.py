@@ -0,0 +1,134 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from pulse import jobs
+from pulse.models import Job, Topic
+
+
+@jobs.job
+def create_topic(name):
+    Topic.objects.create(name=name)
+
+
+@jobs.job
+def fail():
+    raise ValueError("boom")
+
+
+def undecorated():
+    pass
+
+
+@jobs.job
+def create_topic_job(name):
+    Topic.objects.create(name=name)
+
+
+class JobQueueTest(TestCase):
+    def test_enqueue_and_run(self):
+        jobs.enqueue(create_topic, args=["Queued Topic"])
+        processed = jobs.work(burst=True)
+        self.assertEqual(processed, 1)
+        self.assertTrue(Topic.objects.filter(name="Queued Topic").exists())
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
+
+    def test_decorated_job_delay(self):
+        job = create_topic_job.delay("Delayed Topic")
+        self.assertEqual(job.task, "pulse.tests.test_jobs.create_topic_job")
+        jobs.work(burst=True)
+        self.assertTrue(Topic.objects.filter(name="Delayed Topic").exists())
+
+    def test_claim_skips_future_jobs(self):
+        jobs.enqueue(
+            create_topic,
+            args=["Later"],
+            run_at=timezone.now() + timedelta(hours=1),
+        )
+        self.assertIsNone(jobs.claim_job("test-worker"))
+
+    def test_claimed_job_is_not_claimed_twice(self):
+        jobs.enqueue(create_topic, args=["Once"])
+        first = jobs.claim_job("worker-1")
+        self.assertEqual(first.status, Job.Status.RUNNING)
+        self.assertEqual(first.locked_by, "worker-1")
+        self.assertIsNone(jobs.claim_job("worker-2"))
+
+    def test_failed_job_is_retried_with_backoff(self):
+        jobs.enqueue(fail, max_attempts=2)
+        jobs.work(burst=True)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertIn("ValueError", job.last_error)
+        self.assertGreater(job.run_at, timezone.now())
+
+    def test_unregistered_task_is_not_imported(self):
+        Job.objects.create(task="os.getcwd", max_attempts=3)
+        jobs.work(burst=True)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn("Unknown task 'os.getcwd'", job.last_error)
+
+    def test_only_job_tasks_can_be_enqueued(self):
+        for task in (undecorated, "os.getcwd"):
+            with self.assertRaisesMessage(ValueError, "is not a @job task"):
+                jobs.enqueue(task)
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(
+            jobs.enqueue("pulse.pageviews.flush").task,
+            "pulse.pageviews.flush",
+        )
+
+    def test_job_fails_after_max_attempts(self):
+        jobs.enqueue(fail, max_attempts=1)
+        jobs.work(burst=True)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_stale_running_job_is_requeued(self):
+        job = jobs.enqueue(create_topic, args=["Stale"], timeout=1)
+        jobs.claim_job("dead-worker")
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(len(jobs.requeue_stale_jobs()), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+
+    def test_run_workers_command(self):
+        jobs.enqueue(create_topic, args=["Command Topic"])
+        call_command("run_workers", "--burst", stdout=StringIO())
+        self.assertTrue(Topic.objects.filter(name="Command Topic").exists())
+
+
+class JobAdminTest(TestCase):
+    def setUp(self):
+        admin_user = get_user_model().objects.create_superuser(
+            username="admin", email="admin@test.com", password="password123"
+        )
+        self.client.force_login(admin_user)
+
+    def test_changelist_shows_status_counts(self):
+        jobs.enqueue(create_topic, args=["Admin Topic"])
+        response = self.client.get(reverse("admin:pulse_job_changelist"))
+        self.assertContains(response, "Queue status")
+        self.assertEqual(response.context["status_counts"][0], ("Queued", 1))
+
+    def test_retry_action(self):
+        job = jobs.enqueue(fail, max_attempts=1)
+        jobs.work(burst=True)
+        self.client.post(
+            reverse("admin:pulse_job_changelist"),
+            {"action": "retry_jobs", "_selected_action": [job.pk]},
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(job.attempts, 0)
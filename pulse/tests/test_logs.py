@@ -0,0 +1,179 @@
+import json
+import logging
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from pulse import logs
+from pulse.models import AuditEntry, Newspaper, Topic
+
+
+def info_record():
+    return logging.makeLogRecord(
+        {
+            "name": "pulse.access",
+            "msg": "x",
+            "levelno": logging.INFO,
+            "levelname": "INFO",
+        }
+    )
+
+
+class AuditTrailTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="editor", password="12345"
+        )
+        self.topic = Topic.objects.create(name="Science")
+
+    def entries(self):
+        return list(
+            AuditEntry.objects.order_by("pk").values_list(
+                "action", "model", "object_repr", "user_id"
+            )
+        )
+
+    def test_changes_are_audited_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(
+                title="Daily", content="Text", published_date="2024-01-01"
+            )
+            self.assertFalse(AuditEntry.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topic.name = "Physics"
+            self.topic.save()
+            pk = newspaper.pk
+            newspaper.delete()
+        self.assertEqual(
+            self.entries(),
+            [
+                ("create", "pulse.newspaper", "Daily", None),
+                ("update", "pulse.topic", "Physics", None),
+                ("delete", "pulse.newspaper", "Daily", None),
+            ],
+        )
+        self.assertEqual(AuditEntry.objects.first().object_id, pk)
+
+    def test_entries_name_the_requesting_user(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(username="editor", password="12345")
+        self.assertFalse(AuditEntry.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("pulse:topic-update", args=[self.topic.pk]),
+                {"name": "Physics"},
+            )
+        self.assertEqual(
+            self.entries(),
+            [("update", "pulse.topic", "Physics", self.user.pk)],
+        )
+
+    def test_handler_inserts_a_batch_at_once(self):
+        handler = logs.AuditHandler(capacity=10)
+        for pk in range(3):
+            handler.handle(
+                logging.makeLogRecord(
+                    {
+                        "name": "pulse.audit",
+                        "fields": {
+                            "action": "create",
+                            "model": "pulse.topic",
+                            "object_id": pk,
+                            "object_repr": f"Topic {pk}",
+                            "user_id": None,
+                        },
+                    }
+                )
+            )
+        self.assertFalse(AuditEntry.objects.exists())
+        with self.assertNumQueries(1):
+            handler.flush()
+        self.assertEqual(AuditEntry.objects.count(), 3)
+
+    def test_batched_writes_once_on_the_way_out(self):
+        handler = logs.AuditHandler(capacity=10)
+        with mock.patch.object(logs, "_handlers", [handler]):
+            with logs.batched():
+                with self.captureOnCommitCallbacks(execute=True):
+                    for name in ("Physics", "Biology", "Geology"):
+                        Topic.objects.create(name=name)
+                self.assertFalse(AuditEntry.objects.exists())
+                with self.assertNumQueries(1):
+                    logs.flush()
+        self.assertEqual(AuditEntry.objects.count(), 3)
+
+
+class PipelineTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "access.log"
+
+    def test_request_thread_only_enqueues(self):
+        threads = []
+
+        class RecordingHandler(logs.JsonLinesHandler):
+            def emit(self, record):
+                threads.append(threading.current_thread())
+                super().emit(record)
+
+        handler = RecordingHandler(str(self.path), capacity=100)
+        handler.addFilter(logging.Filter("pulse.access"))
+        listener = logs.BatchingQueueListener(
+            logs._queue, handler, flush_seconds=0.05
+        )
+        with mock.patch.object(logs, "_listener", listener):
+            listener.start()
+            try:
+                self.client.get(reverse("pulse:topics"))
+                self.client.get("/missing/")
+                # The partial batch goes out once the queue is idle.
+                deadline = time.monotonic() + 5
+                while not self.path.exists() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                listener.stop()
+        self.assertNotIn(threading.current_thread(), threads)
+        lines = [
+            json.loads(line) for line in self.path.read_text().splitlines()
+        ]
+        self.assertEqual(
+            [line["path"] for line in lines], ["/topics/", "/missing/"]
+        )
+        self.assertEqual(lines[1]["status"], 404)
+        self.assertEqual(lines[0]["logger"], "pulse.access")
+        self.assertIn("duration_ms", lines[0])
+
+    def test_forked_process_starts_its_own_listener(self):
+        inherited = queue.Queue()
+        with mock.patch.object(logs, "_background", True), (
+            mock.patch.object(logs, "_pid", -1)
+        ), mock.patch.object(logs, "_queue", inherited), (
+            mock.patch.object(logs, "_listener", None)
+        ), mock.patch.object(logs, "_handlers", []):
+            try:
+                logs.PipelineHandler().handle(info_record())
+                self.assertIsNotNone(logs._listener)
+                self.assertIsNot(logs._queue, inherited)
+                self.assertTrue(inherited.empty())
+            finally:
+                logs._listener.stop()
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = logs.PipelineHandler()
+        full = queue.Queue(1)
+        before = logs.dropped()
+        with mock.patch.object(logs, "_listener", object()), (
+            mock.patch.object(logs, "_queue", full)
+        ):
+            for _ in range(3):
+                handler.handle(info_record())
+        self.assertEqual(full.qsize(), 1)
+        self.assertEqual(logs.dropped(), before + 2)
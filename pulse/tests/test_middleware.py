@@ -0,0 +1,151 @@
+import gzip
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+
+from pulse import middleware
+from pulse.middleware import CompressionMiddleware, negotiate
+
+BODY = b"<html>" + b"<p>Pulse News Portal</p>" * 200 + b"</html>"
+
+
+class NegotiationTest(TestCase):
+    @mock.patch("pulse.middleware.brotli", None)
+    def test_gzip_without_brotli(self):
+        self.assertEqual(negotiate("gzip, deflate, br"), "gzip")
+
+    def test_refused_encodings(self):
+        self.assertIsNone(negotiate(""))
+        self.assertIsNone(negotiate("gzip;q=0, br;q=0"))
+        self.assertIsNone(negotiate("identity"))
+
+    @mock.patch("pulse.middleware.brotli", object())
+    def test_prefers_brotli_unless_weighted_lower(self):
+        self.assertEqual(negotiate("gzip, br"), "br")
+        self.assertEqual(negotiate("br;q=0.5, gzip"), "gzip")
+        self.assertEqual(negotiate("*"), "br")
+        self.assertEqual(negotiate("gzip, br", allow_brotli=False), "gzip")
+
+
+@mock.patch("pulse.middleware.brotli", None)
+class CompressionMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get(
+            "/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+    def process(self, response, request=None):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(request or self.request)
+
+    def test_compresses_html(self):
+        response = self.process(HttpResponse(BODY))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(
+            response["Content-Length"], str(len(response.content))
+        )
+
+    @mock.patch("pulse.middleware.brotli", object())
+    def test_html_is_never_brotli(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="br, gzip")
+        response = self.process(HttpResponse(BODY), request)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_skips_small_compressed_and_binary_responses(self):
+        self.assertFalse(
+            self.process(HttpResponse(b"short")).has_header(
+                "Content-Encoding"
+            )
+        )
+        encoded = HttpResponse(BODY)
+        encoded["Content-Encoding"] = "br"
+        self.assertEqual(self.process(encoded).content, BODY)
+        image = HttpResponse(BODY, content_type="image/png")
+        self.assertFalse(self.process(image).has_header("Content-Encoding"))
+
+    def test_skips_clients_without_support(self):
+        request = RequestFactory().get("/")
+        response = self.process(HttpResponse(BODY), request)
+        self.assertEqual(response.content, BODY)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_streams_chunk_by_chunk(self):
+        chunks = iter([b"id,title\n", b"1,First\n" * 50, b"2,Second\n"])
+        response = self.process(
+            StreamingHttpResponse(chunks, content_type="text/csv")
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        compressed = list(response.streaming_content)
+        self.assertGreater(len(compressed), 1)
+        self.assertEqual(
+            gzip.decompress(b"".join(compressed)),
+            b"id,title\n" + b"1,First\n" * 50 + b"2,Second\n",
+        )
+
+    def test_streams_are_padded(self):
+        lengths = {
+            len(
+                b"".join(
+                    self.process(
+                        StreamingHttpResponse(iter([BODY]))
+                    ).streaming_content
+                )
+            )
+            for _ in range(20)
+        }
+        self.assertGreater(len(lengths), 1)
+
+    def test_skips_partial_content(self):
+        response = HttpResponse(BODY, status=206)
+        response["Content-Range"] = f"bytes 0-{len(BODY) - 1}/{len(BODY)}"
+        response = self.process(response)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, BODY)
+
+    def test_cacheable_bodies_are_compressed_once(self):
+        def cacheable():
+            response = HttpResponse(BODY)
+            response["ETag"] = '"v1"'
+            return response
+
+        first = self.process(cacheable())
+        with mock.patch("pulse.middleware.compress_body") as compress_body:
+            second = self.process(cacheable())
+        compress_body.assert_not_called()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], 'W/"v1"')
+
+    def test_private_responses_are_not_cached(self):
+        response = HttpResponse(BODY)
+        response["Cache-Control"] = "private, max-age=60"
+        self.process(response)
+        with mock.patch(
+            "pulse.middleware.compress_body", return_value=b"x"
+        ) as compress_body:
+            response = HttpResponse(BODY)
+            response["Cache-Control"] = "private, max-age=60"
+            self.process(response)
+        compress_body.assert_called_once()
+
+
+@unittest.skipIf(middleware.brotli is None, "brotli is not installed")
+class BrotliCompressionTest(TestCase):
+    def test_brotli_stream(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="br")
+        response = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(
+                iter([BODY]), content_type="application/json"
+            )
+        )(request)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(
+            middleware.brotli.decompress(b"".join(response.streaming_content)),
+            BODY,
+        )
@@ -0,0 +1,131 @@
+from contextlib import ExitStack
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from pulse import jobs, pageviews
+from pulse.models import Job, Newspaper, DailyPageViews
+
+
+@override_settings(PULSE_PAGEVIEW_FLUSH_SECONDS=3600)
+class PageViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        pageviews._buffer.clear()
+        self.first = Newspaper.objects.create(
+            title="First", content="Content", published_date="2024-01-01"
+        )
+        self.second = Newspaper.objects.create(
+            title="Second", content="Content", published_date="2024-01-01"
+        )
+
+    def test_views_are_buffered_until_flushed(self):
+        for _ in range(3):
+            pageviews.record_view(self.first.pk)
+        self.assertFalse(DailyPageViews.objects.exists())
+        pageviews.push()
+        self.assertEqual(pageviews.flush(), 1)
+        row = DailyPageViews.objects.get()
+        self.assertEqual(row.views, 3)
+        self.assertEqual(row.date, timezone.localdate())
+
+    def test_batches_from_several_workers_are_added_up(self):
+        pageviews.record_view(self.first.pk)
+        pageviews.push()
+        pageviews.record_view(self.first.pk)
+        pageviews.record_view(self.second.pk)
+        pageviews.push()
+        with self.assertNumQueries(4):
+            pageviews.flush()
+        pageviews.record_view(self.first.pk)
+        pageviews.push()
+        pageviews.flush()
+        self.assertEqual(
+            dict(DailyPageViews.objects.values_list("newspaper", "views")),
+            {self.first.pk: 3, self.second.pk: 1},
+        )
+
+    def test_flush_skips_deleted_newspapers(self):
+        pageviews.record_view(self.second.pk)
+        pageviews.push()
+        self.second.delete()
+        self.assertEqual(pageviews.flush(), 0)
+        self.assertIsNone(cache.get(pageviews._batch_key(1)))
+
+    def test_flush_is_skipped_while_locked(self):
+        pageviews.record_view(self.first.pk)
+        pageviews.push()
+        cache.add(pageviews.LOCK_KEY, True)
+        self.assertEqual(pageviews.flush(), 0)
+        cache.delete(pageviews.LOCK_KEY)
+        self.assertEqual(pageviews.flush(), 1)
+
+    def test_most_read_is_ranked_and_cached(self):
+        for _ in range(2):
+            pageviews.record_view(self.second.pk)
+        pageviews.record_view(self.first.pk)
+        pageviews.push()
+        pageviews.flush()
+        ranking = pageviews.most_read()
+        self.assertEqual(
+            [(entry["title"], entry["views"]) for entry in ranking],
+            [("Second", 2), ("First", 1)],
+        )
+        with self.assertNumQueries(0):
+            pageviews.most_read()
+
+    def test_flush_command(self):
+        pageviews.record_view(self.first.pk)
+        out = StringIO()
+        call_command("flush_pageviews", stdout=out)
+        self.assertIn("for 1 row(s)", out.getvalue())
+
+    def test_detail_view_records_views_and_index_lists_them(self):
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+        with self.settings(PULSE_PAGEVIEW_FLUSH_SECONDS=0):
+            self.client.get(
+                reverse("pulse:newspaper-detail", args=[self.first.pk])
+            )
+        # The request only queues the write.
+        self.assertFalse(DailyPageViews.objects.exists())
+        self.assertEqual(Job.objects.get().task, pageviews.flush.task)
+        jobs.work(burst=True)
+        self.assertEqual(DailyPageViews.objects.get().views, 1)
+        response = self.client.get(reverse("pulse:index"))
+        self.assertContains(response, "Most read")
+        self.assertContains(response, "(1 views)")
+
+    def test_pages_render_while_the_cache_is_down(self):
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+        with ExitStack() as stack:
+            for name in ("add", "get", "incr", "set"):
+                stack.enter_context(
+                    mock.patch.object(
+                        cache, name, side_effect=ConnectionError
+                    )
+                )
+            stack.enter_context(
+                self.assertLogs("pulse.pageviews", "WARNING")
+            )
+            with self.settings(PULSE_PAGEVIEW_FLUSH_SECONDS=0):
+                detail = self.client.get(
+                    reverse("pulse:newspaper-detail", args=[self.first.pk])
+                )
+            index = self.client.get(reverse("pulse:index"))
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(index.status_code, 200)
+        self.assertFalse(Job.objects.exists())
+        # Views that could not be pushed wait for the next push.
+        self.assertEqual(sum(pageviews._buffer.values()), 1)
@@ -0,0 +1,181 @@
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from pulse import archive, coldarchive, prerender
+from pulse.models import Newspaper, StalePage, Topic
+
+
+class PrerenderTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        cold = tempfile.TemporaryDirectory()
+        self.addCleanup(cold.cleanup)
+        self.addCleanup(coldarchive.reset)
+        settings_override = override_settings(
+            PULSE_PRERENDER_ROOT=directory.name,
+            PULSE_PRERENDER_PAGE_SIZE=2,
+            PULSE_COLD_ARCHIVE_DIR=cold.name,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.topic = Topic.objects.create(name="Science")
+        self.redactor = get_user_model().objects.create_user(
+            username="editor", password="12345", first_name="Ada"
+        )
+        self.newspapers = []
+        for day in range(1, 4):
+            newspaper = Newspaper.objects.create(
+                title=f"Issue {day}",
+                content="Content",
+                published_date=f"2024-01-0{day}",
+            )
+            newspaper.topic.add(self.topic)
+            newspaper.publishers.add(self.redactor)
+            self.newspapers.append(newspaper)
+        self.newspaper = self.newspapers[0]
+
+    def page(self, path):
+        return (self.root / path.strip("/") / "index.html").read_text()
+
+    def stale(self):
+        return set(StalePage.objects.values_list("kind", "object_id"))
+
+    def test_build_all_writes_read_only_pages(self):
+        self.assertEqual(prerender.build_all(), 5)
+        self.assertFalse(StalePage.objects.exists())
+        html = self.page(prerender.newspaper_path(self.newspaper.pk))
+        self.assertIn("Issue 1", html)
+        self.assertIn("Ada", html)
+        self.assertNotIn(f"/newspapers/{self.newspaper.pk}/update/", html)
+
+        first = self.page(prerender.topic_path(self.topic.pk))
+        second = self.page(prerender.topic_path(self.topic.pk, 2))
+        self.assertIn("Issue 3", first)
+        self.assertIn("Issue 2", first)
+        self.assertIn("Issue 1", second)
+        self.assertIn(prerender.topic_path(self.topic.pk, 2), first)
+
+        index = self.page("/topics/")
+        self.assertIn(prerender.topic_path(self.topic.pk), index)
+        self.assertNotIn("Add New Topic", index)
+
+    def test_edits_mark_only_the_pages_they_change(self):
+        prerender.build_all()
+        self.newspaper.title = "Corrected"
+        self.newspaper.save()
+        self.assertEqual(
+            self.stale(),
+            {
+                (StalePage.NEWSPAPER, self.newspaper.pk),
+                (StalePage.TOPIC, self.topic.pk),
+            },
+        )
+        self.assertEqual(prerender.refresh(), 2)
+        self.assertIn(
+            "Corrected",
+            self.page(prerender.newspaper_path(self.newspaper.pk)),
+        )
+        self.assertIn(
+            "Corrected", self.page(prerender.topic_path(self.topic.pk, 2))
+        )
+        self.assertEqual(prerender.refresh(), 0)
+
+        self.redactor.last_login = self.redactor.date_joined
+        self.redactor.save(update_fields=["last_login"])
+        self.assertFalse(StalePage.objects.exists())
+        self.redactor.first_name = "Grace"
+        self.redactor.save()
+        self.assertEqual(
+            self.stale(),
+            {(StalePage.NEWSPAPER, n.pk) for n in self.newspapers},
+        )
+
+    def test_deletions_remove_pages(self):
+        prerender.build_all()
+        self.newspapers[2].delete()
+        prerender.refresh()
+        self.assertFalse(
+            (self.root / "newspapers" / str(self.newspapers[2].pk)).exists()
+        )
+        # The topic now fits on one page, so the second one goes.
+        self.assertFalse(
+            (self.root / "topics" / str(self.topic.pk) / "2").exists()
+        )
+
+        self.topic.delete()
+        prerender.refresh()
+        self.assertFalse((self.root / "topics" / str(self.topic.pk)).exists())
+        self.assertNotIn("Science", self.page("/topics/"))
+
+    def test_archived_newspapers_keep_their_pages(self):
+        prerender.build_all()
+        path = prerender.newspaper_path(self.newspaper.pk)
+        archive.archive_newspapers(before=date(2024, 1, 2))
+        self.assertIn((StalePage.NEWSPAPER, self.newspaper.pk), self.stale())
+        prerender.refresh()
+        self.assertIn("Archived", self.page(path))
+        self.assertIn("Ada", self.page(path))
+
+        self.assertEqual(
+            coldarchive.export_newspapers(before=date(2024, 1, 2)), 1
+        )
+        StalePage.objects.all().delete()
+        prerender.build_all()
+        self.assertIn("Issue 1", self.page(path))
+
+        coldarchive.write_segment([(self.newspaper.pk, None)])
+        prerender.render_newspaper(self.newspaper.pk)
+        self.assertFalse(
+            (self.root / path.strip("/") / "index.html").exists()
+        )
+
+    def test_full_build_removes_orphans(self):
+        prerender.build_all()
+        orphan = self.newspapers[1].pk
+        Newspaper.objects.filter(pk=orphan).delete()
+        StalePage.objects.all().delete()
+        prerender.build_all()
+        self.assertFalse((self.root / "newspapers" / str(orphan)).exists())
+
+    def test_disabled_without_root(self):
+        StalePage.objects.all().delete()
+        with override_settings(PULSE_PRERENDER_ROOT=""):
+            self.newspaper.save()
+            with self.assertRaises(CommandError):
+                call_command("prerender_pages")
+        self.assertFalse(StalePage.objects.exists())
+
+    def test_disabled_edits_skip_the_lookups(self):
+        with override_settings(PULSE_PRERENDER_ROOT=""):
+            with self.assertNumQueries(0):
+                prerender.mark_newspapers([self.newspaper.pk])
+                prerender.mark_topics([self.topic.pk], with_newspapers=True)
+                prerender.mark_redactor(self.redactor.pk)
+
+    def test_fixture_loads_mark_nothing(self):
+        StalePage.objects.all().delete()
+        topic = Topic(name="Loaded")
+        topic.save_base(raw=True)
+        redactor = get_user_model().objects.get(pk=self.redactor.pk)
+        redactor.first_name = "Grace"
+        redactor.save_base(raw=True)
+        self.assertFalse(StalePage.objects.exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command("prerender_pages", all=True, workers=1, stdout=out)
+        call_command("prerender_pages", stdout=out)
+        self.assertEqual(
+            out.getvalue(), "Rendered 5 page(s).\nRendered 0 page(s).\n"
+        )
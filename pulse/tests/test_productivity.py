@@ -0,0 +1,118 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from pulse import productivity
+from pulse.models import (
+    Topic,
+    Newspaper,
+    RedactorMonthlyOutput,
+    RedactorTopicOutput,
+)
+
+
+def snapshot():
+    return (
+        sorted(
+            RedactorMonthlyOutput.objects.values_list(
+                "redactor", "month", "articles"
+            )
+        ),
+        sorted(
+            RedactorTopicOutput.objects.values_list(
+                "redactor", "topic", "articles"
+            )
+        ),
+        sorted(
+            get_user_model().objects.values_list("pk", "article_count")
+        ),
+    )
+
+
+class RedactorOutputTest(TestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.alice = user_model.objects.create_user(
+            username="alice", password="12345"
+        )
+        self.bob = user_model.objects.create_user(
+            username="bob", password="12345"
+        )
+        self.politics = Topic.objects.create(name="Politics")
+        self.sport = Topic.objects.create(name="Sport")
+        self.january = Newspaper.objects.create(
+            title="January", content="Content", published_date="2024-01-10"
+        )
+        self.february = Newspaper.objects.create(
+            title="February", content="Content", published_date="2024-02-10"
+        )
+
+    def test_adding_publishers_updates_rollups(self):
+        self.january.topic.add(self.politics)
+        self.january.publishers.add(self.alice, self.bob)
+        self.february.publishers.add(self.alice)
+        self.alice.refresh_from_db()
+        self.assertEqual(self.alice.article_count, 2)
+        self.assertEqual(
+            list(self.alice.monthly_output.values_list("month", "articles")),
+            [(datetime.date(2024, 1, 1), 1), (datetime.date(2024, 2, 1), 1)],
+        )
+        self.assertEqual(
+            productivity.topic_breakdown(self.bob), [("Politics", 1)]
+        )
+
+    def test_incremental_updates_match_rebuild(self):
+        self.january.publishers.add(self.alice)
+        self.bob.newspaper_set.add(self.january, self.february)
+        self.january.topic.add(self.politics, self.sport)
+        self.sport.newspaper_set.add(self.february)
+        self.january.topic.remove(self.politics)
+        self.february.published_date = datetime.date(2024, 3, 5)
+        self.february.save()
+        self.bob.newspaper_set.remove(self.january)
+        self.january.topic.clear()
+        self.sport.newspaper_set.clear()
+        self.february.topic.add(self.politics)
+        self.alice.newspaper_set.clear()
+        self.february.publishers.add(self.alice)
+        Newspaper.objects.create(
+            title="March", content="Content", published_date="2024-03-01"
+        ).publishers.add(self.bob)
+        self.january.delete()
+        incremental = snapshot()
+        productivity.rebuild()
+        self.assertEqual(snapshot(), incremental)
+
+    def test_rebuild_command(self):
+        self.january.publishers.add(self.alice)
+        RedactorMonthlyOutput.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_productivity", stdout=out)
+        self.assertIn("for 1 redactor(s)", out.getvalue())
+        self.assertEqual(self.alice.monthly_output.count(), 1)
+
+    def test_list_sorted_by_output_and_detail_chart(self):
+        self.january.publishers.add(self.bob)
+        self.february.publishers.add(self.bob)
+        self.client.login(username="alice", password="12345")
+        response = self.client.get(
+            reverse("pulse:redactors"), {"sort": "output"}
+        )
+        self.assertEqual(
+            [redactor.username for redactor in response.context["redactors"]],
+            ["bob", "alice"],
+        )
+        with self.assertNumQueries(1):
+            productivity.monthly_chart(self.bob)
+        response = self.client.get(
+            reverse("pulse:redactor-detail", args=[self.bob.pk])
+        )
+        self.assertEqual(
+            [entry["percent"] for entry in response.context["monthly_output"]],
+            [100, 100],
+        )
+        self.assertContains(response, "Articles per month")
@@ -0,0 +1,122 @@
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from pulse import queryplans, seeding
+from pulse.models import Newspaper
+
+UPDATE_BASELINE = os.getenv("PULSE_UPDATE_QUERY_PLANS") == "1"
+
+SQLITE_PLAN = (
+    "5 0 0 SCAN pulse_newspaper USING INDEX pulse_newspaper_published\n"
+    "28 0 0 USE TEMP B-TREE FOR RIGHT PART OF ORDER BY"
+)
+POSTGRES_PLAN = (
+    "Limit  (cost=0.29..1.02 rows=5 width=48)\n"
+    "  ->  Sort  (cost=1.0..2.0 rows=5 width=48)\n"
+    "        Sort Method: external merge  Disk: 2048kB\n"
+    "        ->  Seq Scan on pulse_newspaper  (cost=0.00..1.05 rows=5)\n"
+    "  ->  Index Scan using pulse_topic_pkey on pulse_topic  (cost=0.1..8)"
+)
+
+
+class QueryPlanSummaryTest(TestCase):
+    def test_summarize_sqlite(self):
+        self.assertEqual(
+            queryplans.summarize(SQLITE_PLAN, "sqlite"),
+            {
+                "access": {"pulse_newspaper": "full-index"},
+                "sorts": ["RIGHT PART OF ORDER BY"],
+            },
+        )
+
+    def test_summarize_postgres(self):
+        self.assertEqual(
+            queryplans.summarize(POSTGRES_PLAN, "postgresql"),
+            {
+                "access": {
+                    "pulse_newspaper": "scan",
+                    "pulse_topic": "index",
+                },
+                "sorts": ["external sort"],
+            },
+        )
+
+    def test_regressions(self):
+        baseline = {"access": {"pulse_newspaper": "index"}, "sorts": []}
+        self.assertEqual(
+            queryplans.regressions(
+                baseline,
+                {"access": {"pulse_newspaper": "scan"}, "sorts": ["ORDER BY"]},
+            ),
+            ["new sort: ORDER BY", "pulse_newspaper: index -> scan"],
+        )
+        self.assertEqual(queryplans.regressions(baseline, baseline), [])
+        self.assertEqual(
+            queryplans.regressions(
+                {"access": {"pulse_newspaper": "scan"}, "sorts": ["ORDER BY"]},
+                baseline,
+            ),
+            [],
+        )
+
+
+class QueryPlanRegressionTest(TestCase):
+    # Set PULSE_UPDATE_QUERY_PLANS=1 to store the current plans as the new
+    # baseline for this database vendor.
+
+    @classmethod
+    def setUpTestData(cls):
+        plan = seeding.prepare(
+            0, 40, 30, end_date=date(2024, 6, 30), days=720
+        )
+        for number, size in seeding.chunks(1500, 500):
+            seeding.write_chunk(seeding.generate_chunk(plan, number, size))
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_hot_querysets_keep_their_plans(self):
+        plans = queryplans.capture()
+        if UPDATE_BASELINE:
+            queryplans.save_baseline(plans)
+            return
+        baseline = queryplans.load_baseline()
+        if baseline is None:
+            self.skipTest(
+                f"No query plan baseline for {connection.vendor}; run the "
+                "tests with PULSE_UPDATE_QUERY_PLANS=1 to record one."
+            )
+        for name, problems in queryplans.compare(baseline, plans).items():
+            with self.subTest(name):
+                self.fail(f"{name}: {'; '.join(problems)}")
+
+    def test_unindexed_filter_is_reported(self):
+        baseline = queryplans.capture()
+        unindexed = {
+            "newspaper-list-date": lambda: Newspaper.objects.filter(
+                content="x"
+            ).order_by("published_date", "title")[:10]
+        }
+        with mock.patch.object(
+            queryplans, "hot_querysets", return_value=unindexed
+        ):
+            failures = queryplans.compare(baseline, queryplans.capture())
+        self.assertIn("newspaper-list-date", failures)
+
+    def test_command_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "plans.json")
+            out = StringIO()
+            with self.assertRaises(CommandError):
+                call_command("check_query_plans", baseline=path, stdout=out)
+            call_command(
+                "check_query_plans", baseline=path, update=True, stdout=out
+            )
+            call_command("check_query_plans", baseline=path, stdout=out)
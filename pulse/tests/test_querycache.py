@@ -0,0 +1,163 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import querycache
+from pulse.forms import NewspaperSearchForm
+from pulse.models import Newspaper
+
+
+class NormalizeTest(TestCase):
+    def test_order_and_empty_values_are_ignored(self):
+        self.assertEqual(
+            querycache.normalize(
+                {"title": "Daily news", "content": "", "x": None}
+            ),
+            querycache.normalize({"content": None, "title": "Daily news"}),
+        )
+
+    def test_key_matches_the_executed_query(self):
+        form = NewspaperSearchForm({"title": "  Daily   NEWS "})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["title"], "Daily NEWS")
+        self.assertEqual(
+            querycache.normalize(form.cleaned_data), "title=Daily+NEWS"
+        )
+        self.assertNotEqual(
+            querycache.normalize({"title": "daily news"}),
+            querycache.normalize(form.cleaned_data),
+        )
+
+    def test_dates_and_flags(self):
+        self.assertEqual(
+            querycache.normalize(
+                {
+                    "published_date": datetime.date(2024, 1, 2),
+                    "include_archive": True,
+                }
+            ),
+            "include_archive=on&published_date=2024-01-02",
+        )
+
+
+@override_settings(PULSE_SEARCH_CACHE_SIZE=2)
+class CachedResultsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        querycache.clear_local()
+        for i in range(12):
+            Newspaper.objects.create(
+                title=f"Newspaper {i:02}",
+                content="Content",
+                published_date="2024-01-01",
+            )
+        self.base = Newspaper.objects.order_by("title").prefetch_related(
+            "topic"
+        )
+
+    def results(self, title="newspaper", limit=10):
+        return querycache.CachedResults(
+            self.base.filter(title__icontains=title),
+            self.base,
+            f"title={title}",
+            limit=limit,
+        )
+
+    def test_repeat_search_costs_one_fetch(self):
+        Paginator(self.results(), 5).page(1).object_list
+        with self.assertNumQueries(2):
+            page = Paginator(self.results(), 5).page(2)
+            titles = [newspaper.title for newspaper in page.object_list]
+        self.assertEqual(titles, [f"Newspaper {i:02}" for i in range(5, 10)])
+
+    def test_pages_past_the_cached_ids_use_the_queryset(self):
+        page = Paginator(self.results(), 5).page(3)
+        self.assertEqual(
+            [newspaper.title for newspaper in page.object_list],
+            ["Newspaper 10", "Newspaper 11"],
+        )
+
+    def test_local_lru_is_bounded(self):
+        for title in ("newspaper 0", "newspaper 1", "newspaper"):
+            self.results(title).count()
+        self.assertEqual(len(querycache._local), 2)
+        with mock.patch("pulse.querycache.cache") as shared:
+            shared.get.return_value = None
+            with self.assertNumQueries(0):
+                self.results("newspaper").count()
+            with self.assertNumQueries(2):
+                self.results("newspaper 0").count()
+
+    def test_generation_bump_invalidates(self):
+        self.assertEqual(self.results().count(), 12)
+        with self.captureOnCommitCallbacks(execute=True):
+            Newspaper.objects.create(
+                title="Newspaper 12",
+                content="Content",
+                published_date="2024-01-01",
+            )
+        self.assertEqual(self.results().count(), 13)
+
+
+class NewspaperListCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        querycache.clear_local()
+        Newspaper.objects.create(
+            title="Daily News", content="Content", published_date="2024-01-01"
+        )
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+
+    def test_equivalent_searches_share_results(self):
+        url = reverse("pulse:newspapers")
+        self.client.get(url, {"title": "daily"})
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                querycache.CachedResults(
+                    Newspaper.objects.none(),
+                    Newspaper.objects.all(),
+                    "title=daily",
+                    limit=25,
+                ).count(),
+                1,
+            )
+        response = self.client.get(url, {"title": "  daily "})
+        self.assertEqual(len(response.context["newspaper_list"]), 1)
+
+    def test_list_page_degrades_when_the_cache_is_down(self):
+        url = reverse("pulse:newspapers")
+        with mock.patch.object(
+            cache, "get", side_effect=ConnectionError
+        ), mock.patch.object(cache, "set", side_effect=ConnectionError):
+            response = self.client.get(url, {"title": "daily"})
+            fragment = self.client.get(
+                url, {"title": "daily", "fragment": "results"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["newspaper_list"]), 1)
+        self.assertTrue(response.context["facets"])
+        self.assertContains(fragment, "Daily News")
+
+    def test_saves_succeed_when_the_cache_is_down(self):
+        failing = mock.Mock(side_effect=ConnectionError)
+        with mock.patch.multiple(
+            cache, add=failing, incr=failing, set=failing
+        ), self.assertLogs("pulse", "WARNING") as logs:
+            with self.captureOnCommitCallbacks(execute=True):
+                Newspaper.objects.create(
+                    title="Evening News",
+                    content="Content",
+                    published_date="2024-01-02",
+                )
+        self.assertTrue(
+            any("newspaper-list version" in line for line in logs.output)
+        )
+        self.assertTrue(any("newspaper event" in line for line in logs.output))
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import ratelimit
+
+LIMITS = {"cheap": "3/60", "filtered": "2/60", "content": "1/60"}
+
+
+@override_settings(PULSE_RATE_LIMITS=LIMITS)
+class RateLimitTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ratelimit._local_buckets.clear()
+        ratelimit._local_metrics.clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="12345", is_staff=True
+        )
+        self.client.login(username="testuser", password="12345")
+        self.url = reverse("pulse:newspapers")
+
+    def test_content_search_is_limited_first(self):
+        self.assertEqual(
+            self.client.get(self.url, {"content": "rain"}).status_code, 200
+        )
+        response = self.client.get(self.url, {"content": "rain"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "60")
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_cost_classes_have_separate_buckets(self):
+        statuses = [self.client.get(self.url).status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        self.assertEqual(
+            self.client.get(self.url, {"title": "a"}).status_code, 200
+        )
+
+    def test_tokens_refill_over_time(self):
+        with mock.patch("pulse.ratelimit.time.time", return_value=1000):
+            self.client.get(self.url, {"content": "rain"})
+            self.assertEqual(
+                self.client.get(self.url, {"content": "rain"}).status_code,
+                429,
+            )
+        with mock.patch("pulse.ratelimit.time.time", return_value=1060):
+            self.assertEqual(
+                self.client.get(self.url, {"content": "rain"}).status_code,
+                200,
+            )
+
+    def test_users_have_separate_buckets(self):
+        self.client.get(self.url, {"content": "rain"})
+        get_user_model().objects.create_user(
+            username="other", password="12345"
+        )
+        self.client.login(username="other", password="12345")
+        self.assertEqual(
+            self.client.get(self.url, {"content": "rain"}).status_code, 200
+        )
+
+    def test_falls_back_to_memory_when_cache_fails(self):
+        with mock.patch.object(
+            ratelimit.cache, "get", side_effect=ConnectionError
+        ):
+            self.client.get(self.url, {"content": "rain"})
+            response = self.client.get(self.url, {"content": "rain"})
+        self.assertEqual(response.status_code, 429)
+
+    def test_metrics(self):
+        self.client.get(self.url, {"content": "rain"})
+        self.client.get(self.url, {"content": "rain"})
+        response = self.client.get(reverse("pulse:rate-limit-metrics"))
+        content = response.json()["newspaper-list"]["content"]
+        self.assertEqual(content["allowed"], 1)
+        self.assertEqual(content["blocked"], 1)
+        self.assertEqual(content["rate"], "1/60")
@@ -0,0 +1,117 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from pulse import jobs, related
+from pulse.models import Topic, Newspaper, Job, RelatedNewspaper
+
+FLOODS = (
+    "Heavy rain flooded the river districts and residents left their "
+    "homes while emergency crews pumped water from flooded stations."
+)
+MORE_FLOODS = (
+    "The river burst its banks again and flooded districts downstream, "
+    "emergency crews said water levels keep rising."
+)
+FOOTBALL = (
+    "The football team won the championship final after a penalty "
+    "shootout in front of cheering fans."
+)
+
+
+class RelatedNewspaperTest(TestCase):
+    def setUp(self):
+        self.floods = Newspaper.objects.create(
+            title="Floods", content=FLOODS, published_date="2024-01-01"
+        )
+        self.more_floods = Newspaper.objects.create(
+            title="River floods", content=MORE_FLOODS,
+            published_date="2024-01-02",
+        )
+        self.football = Newspaper.objects.create(
+            title="Final", content=FOOTBALL, published_date="2024-01-03"
+        )
+
+    def test_rebuild_ranks_similar_newspapers_first(self):
+        self.assertEqual(related.rebuild(), 3)
+        self.assertEqual(
+            related.related_newspapers(self.floods)[0], self.more_floods
+        )
+        self.assertNotIn(
+            self.floods, related.related_newspapers(self.football)
+        )
+
+    def test_refresh_adds_new_newspaper_to_neighbours(self):
+        related.rebuild()
+        newest = Newspaper.objects.create(
+            title="Flood warning",
+            content="Emergency crews expect the river to flood districts.",
+            published_date="2024-01-04",
+        )
+        related.refresh_newspaper(newest.pk)
+        self.assertIn(self.floods, related.related_newspapers(newest))
+        self.assertIn(newest, related.related_newspapers(self.floods))
+
+    def test_refresh_removes_stale_entries(self):
+        related.rebuild()
+        self.more_floods.content = FOOTBALL
+        self.more_floods.title = "Football"
+        self.more_floods.save()
+        related.refresh_newspaper(self.more_floods.pk)
+        self.assertNotIn(
+            self.more_floods, related.related_newspapers(self.floods)
+        )
+
+    def test_refresh_skips_terms_with_long_postings(self):
+        related.rebuild()
+        newest = Newspaper.objects.create(
+            title="Flood warning",
+            content="Emergency crews expect the river to flood districts.",
+            published_date="2024-01-04",
+        )
+        with mock.patch.object(related, "MAX_POSTINGS_PER_TERM", 0):
+            related.refresh_newspaper(newest.pk)
+        self.assertEqual(related.related_newspapers(newest), [])
+        self.assertNotIn(newest, related.related_newspapers(self.floods))
+
+    def test_changes_enqueue_a_single_refresh(self):
+        topic = Topic.objects.create(name="Weather")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.floods.content = MORE_FLOODS
+            self.floods.save()
+            self.floods.topic.add(topic)
+        queued = Job.objects.filter(
+            task=related.refresh_newspaper.task, args=[self.floods.pk]
+        )
+        self.assertEqual(queued.count(), 1)
+        related.rebuild()
+        jobs.run_job(queued.get())
+        self.assertTrue(
+            RelatedNewspaper.objects.filter(newspaper=self.floods).exists()
+        )
+
+    def test_build_related_command(self):
+        out = StringIO()
+        call_command("build_related", "--top-k", "1", stdout=out)
+        self.assertIn("for 3 row(s)", out.getvalue())
+        self.assertEqual(
+            RelatedNewspaper.objects.filter(newspaper=self.floods).count(), 1
+        )
+
+    def test_detail_page_lists_related(self):
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+        related.rebuild()
+        response = self.client.get(
+            reverse("pulse:newspaper-detail", args=[self.floods.pk])
+        )
+        self.assertEqual(
+            response.context["related_newspapers"][0], self.more_floods
+        )
+        self.assertContains(response, "River floods")
@@ -0,0 +1,172 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pulse import revisions
+from pulse.models import Newspaper, NewspaperRevision
+
+ARTICLE = " ".join(f"word{i}" for i in range(2000))
+
+
+class DeltaTest(TestCase):
+    def test_round_trip(self):
+        for source, target in [
+            ("", "Fresh text\n"),
+            ("Old text", ""),
+            ("The quick brown fox", "The quick red fox jumps"),
+            ("  leading and trailing  \n", "leading\tand trailing"),
+            ("Ünïcode ✓ text", "Ünïcode ✗ text ✓"),
+        ]:
+            with self.subTest(source=source, target=target):
+                delta = revisions.make_delta(source, target)
+                self.assertEqual(revisions.apply_delta(source, delta), target)
+
+    def test_small_edit_is_small(self):
+        edited = ARTICLE.replace("word1000 ", "corrected ")
+        delta = revisions.make_delta(edited, ARTICLE)
+        self.assertEqual(revisions.apply_delta(edited, delta), ARTICLE)
+        self.assertLess(len(delta), 40)
+
+
+class RevisionHistoryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.newspaper = Newspaper.objects.create(
+            title="First", content=ARTICLE, published_date="2024-01-01"
+        )
+        self.newspaper.refresh_from_db()
+
+    def edit(self, title, content, when=None):
+        self.newspaper.title = title
+        self.newspaper.content = content
+        self.newspaper.save()
+        revision = self.newspaper.revisions.first()
+        if when is not None:
+            NewspaperRevision.objects.filter(pk=revision.pk).update(
+                created_at=when
+            )
+        return revision
+
+    def test_saves_record_earlier_versions(self):
+        self.newspaper.save()
+        self.assertFalse(self.newspaper.revisions.exists())
+        first = self.edit("Second", ARTICLE + " more")
+        second = self.edit("Third", "Rewritten")
+        self.assertEqual(
+            [(r.title, r.published_date.isoformat()) for r in (first, second)],
+            [("First", "2024-01-01"), ("Second", "2024-01-01")],
+        )
+        self.assertEqual(revisions.revision_content(first), ARTICLE)
+        self.assertEqual(
+            revisions.revision_content(second), ARTICLE + " more"
+        )
+
+    def test_recording_does_not_grow_with_history(self):
+        self.edit("Title", ARTICLE)
+        with CaptureQueriesContext(connection) as first:
+            self.edit("Title", f"{ARTICLE} 0")
+        for i in range(1, 5):
+            self.edit("Title", f"{ARTICLE} {i}")
+        with CaptureQueriesContext(connection) as later:
+            self.edit("Title", f"{ARTICLE} last")
+        self.assertEqual(len(later), len(first))
+
+    def test_rebuilt_content_is_cached(self):
+        first = self.edit("Second", "Changed")
+        self.edit("Third", "Changed again")
+        revisions.revision_content(first)
+        with self.assertNumQueries(0):
+            self.assertEqual(revisions.revision_content(first), ARTICLE)
+
+    def test_compaction_keeps_every_surviving_text(self):
+        now = timezone.now()
+        stamps = [
+            now - timedelta(days=400),
+            now - timedelta(days=10),
+            now - timedelta(days=10) + timedelta(seconds=30),
+            now - timedelta(days=5),
+            now - timedelta(days=1),
+        ]
+        created = [
+            self.edit(f"Title {i}", f"{ARTICLE} v{i}", when)
+            for i, when in enumerate(stamps)
+        ]
+        expected = {
+            revision.pk: revisions.revision_content(revision)
+            for revision in created
+        }
+        cache.clear()
+        self.newspaper.refresh_from_db()
+        removed = revisions.compact(
+            self.newspaper,
+            keep=1,
+            retain_before=now - timedelta(days=365),
+            collapse_seconds=60,
+        )
+        self.assertEqual(removed, 2)
+        kept = list(self.newspaper.revisions.order_by("pk"))
+        self.assertEqual(
+            [revision.pk for revision in kept],
+            [created[1].pk, created[3].pk, created[4].pk],
+        )
+        for revision in kept:
+            self.assertEqual(
+                revisions.revision_content(revision), expected[revision.pk]
+            )
+
+    def test_command(self):
+        for i in range(4):
+            self.edit(f"Title {i}", f"{ARTICLE} v{i}")
+        out = StringIO()
+        call_command(
+            "compact_revisions", keep=2, collapse_seconds=60, stdout=out
+        )
+        self.assertIn(
+            "Removed 1 revision(s) from 1 newspaper(s).", out.getvalue()
+        )
+        self.assertEqual(self.newspaper.revisions.count(), 3)
+
+
+class RevisionViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="editor", password="12345"
+        )
+        self.client.login(username="editor", password="12345")
+        self.newspaper = Newspaper.objects.create(
+            title="Daily",
+            content="Original text",
+            published_date="2024-01-01",
+        )
+
+    def test_update_view_records_the_editor(self):
+        self.client.post(
+            reverse("pulse:newspaper-update", args=[self.newspaper.pk]),
+            {
+                "title": "Daily",
+                "content": "Corrected text",
+                "published_date": "2024-01-01",
+            },
+        )
+        revision = self.newspaper.revisions.get()
+        self.assertEqual(revision.edited_by, self.user)
+        response = self.client.get(
+            reverse(
+                "pulse:newspaper-revision",
+                args=[self.newspaper.pk, revision.pk],
+            )
+        )
+        self.assertContains(response, "Original text")
+        response = self.client.get(
+            reverse("pulse:newspaper-detail", args=[self.newspaper.pk])
+        )
+        self.assertEqual(list(response.context["revisions"]), [revision])
@@ -0,0 +1,98 @@
+from collections import Counter
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from pulse import search, seeding
+from pulse.models import Topic, Redactor, Newspaper
+
+
+class SeedDatasetTest(TestCase):
+    def seed(self, **options):
+        options = {
+            "newspapers": 120,
+            "topics": 20,
+            "redactors": 10,
+            "seed": 7,
+            "workers": 1,
+            "chunk_size": 50,
+            "end_date": date(2024, 6, 30),
+            "days": 365,
+            **options,
+        }
+        call_command("seed_dataset", stdout=StringIO(), **options)
+
+    def test_creates_requested_rows(self):
+        self.seed()
+        self.assertEqual(Newspaper.objects.count(), 120)
+        self.assertEqual(Topic.objects.count(), 20)
+        self.assertEqual(
+            Redactor.objects.filter(username__startswith="seed7-").count(),
+            10,
+        )
+        for newspaper in Newspaper.objects.all()[:10]:
+            self.assertTrue(1 <= newspaper.topic.count() <= 3)
+            self.assertTrue(1 <= newspaper.publishers.count() <= 4)
+            self.assertGreaterEqual(
+                len(newspaper.content.split()), seeding.MIN_WORDS
+            )
+            self.assertTrue(
+                date(2023, 7, 1) <= newspaper.published_date
+                <= date(2024, 6, 30)
+            )
+
+    def test_topic_popularity_is_skewed(self):
+        self.seed(newspapers=400)
+        counts = Counter(
+            Newspaper.topic.through.objects.values_list("topic_id", flat=True)
+        )
+        plan = seeding.prepare(7, 20, 10)
+        self.assertEqual(counts.most_common(1)[0][0], plan.topic_ids[0])
+        self.assertGreater(
+            counts[plan.topic_ids[0]], 4 * counts[plan.topic_ids[-1]]
+        )
+
+    def test_same_seed_gives_same_data(self):
+        plan = seeding.prepare(3, 5, 3, end_date=date(2024, 1, 1))
+        again = seeding.prepare(3, 5, 3, end_date=date(2024, 1, 1))
+        self.assertEqual(plan.topic_ids, again.topic_ids)
+        self.assertEqual(
+            seeding.generate_chunk(plan, 2, 10),
+            seeding.generate_chunk(again, 2, 10),
+        )
+        self.assertNotEqual(
+            seeding.generate_chunk(plan, 2, 10),
+            seeding.generate_chunk(plan, 3, 10),
+        )
+        seeding.init_worker(plan)
+        self.assertEqual(
+            seeding.build_chunk((2, 10)), seeding.generate_chunk(plan, 2, 10)
+        )
+
+    def test_rerun_reuses_topics_and_redactors(self):
+        self.seed(newspapers=10)
+        self.seed(newspapers=10)
+        self.assertEqual(Newspaper.objects.count(), 20)
+        self.assertEqual(Topic.objects.count(), 20)
+        self.assertEqual(Redactor.objects.count(), 10)
+
+    def test_seeded_rows_are_indexed_and_counted(self):
+        self.seed(newspapers=30)
+        newspaper = Newspaper.objects.first()
+        word = newspaper.content.split()[1].strip(".")
+        self.assertIn(
+            newspaper,
+            search.filter_content(Newspaper.objects.all(), word),
+        )
+        self.assertIn(
+            newspaper,
+            search.filter_substring(
+                Newspaper.objects.all(), "title", newspaper.title
+            ),
+        )
+        self.assertEqual(
+            sum(Redactor.objects.values_list("article_count", flat=True)),
+            Newspaper.publishers.through.objects.count(),
+        )
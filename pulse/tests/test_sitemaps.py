@@ -0,0 +1,84 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import sitemaps
+from pulse.models import Newspaper, SitemapShard
+
+
+@override_settings(PULSE_SITE_URL="https://example.com", PULSE_SITEMAP_ROOT="")
+@mock.patch("pulse.sitemaps.SHARD_SIZE", 2)
+class SitemapTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.newspapers = [
+            Newspaper.objects.create(
+                title=f"Newspaper {i}",
+                content="Content",
+                published_date=f"2024-01-0{i + 1}",
+            )
+            for i in range(3)
+        ]
+
+    def test_index_lists_shards(self):
+        response = self.client.get(reverse("pulse:sitemap"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<sitemapindex")
+        self.assertContains(response, "https://example.com/sitemap-0.xml")
+        self.assertContains(response, "https://example.com/sitemap-1.xml")
+        self.assertNotContains(response, "sitemap-2.xml")
+
+    def test_shard_contains_its_id_range(self):
+        response = self.client.get(reverse("pulse:sitemap-shard", args=[1]))
+        first, second, third = self.newspapers
+        self.assertContains(
+            response, f"https://example.com/newspapers/{third.pk}/"
+        )
+        self.assertContains(response, "<lastmod>2024-01-03</lastmod>")
+        self.assertNotContains(response, f"/newspapers/{first.pk}/")
+        self.assertEqual(SitemapShard.objects.get(number=1).url_count, 1)
+
+    def test_missing_shard(self):
+        response = self.client.get(reverse("pulse:sitemap-shard", args=[5]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_only_changed_shards_are_regenerated(self):
+        self.assertEqual(sitemaps.refresh_shards(), [0, 1])
+        self.assertEqual(sitemaps.refresh_shards(), [])
+        self.newspapers[2].delete()
+        Newspaper.objects.create(
+            title="Newspaper 4", content="Content", published_date="2024-02-01"
+        )
+        self.assertEqual(sitemaps.refresh_shards(), [1])
+
+    def test_cached_shard_is_served_without_streaming_again(self):
+        url = reverse("pulse:sitemap-shard", args=[0])
+        self.client.get(url)
+        with mock.patch("pulse.sitemaps.iter_shard_xml") as iter_shard_xml:
+            response = self.client.get(url)
+        iter_shard_xml.assert_not_called()
+        self.assertContains(response, "<urlset")
+
+    def test_build_sitemaps_writes_static_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            with self.settings(PULSE_SITEMAP_ROOT=root):
+                out = StringIO()
+                call_command("build_sitemaps", stdout=out)
+                self.assertIn("Regenerated 2 of 2", out.getvalue())
+                self.assertEqual(
+                    sorted(os.listdir(root)),
+                    ["sitemap-0.xml", "sitemap-1.xml", "sitemap.xml"],
+                )
+                for name in os.listdir(root):
+                    mode = os.stat(os.path.join(root, name)).st_mode
+                    self.assertEqual(mode & 0o777, 0o644)
+                response = self.client.get(
+                    reverse("pulse:sitemap-shard", args=[0])
+                )
+                self.assertIn(b"<urlset", b"".join(response.streaming_content))
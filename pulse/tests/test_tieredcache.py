@@ -0,0 +1,149 @@
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pulse import checks, tieredcache
+from pulse.filecache import LockingFileBasedCache
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "default-tests",
+    },
+    "tiered": {
+        "BACKEND": "pulse.tieredcache.TieredCache",
+        "LOCATION": "l2",
+        "OPTIONS": {
+            "LOCAL_TIMEOUT": 5,
+            "LOCAL_MAX_ENTRIES": 2,
+            "SHARED_ONLY_PREFIXES": ["counter:"],
+        },
+    },
+    "l2": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tiered-tests",
+    },
+}
+
+
+@override_settings(CACHES=CACHES)
+class TieredCacheTest(TestCase):
+    def setUp(self):
+        tieredcache._tiers.clear()
+        self.cache = caches.create_connection("tiered")
+        self.shared = caches["l2"]
+        self.shared.clear()
+
+    def test_reads_are_served_locally_within_ttl(self):
+        self.cache.set("greeting", "hello")
+        self.shared.set("greeting", "changed elsewhere")
+        self.assertEqual(self.cache.get("greeting"), "hello")
+        with mock.patch(
+            "pulse.tieredcache.time.monotonic",
+            return_value=tieredcache.time.monotonic() + 6,
+        ):
+            self.assertEqual(self.cache.get("greeting"), "changed elsewhere")
+
+    def test_local_misses_fill_from_shared(self):
+        self.shared.set("greeting", "hello")
+        self.assertEqual(self.cache.get("greeting"), "hello")
+        self.shared.delete("greeting")
+        self.assertEqual(self.cache.get("greeting"), "hello")
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(self.cache.get("missing", "fallback"), "fallback")
+
+    def test_local_tier_is_bounded(self):
+        for key in ("a", "b", "c"):
+            self.cache.set(key, key)
+        self.assertEqual(self.cache.local_stats()["entries"], 2)
+        self.shared.set("a", "new")
+        self.shared.set("c", "new")
+        self.assertEqual(self.cache.get("a"), "new")
+        self.assertEqual(self.cache.get("c"), "c")
+
+    def test_counters_bypass_local_tier(self):
+        self.cache.add("counter:views", 0)
+        self.cache.incr("counter:views")
+        self.shared.incr("counter:views", 5)
+        self.assertEqual(self.cache.get("counter:views"), 6)
+
+    def test_delete_and_incr_drop_local_copy(self):
+        self.cache.set("greeting", "hello")
+        self.cache.delete("greeting")
+        self.assertIsNone(self.cache.get("greeting"))
+        self.cache.set("total", 1)
+        self.assertEqual(self.cache.incr("total"), 2)
+        self.assertEqual(self.cache.get("total"), 2)
+
+    def test_returned_values_are_copies(self):
+        self.cache.set("ids", [1, 2])
+        self.cache.get("ids").append(3)
+        self.assertEqual(self.cache.get("ids"), [1, 2])
+
+    def test_get_many_combines_tiers(self):
+        self.cache.set("a", 1)
+        self.shared.set("b", 2)
+        self.assertEqual(
+            self.cache.get_many(["a", "b", "c"]), {"a": 1, "b": 2}
+        )
+
+    def test_stats_report_hit_ratios(self):
+        self.cache.set("greeting", "hello")
+        self.cache.get("greeting")
+        self.cache.get("missing")
+        stats = tieredcache.stats(self.cache)
+        self.assertEqual(stats["local"]["hits"], 1)
+        self.assertEqual(stats["local"]["misses"], 1)
+        self.assertEqual(stats["local"]["hit_ratio"], 0.5)
+        self.assertEqual(stats["shared"]["misses"], 1)
+        self.assertEqual(stats["process"]["local_entries"], 1)
+        self.cache.get("greeting")
+        self.assertEqual(tieredcache.stats(self.cache)["local"]["hits"], 2)
+
+
+class CacheMetricsViewTest(TestCase):
+    def test_staff_only(self):
+        url = reverse("pulse:cache-metrics")
+        user = get_user_model().objects.create_user(
+            username="reader", password="password123"
+        )
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+        user.is_staff = True
+        user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("local", response.json())
+
+
+class SharedCacheCheckTest(TestCase):
+    def test_requires_an_atomic_shared_backend(self):
+        redis = {"BACKEND": checks.ATOMIC_CACHE_BACKENDS[0]}
+        with override_settings(CACHES={**CACHES, "shared": redis}):
+            self.assertEqual(checks.check_shared_cache(None), [])
+        plain = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache"
+        }
+        with override_settings(CACHES={**CACHES, "shared": plain}):
+            errors = checks.check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ["pulse.E001"])
+
+    def test_locking_file_cache_passes(self):
+        locking = {"BACKEND": "pulse.filecache.LockingFileBasedCache"}
+        with override_settings(CACHES={**CACHES, "shared": locking}):
+            self.assertEqual(checks.check_shared_cache(None), [])
+
+    def test_locking_file_cache_counts_across_instances(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        first, second = (
+            LockingFileBasedCache(directory.name, {}) for _ in range(2)
+        )
+        self.assertTrue(first.add("counter", 0))
+        self.assertFalse(second.add("counter", 5))
+        first.incr("counter")
+        self.assertEqual(second.incr("counter", 2), 3)
@@ -0,0 +1,93 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from pulse import search
+from pulse.models import Topic, Newspaper
+
+NEWSPAPER_LIST_URL = reverse("pulse:newspapers")
+
+
+def matching_titles(query):
+    return sorted(
+        search.filter_substring(
+            Newspaper.objects.all(), "title", query
+        ).values_list("title", flat=True)
+    )
+
+
+class TrigramSearchTest(TestCase):
+    def setUp(self):
+        self.budget = Newspaper.objects.create(
+            title="Parliament passes budget", published_date="2024-01-01"
+        )
+        self.election = Newspaper.objects.create(
+            title="Election results", published_date="2024-01-02"
+        )
+
+    def test_substring_matches_inside_words(self):
+        self.assertEqual(matching_titles("liam"), [self.budget.title])
+        self.assertEqual(matching_titles("ULTS"), [self.election.title])
+        self.assertEqual(matching_titles("missing"), [])
+
+    def test_short_query_falls_back_to_icontains(self):
+        self.assertEqual(
+            matching_titles("es"), [self.election.title, self.budget.title]
+        )
+
+    def test_rename_and_delete_keep_index_in_sync(self):
+        self.budget.title = "Tax reform"
+        self.budget.save()
+        self.assertEqual(matching_titles("budget"), [])
+        self.assertEqual(matching_titles("reform"), ["Tax reform"])
+        self.election.delete()
+        self.assertEqual(matching_titles("result"), [])
+
+    def test_topic_search(self):
+        Topic.objects.create(name="Economy")
+        culture = Topic.objects.create(name="Culture")
+        culture.name = "Arts"
+        culture.save()
+        self.assertEqual(
+            list(
+                search.filter_substring(
+                    Topic.objects.all(), "name", "cono", "topic"
+                ).values_list("name", flat=True)
+            ),
+            ["Economy"],
+        )
+        self.assertFalse(
+            search.filter_substring(
+                Topic.objects.all(), "name", "ultur", "topic"
+            ).exists()
+        )
+
+    def test_suggest_similar_title(self):
+        self.assertEqual(
+            search.suggest("Electon results"),
+            [(self.election.pk, self.election.title)],
+        )
+        self.assertEqual(search.suggest("zzzz"), [])
+
+    def test_list_view_offers_did_you_mean(self):
+        user = get_user_model().objects.create_user(
+            username="reader", password="password123"
+        )
+        self.client.force_login(user)
+        response = self.client.get(
+            NEWSPAPER_LIST_URL, {"title": "Electon results"}
+        )
+        self.assertContains(response, "Did you mean")
+        self.assertContains(response, "?title=Election+results")
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command(
+            "benchmark_title_search", "budget", "--repeat", "1", stdout=out
+        )
+        self.assertIn("icontains", out.getvalue())
+        self.assertIn("trigram", out.getvalue())
+        self.assertIn("(1 rows)", out.getvalue())
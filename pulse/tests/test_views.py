@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
@@ -315,6 +316,52 @@ class NewspaperListViewTest(TestCase):
         self.assertEqual(len(response.context["newspaper_list"]), 1)
 
 
+class NewspaperListFragmentTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(7):
+            Newspaper.objects.create(
+                title=f"Newspaper {i}",
+                content="Content",
+                published_date="2020-01-01",
+            )
+        get_user_model().objects.create_user(
+            username="testuser", password="12345"
+        )
+        self.client.login(username="testuser", password="12345")
+        self.url = reverse("pulse:newspapers")
+
+    def test_fragment_renders_only_results(self):
+        response = self.client.get(
+            self.url, {"title": "Newspaper", "fragment": "results"}
+        )
+        self.assertContains(response, "<table")
+        self.assertNotContains(response, "<html")
+        self.assertNotContains(response, "<form")
+        self.assertContains(response, "?title=Newspaper&amp;page=2")
+        self.assertIn("private", response["Cache-Control"])
+        full = self.client.get(self.url, {"title": "Newspaper"})
+        self.assertLess(len(response.content), len(full.content) // 3)
+
+    def test_equivalent_queries_share_a_cached_fragment(self):
+        self.client.get(
+            self.url, {"title": "  Newspaper ", "fragment": "results"}
+        )
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.url, {"title": "Newspaper", "fragment": "results"}
+            )
+        self.assertContains(response, "Newspaper 0")
+
+    def test_fragment_cache_is_invalidated_on_change(self):
+        params = {"title": "Newspaper", "fragment": "results"}
+        self.client.get(self.url, params)
+        with self.captureOnCommitCallbacks(execute=True):
+            Newspaper.objects.filter(title="Newspaper 0").get().delete()
+        response = self.client.get(self.url, params)
+        self.assertNotContains(response, "<td>Newspaper 0</td>")
+
+
 class NewspaperDetailViewTest(TestCase):
     @classmethod
     def setUpTestData(cls):
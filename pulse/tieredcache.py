@@ -0,0 +1,277 @@
+import os
+import pickle
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.http import JsonResponse
+
+TIERS = ("local", "shared")
+OUTCOMES = ("hits", "misses")
+STATS_PREFIX = "pulse:cache:stats:"
+STATS_PUBLISH_SECONDS = 10
+
+_MISSING = object()
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+
+def _stats_key(tier, outcome):
+    return f"{STATS_PREFIX}{tier}:{outcome}"
+
+
+class LocalTier:
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.published = Counter()
+        self.published_at = time.monotonic()
+
+
+class TieredCache(BaseCache):
+    # A bounded in-process LRU with a short TTL in front of the cache alias
+    # named by LOCATION. Other workers only notice a delete or overwrite
+    # once their local copy expires, so anything that must change
+    # everywhere at once is looked up under a versioned key; counters and
+    # locks are listed in SHARED_ONLY_PREFIXES and never kept locally.
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = location
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        self.local_max_entries = options.get("LOCAL_MAX_ENTRIES", 1000)
+        self.shared_only = (STATS_PREFIX,) + tuple(
+            options.get("SHARED_ONLY_PREFIXES", ())
+        )
+        # Django creates a backend per thread; the local tier is shared by
+        # every thread of the process, as LocMemCache does.
+        with _tiers_lock:
+            self._tier = _tiers.setdefault(location, LocalTier())
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _is_local(self, key):
+        return not key.startswith(self.shared_only)
+
+    def _local_get(self, key):
+        with self._tier.lock:
+            entry = self._tier.entries.get(key)
+            if entry is not None:
+                expires_at, data = entry
+                if expires_at > time.monotonic():
+                    self._tier.entries.move_to_end(key)
+                    self._tier.stats["local", "hits"] += 1
+                    return pickle.loads(data)
+                del self._tier.entries[key]
+            self._tier.stats["local", "misses"] += 1
+        return _MISSING
+
+    def _local_set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        ttl = self.local_timeout
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            ttl = min(ttl, timeout)
+        if ttl <= 0:
+            self._local_delete(key)
+            return
+        # Values are pickled like LocMemCache does, so callers mutating
+        # what they got back cannot change the cached copy.
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._tier.lock:
+            self._tier.entries[key] = (time.monotonic() + ttl, data)
+            self._tier.entries.move_to_end(key)
+            while len(self._tier.entries) > self.local_max_entries:
+                self._tier.entries.popitem(last=False)
+
+    def _local_delete(self, key):
+        with self._tier.lock:
+            self._tier.entries.pop(key, None)
+
+    def _count_shared(self, hit):
+        with self._tier.lock:
+            self._tier.stats["shared", OUTCOMES[not hit]] += 1
+            due = (
+                time.monotonic() - self._tier.published_at
+                >= STATS_PUBLISH_SECONDS
+            )
+        if due:
+            self.publish_stats()
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        is_local = self._is_local(key)
+        if is_local:
+            value = self._local_get(local_key)
+            if value is not _MISSING:
+                return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if is_local:
+            self._count_shared(value is not _MISSING)
+        if value is _MISSING:
+            return default
+        if is_local:
+            self._local_set(local_key, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        missing = []
+        for key in keys:
+            local_key = self.make_and_validate_key(key, version)
+            value = (
+                self._local_get(local_key)
+                if self._is_local(key)
+                else _MISSING
+            )
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            shared = self.shared.get_many(missing, version=version)
+            for key in missing:
+                if not self._is_local(key):
+                    continue
+                self._count_shared(key in shared)
+                if key in shared:
+                    self._local_set(
+                        self.make_and_validate_key(key, version), shared[key]
+                    )
+            found.update(shared)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        self.shared.set(key, value, timeout, version=version)
+        if self._is_local(key):
+            self._local_set(local_key, value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            local_key = self.make_and_validate_key(key, version)
+            if key in failed or not self._is_local(key):
+                self._local_delete(local_key)
+            else:
+                self._local_set(local_key, value, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added and self._is_local(key):
+            self._local_set(local_key, value, timeout)
+        else:
+            self._local_delete(local_key)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        for key in keys:
+            self._local_delete(self.make_and_validate_key(key, version))
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        if self._is_local(key):
+            with self._tier.lock:
+                entry = self._tier.entries.get(local_key)
+            if entry is not None and entry[0] > time.monotonic():
+                return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.decr(key, delta, version=version)
+
+    def clear(self):
+        self.clear_local()
+        self.shared.clear()
+
+    def clear_local(self):
+        with self._tier.lock:
+            self._tier.entries.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    def local_stats(self):
+        with self._tier.lock:
+            stats = dict(self._tier.stats)
+            stats["entries"] = len(self._tier.entries)
+        return stats
+
+    def publish_stats(self):
+        with self._tier.lock:
+            delta = Counter(self._tier.stats)
+            delta.subtract(self._tier.published)
+            self._tier.published = Counter(self._tier.stats)
+            self._tier.published_at = time.monotonic()
+        for (tier, outcome), count in delta.items():
+            if count <= 0:
+                continue
+            key = _stats_key(tier, outcome)
+            try:
+                self.shared.add(key, 0, None)
+                self.shared.incr(key, count)
+            except Exception:
+                with self._tier.lock:
+                    self._tier.published[tier, outcome] -= count
+
+
+def _ratio(hits, misses):
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+def stats(backend=None):
+    backend = backend or caches["default"]
+    if not isinstance(backend, TieredCache):
+        return {}
+    backend.publish_stats()
+    keys = [
+        _stats_key(tier, outcome) for tier in TIERS for outcome in OUTCOMES
+    ]
+    try:
+        totals = backend.shared.get_many(keys)
+    except Exception:
+        totals = {}
+    local = backend.local_stats()
+    result = {
+        "process": {
+            "pid": os.getpid(),
+            "local_entries": local["entries"],
+        }
+    }
+    for tier in TIERS:
+        hits = totals.get(_stats_key(tier, "hits"), 0)
+        misses = totals.get(_stats_key(tier, "misses"), 0)
+        result[tier] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": _ratio(hits, misses),
+        }
+    return result
+
+
+@staff_member_required
+def stats_view(request):
+    return JsonResponse(stats())
@@ -1,5 +1,10 @@
 from django.urls import path
 
+from pulse.feeds import feed_view
+from pulse.events import newspaper_events
+from pulse.ratelimit import metrics_view
+from pulse.tieredcache import stats_view
+from pulse.sitemaps import sitemap_index, sitemap_shard
 from pulse.views import (
     index,
     TopicListView,
@@ -16,6 +21,7 @@ from pulse.views import (
     NewspaperCreateView,
     NewspaperUpdateView,
     NewspaperDeleteView,
+    NewspaperRevisionDetailView,
 )
 
 urlpatterns = [
@@ -70,6 +76,11 @@ urlpatterns = [
         NewspaperListView.as_view(),
         name="newspapers"
     ),
+    path(
+        "newspapers/events/",
+        newspaper_events,
+        name="newspaper-events",
+    ),
     path(
         "newspapers/<int:pk>/",
         NewspaperDetailView.as_view(),
@@ -85,11 +96,46 @@ urlpatterns = [
         NewspaperUpdateView.as_view(),
         name="newspaper-update",
     ),
+    path(
+        "newspapers/<int:pk>/revisions/<int:revision_pk>/",
+        NewspaperRevisionDetailView.as_view(),
+        name="newspaper-revision",
+    ),
     path(
         "newspapers/<int:pk>/delete/",
         NewspaperDeleteView.as_view(),
         name="newspaper-delete",
     ),
+    path(
+        "feeds/newspapers/<slug:feed_format>/",
+        feed_view,
+        {"kind": "newspapers"},
+        name="newspaper-feed",
+    ),
+    path(
+        "feeds/topics/<int:pk>/<slug:feed_format>/",
+        feed_view,
+        {"kind": "topics"},
+        name="topic-feed",
+    ),
+    path(
+        "feeds/redactors/<int:pk>/<slug:feed_format>/",
+        feed_view,
+        {"kind": "redactors"},
+        name="redactor-feed",
+    ),
+    path("sitemap.xml", sitemap_index, name="sitemap"),
+    path(
+        "sitemap-<int:number>.xml",
+        sitemap_shard,
+        name="sitemap-shard",
+    ),
+    path(
+        "metrics/rate-limits/",
+        metrics_view,
+        name="rate-limit-metrics",
+    ),
+    path("metrics/cache/", stats_view, name="cache-metrics"),
 ]
 
 app_name = "pulse"
@@ -0,0 +1,43 @@
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+NEWSPAPER_LIST = "newspaper-list"
+
+
+def _version_key(name):
+    return f"pulse:version:{name}"
+
+
+def get_version(name):
+    # None when the cache backend is unreachable: callers then skip their
+    # cache and compute the result, so an outage degrades to uncached
+    # pages instead of errors.
+    key = _version_key(name)
+    try:
+        version = cache.get(key)
+        if version is None:
+            # Seed from the clock so an evicted counter never reuses a
+            # version that may still have a rendered body cached under it.
+            version = time.time_ns()
+            cache.add(key, version, None)
+            version = cache.get(key, version)
+    except Exception:
+        return None
+    return version
+
+
+def bump_version(name):
+    # Runs after a commit, so a cache outage is logged rather than raised
+    # into a save that already happened.
+    key = _version_key(name)
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    except Exception:
+        logger.warning("Could not bump the %s version", name, exc_info=True)
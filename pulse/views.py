@@ -1,10 +1,40 @@
+import hashlib
+from urllib.parse import parse_qsl
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views import generic
 from django.urls import reverse_lazy
-from django.shortcuts import render
-from django.http import HttpRequest, HttpResponse
-
-from pulse.models import Topic, Redactor, Newspaper
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import redirect, render
+from django.http import HttpRequest, HttpResponse, Http404
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
+
+from pulse import (
+    archive,
+    coldarchive,
+    dedup,
+    edge,
+    facets,
+    pageviews,
+    productivity,
+    querycache,
+    related,
+    revisions,
+    search,
+)
+from pulse.ratelimit import RateLimitMixin
+from pulse.versions import NEWSPAPER_LIST, get_version
+from pulse.models import (
+    Topic,
+    Redactor,
+    Newspaper,
+    NewspaperArchive,
+    NewspaperRevision,
+)
 from pulse.forms import (
     TopicForm,
     RedactorForm,
@@ -13,6 +43,7 @@ from pulse.forms import (
 )
 
 
+@edge.edge_cache(tags=[edge.INDEX_TAG])
 def index(request: HttpRequest) -> HttpResponse:
     num_topics = Topic.objects.count()
     num_redactors = Redactor.objects.count()
@@ -21,6 +52,7 @@ def index(request: HttpRequest) -> HttpResponse:
         "num_topics": num_topics,
         "num_redactors": num_redactors,
         "num_newspapers": num_newspapers,
+        "most_read": pageviews.most_read(),
     }
     return render(request, "pulse/index.html", context)
 
@@ -58,12 +90,28 @@ class RedactorListView(LoginRequiredMixin, generic.ListView):
     paginate_by = 5
     ordering = ["username"]
 
+    def get_ordering(self):
+        if self.request.GET.get("sort") == "output":
+            return ["-article_count", "username"]
+        return self.ordering
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["sort"] = self.request.GET.get("sort", "")
+        return context
+
 
 class RedactorDetailView(LoginRequiredMixin, generic.DetailView):
     model = Redactor
     template_name = "pulse/redactor_detail.html"
     context_object_name = "redactor"
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["monthly_output"] = productivity.monthly_chart(self.object)
+        context["topic_output"] = productivity.topic_breakdown(self.object)
+        return context
+
 
 class RedactorCreateView(LoginRequiredMixin, generic.CreateView):
     model = Redactor
@@ -83,40 +131,211 @@ class RedactorDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("pulse:redactors")
 
 
-class NewspaperListView(LoginRequiredMixin, generic.ListView):
+def hash_query(*parts):
+    return hashlib.md5(
+        "\0".join(parts).encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+class NewspaperListView(
+    LoginRequiredMixin, RateLimitMixin, generic.ListView
+):
     model = Newspaper
     template_name = "pulse/newspaper_list.html"
     context_object_name = "newspaper_list"
     paginate_by = 5
     ordering = ["published_date", "title"]
+    rate_limit_scope = "newspaper-list"
+    fragment_template_name = "pulse/newspaper_results.html"
+    fragment_cache_timeout = 60 * 5
+
+    @cached_property
+    def search_form(self):
+        return NewspaperSearchForm(self.request.GET)
+
+    @cached_property
+    def normalized_query(self):
+        if not self.search_form.is_valid():
+            return ""
+        return querycache.normalize(self.search_form.cleaned_data)
+
+    @property
+    def is_fragment(self):
+        return self.request.GET.get("fragment") == "results"
+
+    def get_fragment_cache_key(self):
+        version = get_version(NEWSPAPER_LIST)
+        if version is None:
+            return None
+        page = self.request.GET.get(self.page_kwarg, "1")
+        return (
+            f"pulse:fragment:newspapers:{version}:"
+            f"{hash_query(self.normalized_query, page)}"
+        )
+
+    @cached_property
+    def cached_fragment(self):
+        key = self.is_fragment and self.get_fragment_cache_key()
+        if not key:
+            return None
+        try:
+            return cache.get(key)
+        except Exception:
+            return None
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_fragment:
+            return super().get(request, *args, **kwargs)
+        content = self.cached_fragment
+        if content is None:
+            self.object_list = self.get_queryset()
+            content = render_to_string(
+                self.fragment_template_name,
+                self.get_context_data(),
+                request,
+            )
+            key = self.get_fragment_cache_key()
+            if key:
+                try:
+                    cache.set(key, content, self.fragment_cache_timeout)
+                except Exception:
+                    pass
+        response = HttpResponse(content)
+        patch_cache_control(response, private=True, max_age=30)
+        return response
+
+    def get_rate_limit_cost(self):
+        # A cached fragment costs no more than an unfiltered listing.
+        if self.cached_fragment is not None:
+            return "cheap"
+        form = self.search_form
+        if not form.is_valid():
+            return "cheap"
+        if form.cleaned_data.get("content"):
+            return "content"
+        if form.cleaned_data.get("title") or archive.should_search_archive(
+            form.cleaned_data
+        ):
+            return "filtered"
+        return "cheap"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["search_form"] = NewspaperSearchForm(self.request.GET)
+        context["search_form"] = self.search_form
+        if self.normalized_query:
+            context["page_query"] = self.normalized_query + "&"
+        form = self.search_form
+        title = form.is_valid() and form.cleaned_data.get("title")
+        if title and not context["paginator"].count:
+            context["did_you_mean"] = [
+                {"title": value, "query": urlencode({"title": value})}
+                for _, value in search.suggest(title)
+            ]
+        if form.is_valid():
+            context["facets"] = self.get_facets(form.cleaned_data)
         return context
 
+    def get_facets(self, cleaned_data):
+        # Counted over live newspapers only; archived rows are not faceted.
+        queryset = self.filter_queryset(Newspaper.objects.all(), cleaned_data)
+        entry = facets.facet_counts(queryset, self.normalized_query)
+        return facets.facet_links(entry, parse_qsl(self.normalized_query))
+
     def get_queryset(self):
-        queryset = super().get_queryset().order_by("published_date", "title")
-        form = NewspaperSearchForm(self.request.GET)
+        base = (
+            super()
+            .get_queryset()
+            .defer("content", "content_blob")
+            .order_by("published_date", "title")
+            .prefetch_related("topic")
+        )
+        queryset = base
+        form = self.search_form
         if form.is_valid():
-            if form.cleaned_data.get("title"):
-                queryset = queryset.filter(
-                    title__icontains=form.cleaned_data["title"]
+            queryset = self.filter_queryset(queryset, form.cleaned_data)
+            # Only reach into the archive when the date filter (or the
+            # explicit checkbox) can match archived rows, so Postgres
+            # prunes every other partition.
+            if archive.should_search_archive(form.cleaned_data):
+                archived = self.filter_queryset(
+                    NewspaperArchive.objects.all(), form.cleaned_data
+                )
+                return archive.CombinedNewspapers(queryset, archived)
+        return querycache.CachedResults(
+            queryset,
+            base,
+            self.normalized_query,
+            limit=self.paginate_by * settings.PULSE_SEARCH_CACHE_PAGES,
+        )
+
+    def filter_queryset(self, queryset, cleaned_data):
+        if cleaned_data.get("title"):
+            if queryset.model is Newspaper:
+                queryset = search.filter_substring(
+                    queryset, "title", cleaned_data["title"]
                 )
-            if form.cleaned_data.get("published_date"):
+            else:
                 queryset = queryset.filter(
-                    published_date=form.cleaned_data["published_date"]
+                    title__icontains=cleaned_data["title"]
+                )
+        if cleaned_data.get("published_date"):
+            queryset = queryset.filter(
+                published_date=cleaned_data["published_date"]
+            )
+        if cleaned_data.get("content"):
+            if queryset.model is Newspaper:
+                queryset = search.filter_content(
+                    queryset, cleaned_data["content"]
                 )
-            if form.cleaned_data.get("content"):
+            else:
                 queryset = queryset.filter(
-                    content__icontains=form.cleaned_data["content"]
+                    content__icontains=cleaned_data["content"]
                 )
+        if cleaned_data.get("topic"):
+            queryset = queryset.filter(topic=cleaned_data["topic"])
+        if cleaned_data.get("publisher"):
+            queryset = queryset.filter(publishers=cleaned_data["publisher"])
+        if cleaned_data.get("year"):
+            queryset = queryset.filter(
+                published_date__year=cleaned_data["year"]
+            )
         return queryset
 
 
 class NewspaperDetailView(LoginRequiredMixin, generic.DetailView):
     model = Newspaper
     template_name = "pulse/newspaper_detail.html"
+    context_object_name = "newspaper"
+
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            try:
+                return NewspaperArchive.objects.get(pk=self.kwargs["pk"])
+            except NewspaperArchive.DoesNotExist:
+                pass
+        newspaper = coldarchive.get(self.kwargs["pk"])
+        if newspaper is None:
+            raise Http404("No newspaper found matching the query")
+        return newspaper
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        if not self.object.is_archived:
+            pageviews.record_view(self.object.pk)
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if not self.object.is_archived:
+            context["related_newspapers"] = related.related_newspapers(
+                self.object
+            )
+            context["revisions"] = self.object.revisions.select_related(
+                "edited_by"
+            )[:settings.PULSE_REVISION_KEEP]
+        return context
 
 
 class NewspaperCreateView(LoginRequiredMixin, generic.CreateView):
@@ -124,12 +343,45 @@ class NewspaperCreateView(LoginRequiredMixin, generic.CreateView):
     form_class = NewspaperForm
     success_url = reverse_lazy("pulse:newspapers")
 
+    def form_valid(self, form):
+        if settings.PULSE_DUPLICATE_ACTION == "merge":
+            matches = dedup.find_duplicates(
+                dedup.minhash(form.cleaned_data["content"])
+            )
+            if matches:
+                original = Newspaper.objects.get(pk=min(matches)[0])
+                original.topic.add(*form.cleaned_data["topic"])
+                original.publishers.add(*form.cleaned_data["publishers"])
+                return redirect("pulse:newspaper-detail", pk=original.pk)
+        return super().form_valid(form)
+
 
 class NewspaperUpdateView(LoginRequiredMixin, generic.UpdateView):
     model = Newspaper
     form_class = NewspaperForm
     success_url = reverse_lazy("pulse:newspapers")
 
+    def form_valid(self, form):
+        form.instance._edited_by = self.request.user
+        return super().form_valid(form)
+
+
+class NewspaperRevisionDetailView(LoginRequiredMixin, generic.DetailView):
+    model = NewspaperRevision
+    template_name = "pulse/newspaperrevision_detail.html"
+    context_object_name = "revision"
+    pk_url_kwarg = "revision_pk"
+
+    def get_queryset(self):
+        return NewspaperRevision.objects.filter(
+            newspaper_id=self.kwargs["pk"]
+        ).select_related("newspaper", "edited_by")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["content"] = revisions.revision_content(self.object)
+        return context
+
 
 class NewspaperDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Newspaper
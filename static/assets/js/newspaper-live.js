@@ -0,0 +1,74 @@
+(function () {
+    const results = document.getElementById("newspaper-results");
+    if (!results || !results.dataset.events || !window.EventSource) {
+        return;
+    }
+    const form = document.getElementById("newspaper-search");
+
+    function isUnfiltered() {
+        const params = new URLSearchParams(window.location.search);
+        const page = params.get("page");
+        if (page && page !== "1") {
+            return false;
+        }
+        if (!form) {
+            return true;
+        }
+        return Array.from(new FormData(form).values()).every(function (value) {
+            return !value;
+        });
+    }
+
+    function link(href, text, className) {
+        const anchor = document.createElement("a");
+        anchor.href = href;
+        anchor.textContent = text;
+        if (className) {
+            anchor.className = className;
+        }
+        return anchor;
+    }
+
+    function fill(row, newspaper) {
+        const cells = [
+            link(newspaper.url, String(newspaper.id)),
+            newspaper.title,
+            newspaper.published_date,
+            newspaper.topics.join(", "),
+        ];
+        row.replaceChildren();
+        cells.forEach(function (content) {
+            const cell = document.createElement("td");
+            cell.append(content);
+            row.append(cell);
+        });
+        const actions = document.createElement("td");
+        actions.append(
+            link(newspaper.update_url, "Edit", "btn btn-primary"),
+            " ",
+            link(newspaper.delete_url, "Delete", "btn btn-danger")
+        );
+        row.append(actions);
+    }
+
+    const source = new EventSource(results.dataset.events);
+    source.addEventListener("newspaper", function (event) {
+        const newspaper = JSON.parse(event.data);
+        let row = results.querySelector(
+            'tr[data-newspaper-id="' + newspaper.id + '"]'
+        );
+        if (row) {
+            fill(row, newspaper);
+            return;
+        }
+        const body = results.querySelector("tbody");
+        if (newspaper.type !== "created" || !body || !isUnfiltered()) {
+            return;
+        }
+        row = document.createElement("tr");
+        row.dataset.newspaperId = newspaper.id;
+        row.className = "table-success";
+        fill(row, newspaper);
+        body.prepend(row);
+    });
+})();
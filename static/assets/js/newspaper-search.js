@@ -0,0 +1,84 @@
+(function () {
+    const form = document.getElementById("newspaper-search");
+    if (!form || !window.fetch) {
+        return;
+    }
+    const results = document.getElementById(form.dataset.results);
+    const DEBOUNCE_MS = 250;
+    let timer = null;
+    let controller = null;
+
+    function load(query) {
+        if (controller) {
+            controller.abort();
+        }
+        controller = new AbortController();
+        const params = new URLSearchParams(query);
+        params.set("fragment", "results");
+        fetch("?" + params.toString(), {
+            signal: controller.signal,
+            headers: {"X-Requested-With": "XMLHttpRequest"},
+            credentials: "same-origin",
+        })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.text();
+            })
+            .then(function (html) {
+                results.innerHTML = html;
+                window.history.replaceState(null, "", "?" + query);
+            })
+            .catch(function (error) {
+                if (error.name !== "AbortError") {
+                    console.error(error);
+                }
+            });
+    }
+
+    function formQuery() {
+        const params = new URLSearchParams(new FormData(form));
+        for (const [key, value] of Array.from(params.entries())) {
+            if (!value) {
+                params.delete(key);
+            }
+        }
+        return params.toString();
+    }
+
+    function schedule() {
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+            load(formQuery());
+        }, DEBOUNCE_MS);
+    }
+
+    form.addEventListener("input", schedule);
+    form.addEventListener("change", schedule);
+    form.addEventListener("submit", function (event) {
+        event.preventDefault();
+        clearTimeout(timer);
+        load(formQuery());
+    });
+    function syncFacets(query) {
+        const params = new URLSearchParams(query);
+        ["topic", "publisher", "year"].forEach(function (name) {
+            if (form.elements[name]) {
+                form.elements[name].value = params.get(name) || "";
+            }
+        });
+    }
+
+    results.addEventListener("click", function (event) {
+        const link = event.target.closest("a.page-link, a.facet-link");
+        if (link) {
+            event.preventDefault();
+            const query = link.getAttribute("href").slice(1);
+            if (link.classList.contains("facet-link")) {
+                syncFacets(query);
+            }
+            load(query);
+        }
+    });
+})();